@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Manage the domain authority table (source credibility weights).
+
+The table is read at the start of every run, so changes apply from the
+next run without a redeploy. Files are CSV with a source,domain,weight
+header; '*' matches any source or any domain.
+
+Examples:
+    python scripts/authority.py show
+    python scripts/authority.py export authority.csv
+    python scripts/authority.py import authority.csv
+    python scripts/authority.py reset
+"""
+
+import argparse
+import csv
+import sys
+from pathlib import Path
+
+# Add src to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from finsure_agent_wire.authority import AuthorityTable
+from finsure_agent_wire.db import Database
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Manage source credibility weights")
+    parser.add_argument("--db", type=Path, default=Path("./data/autoposter.db"), help="SQLite database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("show", help="Print the table in effect")
+    export = commands.add_parser("export", help="Write the table in effect to a CSV file")
+    export.add_argument("path", type=Path)
+    load = commands.add_parser("import", help="Replace the stored table with a CSV file")
+    load.add_argument("path", type=Path)
+    commands.add_parser("reset", help="Clear the stored table (back to the built-in weights)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the requested command."""
+    args = parse_args()
+    db = Database(args.db)
+    try:
+        if args.command == "show":
+            table = AuthorityTable.load(db)
+            print(f"Version {table.version}{' (built-in)' if not table.version else ''}, {len(table)} entries")
+            for source, domain, weight in table.rows():
+                print(f"  {source:10s} {domain:30s} {weight:6.1f}")
+        
+        elif args.command == "export":
+            table = AuthorityTable.load(db)
+            with open(args.path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["source", "domain", "weight"])
+                writer.writerows(table.rows())
+            print(f"Wrote {len(table)} entries to {args.path}")
+        
+        elif args.command == "import":
+            with open(args.path, newline="", encoding="utf-8") as f:
+                rows = [(row["source"], row["domain"], float(row["weight"])) for row in csv.DictReader(f)]
+            if not rows:
+                sys.exit(f"{args.path} has no entries (use 'reset' to restore the built-in weights)")
+            version = db.replace_domain_authority(rows)
+            print(f"Imported {len(rows)} entries as version {version}")
+        
+        elif args.command == "reset":
+            db.replace_domain_authority([])
+            print("Cleared the stored table; the built-in weights apply")
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Backfill the candidate store over a long historical range.
+
+The range is collected in chunks and every finished chunk is checkpointed
+in the database; rerunning the same command resumes where an interrupted
+run stopped. Nothing is posted.
+
+Examples:
+    python scripts/backfill.py --start 2025-01-01 --end 2025-03-01
+    python scripts/backfill.py --start 2025-01-01 --end 2025-03-01 --sources arxiv --chunk-hours 72
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add src to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from finsure_agent_wire.backfill import BACKFILL_SOURCES, default_end, run_backfill
+from finsure_agent_wire.config import get_config
+
+
+def parse_date(value: str) -> datetime:
+    """Parse an ISO date or datetime as UTC."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Collect and score a historical range in resumable chunks")
+    parser.add_argument("--start", type=parse_date, required=True, help="Range start (ISO date, UTC)")
+    parser.add_argument("--end", type=parse_date, default=None, help="Range end (ISO date, UTC; default: the last chunk boundary before now, "
+                             "so rerunning the command resumes the same run)")
+    parser.add_argument("--chunk-hours", type=int, default=24, help="Window size per chunk")
+    parser.add_argument("--workers", type=int, default=4, help="Chunks collected concurrently")
+    parser.add_argument("--sources", default=",".join(BACKFILL_SOURCES),
+                        help=f"Comma-separated sources ({', '.join(BACKFILL_SOURCES)})")
+    parser.add_argument("--restart", action="store_true", help="Discard this run's checkpoints and start over")
+    args = parser.parse_args()
+    
+    if args.chunk_hours < 1 or args.workers < 1:
+        parser.error("--chunk-hours and --workers must be at least 1")
+    args.end = args.end or default_end(args.start, args.chunk_hours)
+    args.sources = [s.strip().lower() for s in args.sources.split(",") if s.strip()]
+    unknown = set(args.sources) - set(BACKFILL_SOURCES)
+    if unknown:
+        parser.error(f"unknown sources: {', '.join(sorted(unknown))}")
+    if args.start >= args.end:
+        parser.error("--start must be before --end")
+    return args
+
+
+def main() -> None:
+    """Run the backfill."""
+    args = parse_args()
+    config = get_config()
+    logging.basicConfig(
+        level=getattr(logging, config.log_level.upper()),
+        format='[%(asctime)s] [%(levelname)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+    )
+    logger = logging.getLogger(__name__)
+    
+    try:
+        counts = run_backfill(
+            config,
+            args.start,
+            args.end,
+            chunk_hours=args.chunk_hours,
+            sources=args.sources,
+            workers=args.workers,
+            restart=args.restart,
+        )
+    except KeyboardInterrupt:
+        logger.info("Interrupted; rerun the same command to resume.")
+        sys.exit(130)
+    
+    sys.exit(1 if counts['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+NewsItem memory and construction-time benchmark.
+
+Builds a large population of NewsItems the way the source adapters do and
+reports construction time and traced memory, next to a plain-dataclass
+copy of the previous layout (per-instance __dict__, URL parsed in
+__post_init__) for comparison. Optionally touches the lazy derived fields
+to show what deduplication adds on top.
+
+Examples:
+    python scripts/bench_items.py
+    python scripts/bench_items.py --count 200000 --derive
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlparse
+
+# Add src to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from finsure_agent_wire.models import NewsItem
+from finsure_agent_wire.urls import canonicalize_url, hash_url
+
+
+@dataclass
+class LegacyNewsItem:
+    """The NewsItem layout before slots and lazy derived fields."""
+    
+    url: str
+    title: str
+    source: str
+    published_at: datetime
+    description: Optional[str] = None
+    domain: Optional[str] = None
+    canonical_url: Optional[str] = None
+    url_hash: Optional[str] = None
+    relevance_score: float = 0.0
+    matched_queries: Optional[List[str]] = None
+    text_lower: Optional[str] = None
+    
+    def __post_init__(self):
+        if not self.domain and self.url:
+            self.domain = urlparse(self.url).netloc.lower()
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark NewsItem memory and construction time")
+    parser.add_argument("--count", type=int, default=1_000_000, help="Items to build")
+    parser.add_argument("--derive", action="store_true",
+                        help="Also compute domain, canonical_url and url_hash for every item")
+    parser.add_argument("--skip-legacy", action="store_true", help="Skip the legacy layout comparison")
+    return parser.parse_args()
+
+
+def make_items(cls, count: int) -> list:
+    """Build count items of cls from fresh strings, as the source parsers do."""
+    now = datetime.now(timezone.utc)
+    sources = ['rss', 'gdelt', 'youtube', 'arxiv']
+    return [
+        cls(
+            url=f"https://news{i % 500}.example.com/2024/01/article-{i}?utm_source=feed",
+            title=f"AI agents in insurance claims, part {i}",
+            source=''.join(sources[i % 4]),
+            published_at=now - timedelta(minutes=i % 10_000),
+            description=f"Short normalized description for item {i}.",
+        )
+        for i in range(count)
+    ]
+
+
+def derive(items: list) -> None:
+    """Fill the derived fields deduplication and domain caps use."""
+    for item in items:
+        if isinstance(item, LegacyNewsItem):
+            item.canonical_url = canonicalize_url(item.url)
+            item.url_hash = hash_url(item.canonical_url)
+        else:
+            item.domain, item.url_hash
+
+
+def build(cls, count: int, with_derive: bool) -> None:
+    """Build count items of cls and print time and memory."""
+    # Timed untraced; tracemalloc slows allocation several times over
+    gc.collect()
+    started = time.perf_counter()
+    items = make_items(cls, count)
+    built = time.perf_counter() - started
+    derived = 0.0
+    if with_derive:
+        started = time.perf_counter()
+        derive(items)
+        derived = time.perf_counter() - started
+    del items
+    
+    gc.collect()
+    tracemalloc.start()
+    items = make_items(cls, count)
+    if with_derive:
+        derive(items)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    
+    line = (f"{cls.__name__:16s} build {built:6.2f}s ({built / count * 1e6:5.2f} us/item), "
+            f"memory {current / 1024 / 1024:7.1f} MiB ({current / count:5.0f} B/item)")
+    if with_derive:
+        line += f", derive {derived:6.2f}s"
+    print(line)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    args = parse_args()
+    print(f"Building {args.count:,} items")
+    build(NewsItem, args.count, args.derive)
+    if not args.skip_legacy:
+        build(LegacyNewsItem, args.count, args.derive)
+
+
+if __name__ == '__main__':
+    main()
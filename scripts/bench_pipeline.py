@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline benchmark against the local stand-in server.
+
+Starts the stand-in server in-process, points every source (and the X API)
+at it, and runs the full pipeline one or more times against a throwaway
+database, reporting wall time, peak Python memory and request counts.
+
+Examples:
+    python scripts/bench_pipeline.py --runs 3 --feeds 40 --latency-ms 80
+    python scripts/bench_pipeline.py --error-rate 0.1 --rate-limit-rate 0.05 --post
+    python scripts/bench_pipeline.py --response-cache record --response-cache-dir ./bench_cache
+    python scripts/bench_pipeline.py --response-cache replay --response-cache-dir ./bench_cache
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add src to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from finsure_agent_wire.config import Config
+from finsure_agent_wire.pipeline import run_pipeline
+from finsure_agent_wire.standin import StandinServer, StandinSettings
+
+# Cache keys include the stand-in's URLs, so record and replay runs need the same port
+CACHE_PORT = 8765
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark run_pipeline against the stand-in server")
+    parser.add_argument("--runs", type=int, default=1, help="Number of pipeline runs")
+    parser.add_argument("--feeds", type=int, default=10, help="Number of synthetic RSS feeds")
+    parser.add_argument("--rss-items", type=int, default=50, help="Items per RSS feed")
+    parser.add_argument("--gdelt-records", type=int, default=250, help="GDELT maxrecords")
+    parser.add_argument("--gdelt-per-hour", type=float, default=0.0,
+                        help="Stand-in GDELT timeline density (0 = every window fills maxrecords)")
+    parser.add_argument("--gdelt-harvest", action="store_true", help="Fetch GDELT as concurrent time slices")
+    parser.add_argument("--arxiv-results", type=int, default=25, help="arXiv max_results per query")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument("--response-cache", choices=["off", "record", "replay"], default="off",
+                        help="Source response cache mode")
+    parser.add_argument("--response-cache-dir", type=Path, default=None,
+                        help="Response cache directory (default: a temporary one)")
+    parser.add_argument("--port", type=int, default=None,
+                        help=f"Stand-in server port (default: {CACHE_PORT} with --response-cache, else any free port)")
+    parser.add_argument("--fixtures", type=Path, default=None, help="Directory of recorded responses")
+    parser.add_argument("--post", action="store_true", help="Post to the stand-in X endpoint (DRY_RUN off)")
+    parser.add_argument("--streaming", action="store_true", help="Run the pipeline in streaming mode")
+    parser.add_argument("--log-level", default="WARNING")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    args = parse_args()
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper()),
+        format='[%(asctime)s] [%(levelname)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+    )
+    
+    settings = StandinSettings(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        rss_items_per_feed=args.rss_items,
+        gdelt_articles_per_hour=args.gdelt_per_hour,
+        fixtures_dir=args.fixtures,
+    )
+    
+    port = args.port
+    if port is None:
+        port = CACHE_PORT if args.response_cache != "off" else 0
+    # Resolved before changing into the temporary directory
+    cache_dir = args.response_cache_dir.resolve() if args.response_cache_dir else None
+    
+    with StandinServer(port=port, settings=settings) as server, tempfile.TemporaryDirectory() as tmp:
+        # Keep a developer's .env from leaking real endpoints into the benchmark
+        os.chdir(tmp)
+        config = Config(
+            x_api_key="standin",
+            x_api_secret="standin",
+            x_access_token="standin",
+            x_access_secret="standin",
+            youtube_api_key="standin",
+            dry_run=not args.post,
+            streaming_mode=args.streaming,
+            db_path=Path(tmp) / "bench.db",
+            gdelt_max_records=args.gdelt_records,
+            gdelt_harvest=args.gdelt_harvest,
+            arxiv_max_results=args.arxiv_results,
+            response_cache_mode=args.response_cache,
+            response_cache_dir=cache_dir or Path(tmp) / "response_cache",
+            **server.config_overrides(feed_count=args.feeds),
+        )
+        
+        timings = []
+        peak_bytes = 0
+        for run in range(1, args.runs + 1):
+            tracemalloc.start()
+            started = time.perf_counter()
+            run_pipeline(config)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            timings.append(elapsed)
+            peak_bytes = max(peak_bytes, peak)
+            print(f"Run {run}: {elapsed:.3f}s, peak memory {peak / 1024 / 1024:.1f} MiB")
+        
+        print("=" * 60)
+        print(f"Runs: {len(timings)}  min {min(timings):.3f}s  "
+              f"mean {sum(timings) / len(timings):.3f}s  max {max(timings):.3f}s")
+        print(f"Peak traced memory: {peak_bytes / 1024 / 1024:.1f} MiB")
+        print("Requests served:")
+        for path, count in sorted(server.request_counts.items()):
+            print(f"  {path:30s} {count:6d}")
+
+
+if __name__ == '__main__':
+    main()
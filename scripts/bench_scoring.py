@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Scoring throughput benchmark: in-process vs. process pool.
+
+Scores a synthetic batch with parallel.ParallelScorer at several worker
+counts and prints throughput and speedup over in-process scoring. With
+--channels-file every channel in the file is scored in the same pass, as in
+a multi-channel run. Timings include preparing the scored items for dedup
+(canonical URL and hash), which the pool does in its workers. Fresh items
+are built for every measurement, so lazy URL fields are never cached.
+
+Examples:
+    python scripts/bench_scoring.py
+    python scripts/bench_scoring.py --count 500000 --workers 1,2,4,8
+    python scripts/bench_scoring.py --channels-file channels.example.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+# Add src to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from finsure_agent_wire.channels import ChannelProfile, ChannelScorer
+from finsure_agent_wire.config import ChannelConfig
+from finsure_agent_wire.models import NewsItem
+from finsure_agent_wire.parallel import ParallelScorer
+from finsure_agent_wire.text import searchable_text
+
+SUBJECTS = ["Autonomous AI agents", "LLM agent framework", "Machine learning model", "Quarterly report",
+            "New stadium", "Agentic workflow", "Chatbot pilot", "Cloud migration"]
+TOPICS = ["insurance claims", "algorithmic trading", "KYC and AML compliance", "mortgage underwriting",
+          "football season", "retail payments", "wealth management", "movie release"]
+
+
+class Weights:
+    """Stand-in for Config carrying only the scoring weights."""
+    
+    agent_keyword_weight = 1.0
+    finance_keyword_weight = 1.0
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark in-process vs. process-pool scoring")
+    parser.add_argument("--count", type=int, default=200_000, help="Items per measurement")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts (1 = in-process)")
+    parser.add_argument("--channels-file", type=Path, default=None, help="Score these channels (default: main profile)")
+    return parser.parse_args()
+
+
+def make_items(count: int) -> List[NewsItem]:
+    """Build count items with ingestion-normalized text."""
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc)
+    items = []
+    for i in range(count):
+        title = f"{rng.choice(SUBJECTS)} for {rng.choice(TOPICS)} #{i}"
+        description = f"{rng.choice(SUBJECTS)} meets {rng.choice(TOPICS)}. Analysts weigh the risk and regulation."
+        items.append(NewsItem(
+            url=f"https://www.site{i % 300}.example.co.uk/news/{i}?utm_source=feed",
+            title=title,
+            source=('rss', 'gdelt', 'arxiv')[i % 3],
+            published_at=now - timedelta(minutes=i % 5000),
+            description=description,
+            text_lower=searchable_text(title, description),
+        ))
+    return items
+
+
+def main() -> None:
+    """Run the benchmark."""
+    args = parse_args()
+    if args.channels_file:
+        with open(args.channels_file, encoding="utf-8") as f:
+            channels = [ChannelConfig(**entry) for entry in json.load(f)]
+        profiles = [ChannelProfile.from_config(channel, Weights) for channel in channels]
+    else:
+        profiles = [ChannelProfile.from_config(ChannelConfig(name="default"), Weights)]
+    print(f"Scoring {args.count:,} items for {len(profiles)} channel(s)")
+    
+    baseline = None
+    for workers in [int(w) for w in args.workers.split(",")]:
+        items = make_items(args.count)
+        now = datetime.now(timezone.utc)
+        with ParallelScorer(ChannelScorer(profiles), workers=workers, min_batch=1) as scorer:
+            if workers > 1:
+                scorer.score_items(items[:workers], now)  # start the pool outside the timing
+            started = time.perf_counter()
+            for item, scores in zip(items, scorer.score_items(items, now)):
+                if any(scores):
+                    item.url_hash  # already set by the pool
+            elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(f"workers={workers:2d}  {elapsed:6.2f}s  {args.count / elapsed:9,.0f} items/s  "
+              f"speedup x{baseline / elapsed:4.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Train and evaluate the learned relevance model (needs NumPy).
+
+train: fit logistic regression on hashed n-grams of the candidate store,
+labeling items posted by the main run or any channel 1 and everything
+else 0. A fifth of the examples (picked by text hash, so the split is
+stable) is held out to compare the model's AUC with the keyword score's
+before the model is saved.
+
+compare: read the scores runs with LEARNED_SCORER=true wrote, and report
+how both scores rank what was posted and where they disagree most.
+
+Examples:
+    python scripts/learned_model.py train --hash-bits 18 --epochs 200
+    python scripts/learned_model.py compare --days 7 --top 50
+"""
+
+import argparse
+import sys
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add src to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from finsure_agent_wire.db import Database
+from finsure_agent_wire.learned import DEFAULT_HASH_BITS, LearnedModel, auc
+from finsure_agent_wire.text import searchable_text
+
+# One example in HOLDOUT_MODULUS goes to the holdout set
+HOLDOUT_MODULUS = 5
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Train or evaluate the learned relevance model")
+    parser.add_argument("--db", type=Path, default=Path("./data/autoposter.db"), help="SQLite database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    train = commands.add_parser("train", help="Train on the candidate store and save the model")
+    train.add_argument("--hash-bits", type=int, default=DEFAULT_HASH_BITS, help="Use 2**N hashed features")
+    train.add_argument("--epochs", type=int, default=200, help="Full-batch gradient steps")
+    train.add_argument("--learning-rate", type=float, default=0.5, help="AdaGrad step size")
+    train.add_argument("--l2", type=float, default=1e-4, help="L2 penalty")
+    train.add_argument("--dry-run", action="store_true", help="Evaluate without saving")
+    
+    compare = commands.add_parser("compare", help="Compare stored learned scores with keyword scores")
+    compare.add_argument("--days", type=float, default=None, help="Only items published in the last N days")
+    compare.add_argument("--top", type=int, default=50, help="Size of the top lists compared")
+    compare.add_argument("--show", type=int, default=5, help="Disagreements to print each way")
+    return parser.parse_args()
+
+
+def _format_auc(value) -> str:
+    return "n/a" if value is None else f"{value:.3f}"
+
+
+def train(db: Database, args: argparse.Namespace) -> None:
+    """Train, report holdout AUC, and save unless --dry-run."""
+    examples = db.get_training_examples()
+    texts = [searchable_text(title, description) for title, description, _, _ in examples]
+    labels = [label for _, _, _, label in examples]
+    positives = sum(labels)
+    print(f"{len(examples)} examples, {positives} posted")
+    if not 0 < positives < len(examples):
+        sys.exit("Need both posted and unposted items to train; run the pipeline (not dry) first")
+    
+    holdout = [zlib.crc32(text.encode()) % HOLDOUT_MODULUS == 0 for text in texts]
+    train_idx = [i for i, held in enumerate(holdout) if not held]
+    test_idx = [i for i, held in enumerate(holdout) if held]
+    params = dict(hash_bits=args.hash_bits, epochs=args.epochs, learning_rate=args.learning_rate, l2=args.l2)
+    
+    try:
+        model = LearnedModel.train([texts[i] for i in train_idx], [labels[i] for i in train_idx], **params)
+    except ValueError as e:
+        sys.exit(f"Cannot train on the training split: {e}")
+    test_labels = [labels[i] for i in test_idx]
+    learned_auc = auc(model.predict([texts[i] for i in test_idx]), test_labels)
+    # Posted items no longer in the candidate store have no keyword score
+    keyword = [(examples[i][2], labels[i]) for i in test_idx if examples[i][2] is not None]
+    keyword_auc = auc([score for score, _ in keyword], [label for _, label in keyword]) if keyword else None
+    print(f"Holdout ({len(test_idx)} examples): learned AUC {_format_auc(learned_auc)}, "
+          f"keyword AUC {_format_auc(keyword_auc)}")
+    
+    if args.dry_run:
+        return
+    # The saved model uses every example
+    model = LearnedModel.train(texts, labels, **params)
+    version = model.save(db, len(examples), positives)
+    print(f"Saved model v{version} ({1 << args.hash_bits} features)")
+
+
+def compare(db: Database, args: argparse.Namespace) -> None:
+    """Print AUC, top-k overlap and the largest disagreements of the two scores."""
+    since = datetime.now(timezone.utc) - timedelta(days=args.days) if args.days else None
+    rows = db.get_score_comparison(since)
+    if not rows:
+        sys.exit("No learned scores stored; run the pipeline with LEARNED_SCORER=true")
+    versions = sorted({row['model_version'] for row in rows})
+    labels = [row['posted'] for row in rows]
+    print(f"{len(rows)} scored candidates, {sum(labels)} posted, model versions {versions}")
+    print(f"AUC vs posted: learned {_format_auc(auc([row['learned_score'] for row in rows], labels))}, "
+          f"keyword {_format_auc(auc([row['relevance_score'] for row in rows], labels))}")
+    
+    by_learned = sorted(rows, key=lambda row: row['learned_score'], reverse=True)
+    by_keyword = sorted(rows, key=lambda row: row['relevance_score'], reverse=True)
+    top_learned = {row['canonical_url'] for row in by_learned[:args.top]}
+    top_keyword = {row['canonical_url'] for row in by_keyword[:args.top]}
+    print(f"Top {args.top} overlap: {len(top_learned & top_keyword)}")
+    
+    keyword_rank = {row['canonical_url']: rank for rank, row in enumerate(by_keyword)}
+    gaps = sorted(
+        ((keyword_rank[row['canonical_url']] - rank, row) for rank, row in enumerate(by_learned)),
+        key=lambda gap: gap[0],
+    )
+    for heading, picks in (
+        ("Learned ranks much higher:", reversed(gaps[-args.show:])),
+        ("Keyword ranks much higher:", gaps[:args.show]),
+    ):
+        print(heading)
+        for _, row in picks:
+            print(f"  learned {row['learned_score']:.3f}  keyword {row['relevance_score']:6.2f}  "
+                  f"{'posted ' if row['posted'] else ''}{row['title'][:80]}")
+
+
+def main() -> None:
+    """Run the chosen command."""
+    args = parse_args()
+    db = Database(args.db)
+    try:
+        if args.command == "train":
+            train(db, args)
+        else:
+            compare(db, args)
+    except RuntimeError as e:
+        sys.exit(str(e))
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Search the candidate store (every scored item of recent runs).
+
+Queries use SQLite FTS5 syntax: words, "quoted phrases", prefix*, AND, OR,
+NOT and parentheses. Results are ranked by BM25.
+
+Examples:
+    python scripts/search_candidates.py "fraud AND agent*" --days 30
+    python scripts/search_candidates.py "underwriting" --source rss --relevant
+"""
+
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add src to path so imports work
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from finsure_agent_wire.db import Database
+from finsure_agent_wire.scoring import score_candidates_bm25
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Full-text search of collected items")
+    parser.add_argument("query", nargs="?", default=None, help="FTS5 query (omit with --relevant)")
+    parser.add_argument("--db", type=Path, default=Path("./data/autoposter.db"), help="SQLite database path")
+    parser.add_argument("--days", type=float, default=None, help="Only items published in the last N days")
+    parser.add_argument("--source", default=None, help="Only items from this source (rss, gdelt, ...)")
+    parser.add_argument("--relevant", action="store_true",
+                        help="Also require the AI + finance keywords and no exclusions")
+    parser.add_argument("--min-bm25", type=float, default=None, help="Minimum BM25 score")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum results")
+    args = parser.parse_args()
+    if not args.query and not args.relevant:
+        parser.error("give a query, --relevant, or both")
+    return args
+
+
+def main() -> None:
+    """Run the search and print the results."""
+    args = parse_args()
+    since = datetime.now(timezone.utc) - timedelta(days=args.days) if args.days else None
+    
+    db = Database(args.db)
+    try:
+        if args.relevant:
+            rows = score_candidates_bm25(
+                db, args.query, since=since, source=args.source, min_bm25=args.min_bm25, limit=args.limit
+            )
+        else:
+            rows = db.search_candidates(
+                args.query, since=since, source=args.source, min_bm25=args.min_bm25, limit=args.limit
+            )
+    finally:
+        db.close()
+    
+    for row in rows:
+        print(f"{row['bm25']:6.2f}  {row['published_at'][:10]}  {row['source']:8s} {row['title'][:90]}")
+        print(f"        {row['canonical_url']}")
+    print(f"{len(rows)} results")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,10 +2,13 @@ import sqlite3
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional, Sequence, Set, Tuple
 
 from .models import Item, url_hash
 
+# Stay well under SQLite's bound-parameter limit (999 on older builds)
+SEEN_QUERY_CHUNK = 500
+
 
 class Database:
     def __init__(self, path: Path):
@@ -44,6 +47,30 @@ class Database:
         )
         self.conn.commit()
 
+    def seen_hashes(self, hashes: Sequence[str]) -> Set[str]:
+        """Return the subset of url hashes already recorded, in one query per chunk."""
+        found: Set[str] = set()
+        for start in range(0, len(hashes), SEEN_QUERY_CHUNK):
+            chunk = hashes[start : start + SEEN_QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            cur = self.conn.execute(
+                f"SELECT url_hash FROM seen_items WHERE url_hash IN ({placeholders})", chunk
+            )
+            found.update(row[0] for row in cur)
+        return found
+
+    def mark_seen_many(self, entries: Iterable[Tuple[str, Item]]) -> None:
+        """Record (url_hash, item) pairs in one transaction; item URLs must be canonical."""
+        now = datetime.utcnow().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT OR IGNORE INTO seen_items (url_hash, url, title, first_seen, posted)
+                VALUES (?, ?, ?, ?, 0)
+                """,
+                [(hashed, item.url, item.title, now) for hashed, item in entries],
+            )
+
     def mark_posted(self, url: str) -> None:
         hashed = url_hash(url)
         self.conn.execute("UPDATE seen_items SET posted = 1 WHERE url_hash = ?", (hashed,))
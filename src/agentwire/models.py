@@ -37,7 +37,11 @@ def canonicalize_url(url: str) -> str:
 
 
 def url_hash(url: str) -> str:
-    canon = canonicalize_url(url)
+    return canonical_hash(canonicalize_url(url))
+
+
+def canonical_hash(canon: str) -> str:
+    """Hash a URL that is already canonical (skips re-canonicalizing)."""
     return sha256(canon.encode("utf-8")).hexdigest()
 
 
@@ -6,7 +6,7 @@ from urllib.parse import urlparse
 
 from .config import get_settings
 from .db import Database, db_session
-from .models import Item
+from .models import Item, canonical_hash
 from .scoring import apply_scoring
 from .sources.gdelt import fetch_gdelt
 from .sources.rss import fetch_rss
@@ -37,22 +37,29 @@ def _filter_and_dedupe(
     """Return fresh, unique items plus counts of age-filtered and already-seen."""
     seen_count = 0
     age_filtered = 0
-    seen_urls = set()
-    fresh: List[Item] = []
+    candidates: Dict[str, Item] = {}
 
+    # Canonicalize and hash each URL once; first occurrence wins within the batch
     for item in items:
         if item.published_at < cutoff:
             age_filtered += 1
             continue
         canon = item.canonical_url()
-        if db.has_seen(canon) or canon in seen_urls:
+        hashed = canonical_hash(canon)
+        if hashed in candidates:
             seen_count += 1
             continue
         item.url = canon
+        candidates[hashed] = item
+
+    already_seen = db.seen_hashes(list(candidates))
+    seen_count += len(already_seen)
+    new_entries = [(hashed, item) for hashed, item in candidates.items() if hashed not in already_seen]
+    fresh: List[Item] = []
+    for _, item in new_entries:
         item.domain = urlparse(item.url).netloc
-        db.mark_seen(item)
-        seen_urls.add(item.url)
         fresh.append(item)
+    db.mark_seen_many(new_entries)
     return fresh, age_filtered, seen_count
 
 
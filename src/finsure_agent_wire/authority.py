@@ -0,0 +1,120 @@
+"""Source credibility weights by source and registrable domain.
+
+The weights live in the domain_authority table as (source, domain, weight)
+rows, where either key may be the '*' wildcard. Each replacement of the
+table gets a new version number, so a long-running process can refresh
+cheaply, and a scheduled run picks up edits (scripts/authority.py) without
+a redeploy. While the table is empty the built-in DEFAULT_AUTHORITY applies.
+Rows are compiled into one dict, so a lookup costs at most four probes
+however long the list is.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+from .domains import registrable_domain
+
+if TYPE_CHECKING:
+    from .db import Database
+
+logger = logging.getLogger(__name__)
+
+WILDCARD = '*'
+
+# (source, domain, weight): research papers and premium news sites rank higher
+DEFAULT_AUTHORITY: List[Tuple[str, str, float]] = [
+    ('arxiv', WILDCARD, 10.0),
+] + [
+    ('rss', domain, 5.0) for domain in [
+        'ft.com', 'reuters.com', 'bloomberg.com', 'wsj.com', 'americanbanker.com',
+        'insurancejournal.com', 'technologyreview.com', 'wired.com',
+        'techcrunch.com', 'venturebeat.com', 'coindesk.com',
+    ]
+]
+
+
+class AuthorityTable:
+    """Compiled (source, domain) -> weight lookup."""
+    
+    def __init__(self, rows: Iterable[Tuple[str, str, float]], version: int = 0):
+        """
+        Compile rows.
+        
+        Args:
+            rows: (source, domain, weight); domains are reduced to their
+                registrable domain, and either key may be WILDCARD
+            version: Table version the rows were read at (0 = built-in)
+        """
+        self.version = version
+        self._weights: Dict[Tuple[str, str], float] = {}
+        for source, domain, weight in rows:
+            domain = domain.strip().lower()
+            if domain != WILDCARD:
+                domain = registrable_domain(domain)
+            self._weights[(source.strip().lower(), domain)] = float(weight)
+    
+    def __len__(self) -> int:
+        return len(self._weights)
+    
+    @classmethod
+    def load(cls, db: "Database") -> "AuthorityTable":
+        """
+        Load the stored table.
+        
+        Args:
+            db: Database holding domain_authority
+            
+        Returns:
+            AuthorityTable (DEFAULT_AUTHORITY if nothing is stored)
+        """
+        version, rows = db.get_domain_authority()
+        if not rows:
+            return cls(DEFAULT_AUTHORITY)
+        table = cls(rows, version)
+        logger.info(f"Loaded domain authority v{version} ({len(table)} entries)")
+        return table
+    
+    def refresh(self, db: "Database") -> "AuthorityTable":
+        """
+        Reload the table if it changed since it was loaded.
+        
+        Args:
+            db: Database holding domain_authority
+            
+        Returns:
+            This table if still current, else the reloaded one
+        """
+        if db.get_domain_authority_version() == self.version:
+            return self
+        return AuthorityTable.load(db)
+    
+    def rows(self) -> List[Tuple[str, str, float]]:
+        """Compiled entries as (source, domain, weight), sorted."""
+        return sorted((source, domain, weight) for (source, domain), weight in self._weights.items())
+    
+    def boost(self, source: str, domain: str) -> float:
+        """
+        Look up the credibility boost of an item.
+        
+        The most specific entry wins: (source, domain), then (*, domain),
+        then (source, *), then (*, *).
+        
+        Args:
+            source: Item source ('rss', 'arxiv', ...)
+            domain: Item's registrable domain
+            
+        Returns:
+            Boost added to the relevance score (0.0 if no entry matches)
+        """
+        weights = self._weights
+        weight = weights.get((source, domain))
+        if weight is None:
+            weight = weights.get((WILDCARD, domain))
+            if weight is None:
+                weight = weights.get((source, WILDCARD))
+                if weight is None:
+                    weight = weights.get((WILDCARD, WILDCARD), 0.0)
+        return weight
+
+
+DEFAULT_TABLE = AuthorityTable(DEFAULT_AUTHORITY)
@@ -0,0 +1,358 @@
+"""Backfill: collect and score a long historical range in resumable chunks.
+
+The range is split into fixed-size windows per source: GDELT harvests each
+window in time slices, arXiv searches each window's submission dates, and
+RSS is read once for the whole range (feeds only carry their latest items,
+so this is only useful against a response cache recorded earlier). Chunks
+are fetched on a thread pool (arXiv chunks one at a time, spaced by
+ARXIV_PAGE_DELAY_SECONDS for its rate limit), then deduplicated and scored
+in bulk (in the process pool of parallel.ParallelScorer when
+PARALLEL_WORKERS is set). The
+main thread only writes, since the SQLite connection belongs to it: each
+chunk is stored in the candidate store and then checkpointed, so rerunning
+the same command after a crash skips the chunks already done. A chunk with
+a failed request is stored but not checkpointed, so the next run retries it.
+Backfill never posts and never moves the incremental-fetch watermarks.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .authority import AuthorityTable
+from .config import Config
+from .db import Database
+from .domains import use_public_suffix_list
+from .models import NewsItem
+from .parallel import ParallelScorer
+from .learned import load_learned_model
+from .pipeline import build_fetcher, source_queries, write_candidates
+from .sources.arxiv import iter_arxiv_papers
+from .sources.filters import ItemFilter
+from .sources.gdelt import iter_gdelt_window
+from .sources.http import HttpFetcher
+from .sources.rss import iter_rss_feeds
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_SOURCES = ('gdelt', 'arxiv', 'rss')
+
+# The GDELT DOC API only searches roughly the last three months
+GDELT_HISTORY_DAYS = 90
+
+
+@dataclass(frozen=True)
+class BackfillChunk:
+    """One source over one window of a backfill run."""
+    
+    source: str
+    start: datetime
+    end: datetime
+    
+    @property
+    def key(self) -> Tuple[str, str]:
+        """Checkpoint key: (source, start in UTC ISO format)."""
+        return self.source, self.start.astimezone(timezone.utc).isoformat()
+    
+    def __str__(self) -> str:
+        return f"{self.source} {self.start:%Y-%m-%d %H:%M} -> {self.end:%Y-%m-%d %H:%M}"
+
+
+class SourceGate:
+    """Lets one chunk of a source fetch at a time, spaced by a minimum delay."""
+    
+    def __init__(self, delay: float):
+        """
+        Initialize the gate.
+        
+        Args:
+            delay: Seconds between the end of one chunk and the start of the next
+        """
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._last_done: Optional[float] = None
+    
+    def __enter__(self) -> "SourceGate":
+        self._lock.acquire()
+        if self._last_done is not None:
+            wait = self._last_done + self.delay - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self._last_done = time.monotonic()
+        self._lock.release()
+
+
+def default_end(start: datetime, chunk_hours: int, now: Optional[datetime] = None) -> datetime:
+    """
+    Pick a range end when none is given: the last chunk boundary before now.
+    
+    The end stays the same until another whole chunk has passed, so
+    rerunning the same command resumes the same run.
+    
+    Args:
+        start: Range start
+        chunk_hours: Window size
+        now: Current time (default: now)
+        
+    Returns:
+        start plus a whole number of chunks (at least one)
+    """
+    now = now or datetime.now(timezone.utc)
+    step = timedelta(hours=chunk_hours)
+    return start + max(1, (now - start) // step) * step
+
+
+def plan_chunks(
+    start: datetime,
+    end: datetime,
+    chunk_hours: int,
+    sources: Sequence[str] = BACKFILL_SOURCES,
+) -> List[BackfillChunk]:
+    """
+    Split a range into chunks, newest first.
+    
+    Args:
+        start: Range start (inclusive)
+        end: Range end (exclusive)
+        chunk_hours: Window size for GDELT and arXiv
+        sources: Sources to backfill (subset of BACKFILL_SOURCES)
+        
+    Returns:
+        Chunks to run; RSS gets a single chunk covering the whole range
+    """
+    step = timedelta(hours=chunk_hours)
+    windows = []
+    window_end = end
+    while window_end > start:
+        windows.append((max(start, window_end - step), window_end))
+        window_end -= step
+    
+    chunks = []
+    for window_start, window_end in windows:
+        chunks.extend(BackfillChunk(source, window_start, window_end) for source in sources if source != 'rss')
+    if 'rss' in sources:
+        chunks.append(BackfillChunk('rss', start, end))
+    return chunks
+
+
+def backfill_run_id(start: datetime, end: datetime, chunk_hours: int) -> str:
+    """
+    Identify a backfill run, so the same command resumes the same run.
+    
+    Args:
+        start: Range start
+        end: Range end
+        chunk_hours: Window size
+        
+    Returns:
+        Run identifier ('20250101T0000-20250401T0000-24h')
+    """
+    return f"{start.astimezone(timezone.utc):%Y%m%dT%H%M}-{end.astimezone(timezone.utc):%Y%m%dT%H%M}-{chunk_hours}h"
+
+
+def _iter_chunk_items(
+    chunk: BackfillChunk,
+    config: Config,
+    fetcher: HttpFetcher,
+    queries: Tuple[Optional[List[str]], List[str], List[str]],
+    failed: List,
+) -> Iterator[NewsItem]:
+    """Start the source stream a chunk covers."""
+    item_filter = ItemFilter(
+        cutoff=chunk.start,
+        exclude=config.source_prefilter,
+        require_categories=config.source_prefilter,
+        max_description_length=config.max_description_length,
+    )
+    gdelt_queries, _, arxiv_queries = queries
+    hours = max(1, int((chunk.end - chunk.start).total_seconds() // 3600))
+    
+    if chunk.source == 'gdelt':
+        return iter_gdelt_window(
+            chunk.start,
+            chunk.end,
+            max_records=config.gdelt_max_records,
+            base_url=config.gdelt_base_url,
+            item_filter=item_filter,
+            queries=gdelt_queries,
+            workers=config.gdelt_harvest_workers,
+            initial_slices=config.gdelt_harvest_slices,
+            min_slice_minutes=config.gdelt_min_slice_minutes,
+            fetcher=fetcher,
+            failed=failed,
+        )
+    if chunk.source == 'arxiv':
+        return iter_arxiv_papers(
+            queries=arxiv_queries,
+            lookback_hours=hours,
+            max_results=config.arxiv_max_results,
+            base_url=config.arxiv_base_url,
+            item_filter=item_filter,
+            max_pages=config.arxiv_max_pages,
+            page_delay=config.arxiv_page_delay_seconds,
+            batch_queries=config.arxiv_batch_queries,
+            fetcher=fetcher,
+            window=(chunk.start, chunk.end),
+            failed=failed,
+        )
+    if chunk.source == 'rss':
+        return iter_rss_feeds(
+            feed_urls=config.get_rss_feed_list(),
+            lookback_hours=hours,
+            item_filter=item_filter,
+            fetcher=fetcher,
+            failed=failed,
+        )
+    raise ValueError(f"Unknown backfill source: {chunk.source}")
+
+
+def collect_chunk(
+    chunk: BackfillChunk,
+    config: Config,
+    fetcher: HttpFetcher,
+    queries: Tuple[Optional[List[str]], List[str], List[str]],
+    scorer: ParallelScorer,
+    gate: Optional[SourceGate] = None,
+) -> Tuple[List[NewsItem], List]:
+    """
+    Fetch, deduplicate and score one chunk (runs on a worker thread).
+    
+    Items are scored as if the run happened at the chunk's end, so recency
+    ranks them within their own window.
+    
+    Args:
+        chunk: Chunk to collect
+        config: Application configuration
+        fetcher: Shared HTTP fetcher
+        queries: Server-side queries from pipeline.source_queries()
+        scorer: Scorer shared by all chunks (large chunks go to its process pool)
+        gate: Gate the chunk's source fetches through (None = no limit)
+        
+    Returns:
+        (scored items unique by URL hash, requests that failed)
+    """
+    failed: List = []
+    best: Dict[str, NewsItem] = {}
+    with gate or nullcontext():
+        items = [
+            item for item in _iter_chunk_items(chunk, config, fetcher, queries, failed)
+            if item.published_at < chunk.end
+        ]
+    for item, scores in zip(items, scorer.score_items(items, chunk.end)):
+        item.relevance_score = scores[0]
+        kept = best.get(item.url_hash)
+        if kept is None or item.relevance_score > kept.relevance_score:
+            best[item.url_hash] = item
+    return list(best.values()), failed
+
+
+def run_backfill(
+    config: Config,
+    start: datetime,
+    end: datetime,
+    chunk_hours: int = 24,
+    sources: Sequence[str] = BACKFILL_SOURCES,
+    workers: int = 4,
+    restart: bool = False,
+) -> Dict[str, int]:
+    """
+    Backfill the candidate store over a historical range.
+    
+    Args:
+        config: Application configuration
+        start: Range start (UTC)
+        end: Range end (UTC)
+        chunk_hours: Window size per chunk
+        sources: Sources to backfill (subset of BACKFILL_SOURCES)
+        workers: Chunks collected concurrently
+        restart: Discard the run's checkpoints and start over
+        
+    Returns:
+        Counts: chunks, skipped (already done), done, failed, items, relevant
+    """
+    run_id = backfill_run_id(start, end, chunk_hours)
+    logger.info(f"=== Backfill {run_id} ({', '.join(sources)}) ===")
+    
+    now = datetime.now(timezone.utc)
+    if 'gdelt' in sources and start < now - timedelta(days=GDELT_HISTORY_DAYS):
+        logger.warning(f"GDELT only searches about the last {GDELT_HISTORY_DAYS} days; older chunks come back empty")
+    if start < now - timedelta(days=config.candidate_retention_days):
+        logger.warning(
+            f"Regular runs prune candidates older than {config.candidate_retention_days} days; "
+            f"raise CANDIDATE_RETENTION_DAYS to keep the backfilled history"
+        )
+    
+    if config.public_suffix_list:
+        use_public_suffix_list(config.public_suffix_list)
+    
+    db = Database(config.db_path)
+    counts = {'chunks': 0, 'skipped': 0, 'done': 0, 'failed': 0, 'items': 0, 'relevant': 0}
+    try:
+        if restart:
+            logger.info(f"Restarting: cleared {db.clear_backfill_run(run_id)} checkpoints")
+        done = db.get_completed_backfill_chunks(run_id)
+        plan = plan_chunks(start, end, chunk_hours, sources)
+        pending = [chunk for chunk in plan if chunk.key not in done]
+        counts['chunks'] = len(plan)
+        counts['skipped'] = len(plan) - len(pending)
+        logger.info(f"{len(plan)} chunks planned, {counts['skipped']} already done")
+        
+        fetcher = build_fetcher(config, db)
+        queries = source_queries(config)
+        scorer = ParallelScorer.from_config(config, authority=AuthorityTable.load(db))
+        learned = load_learned_model(config, db)
+        # arXiv asks for one request at a time, spaced by ARXIV_PAGE_DELAY_SECONDS
+        replay = fetcher.cache is not None and fetcher.cache.replay
+        gates = {'arxiv': SourceGate(0.0 if replay else config.arxiv_page_delay_seconds)}
+        
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill")
+        try:
+            futures = {
+                pool.submit(collect_chunk, chunk, config, fetcher, queries, scorer, gates.get(chunk.source)): chunk
+                for chunk in pending
+            }
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    items, failed = future.result()
+                except Exception as e:
+                    logger.error(f"Chunk {chunk} failed: {e}")
+                    counts['failed'] += 1
+                    continue
+                
+                stored = write_candidates(db, items, learned)
+                relevant = sum(1 for item in items if item.relevance_score >= config.min_score_threshold)
+                counts['items'] += stored
+                counts['relevant'] += relevant
+                if failed:
+                    logger.warning(f"Chunk {chunk}: {len(failed)} requests failed; retried on the next run")
+                    counts['failed'] += 1
+                    continue
+                db.mark_backfill_chunk_done(run_id, chunk.source, chunk.start, chunk.end, stored)
+                counts['done'] += 1
+                logger.info(f"Chunk {chunk}: {stored} items, {relevant} relevant "
+                            f"({counts['skipped'] + counts['done']}/{len(plan)} done)")
+        finally:
+            # On an interrupt, drop the chunks not started; finished ones are checkpointed
+            pool.shutdown(wait=True, cancel_futures=True)
+            scorer.close()
+            fetcher.close()
+            if fetcher.cache:
+                fetcher.cache.log_summary()
+            fetcher.health.log_summary()
+            fetcher.health.save()
+        
+        logger.info("=== Backfill Complete ===" if not counts['failed'] else "=== Backfill Incomplete ===")
+        logger.info(f"Chunks: {counts['done']} done, {counts['skipped']} skipped, {counts['failed']} to retry")
+        logger.info(f"Items: {counts['items']} stored, {counts['relevant']} relevant")
+    finally:
+        db.close()
+    return counts
@@ -0,0 +1,185 @@
+"""Scoring for multi-channel runs.
+
+Every channel is a keyword profile (AI keywords x topic keywords, plus
+extra exclusions) with its own weights. Instead of running the keyword
+regexes once per channel, the union of all channels' keywords is matched
+once per item, and each channel's score is computed from set intersections
+with that one result. The recency and source boosts do not depend on the
+channel and are computed once as well, so scoring cost grows with the
+number of items, not items x channels. A channel with the built-in
+keyword lists scores exactly like scoring.calculate_relevance_score.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import FrozenSet, List, Optional, Tuple
+
+from .authority import DEFAULT_TABLE, AuthorityTable
+from .config import ChannelConfig, Config
+from .models import NewsItem
+from .scoring import AI_KEYWORDS, EXCLUDE_PATTERN, FINANCE_KEYWORDS, KeywordMatcher, recency_boost
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ChannelProfile:
+    """A channel's keyword sets and weights, ready for scoring."""
+    
+    name: str
+    ai_keywords: FrozenSet[str]
+    finance_keywords: FrozenSet[str]
+    exclude_keywords: FrozenSet[str]
+    agent_weight: float
+    finance_weight: float
+    
+    @classmethod
+    def from_config(cls, channel: ChannelConfig, config: Config) -> "ChannelProfile":
+        """
+        Build a profile from a channel definition.
+        
+        Args:
+            channel: Channel definition
+            config: Main configuration (defaults for unset weights)
+            
+        Returns:
+            ChannelProfile with lowercased keywords
+        """
+        def keywords(values: Optional[List[str]], default: List[str]) -> FrozenSet[str]:
+            return frozenset(k.strip().lower() for k in (default if values is None else values) if k.strip())
+        
+        return cls(
+            name=channel.name,
+            ai_keywords=keywords(channel.ai_keywords, AI_KEYWORDS),
+            finance_keywords=keywords(channel.finance_keywords, FINANCE_KEYWORDS),
+            exclude_keywords=keywords(channel.exclude_keywords, []),
+            agent_weight=(
+                config.agent_keyword_weight if channel.agent_keyword_weight is None else channel.agent_keyword_weight
+            ),
+            finance_weight=(
+                config.finance_keyword_weight if channel.finance_keyword_weight is None
+                else channel.finance_keyword_weight
+            ),
+        )
+    
+    @classmethod
+    def default(cls, config: Config) -> "ChannelProfile":
+        """
+        Profile of the main (single-channel) scoring.
+        
+        Args:
+            config: Main configuration
+            
+        Returns:
+            ChannelProfile with the built-in keyword lists and configured weights
+        """
+        return cls.from_config(ChannelConfig(name="default"), config)
+
+
+def category_keywords(profiles: List[ChannelProfile]) -> Tuple[List[str], List[str]]:
+    """
+    Union the channels' category keywords.
+    
+    An item some channel can score has at least one AI and one finance
+    keyword of this union, so the source pre-filter and the compiled
+    queries built from it keep everything any channel would post.
+    
+    Args:
+        profiles: Channel profiles
+        
+    Returns:
+        (AI keywords, finance keywords), sorted
+    """
+    ai_keywords = set()
+    finance_keywords = set()
+    for profile in profiles:
+        ai_keywords |= profile.ai_keywords
+        finance_keywords |= profile.finance_keywords
+    return sorted(ai_keywords), sorted(finance_keywords)
+
+
+class ChannelScorer:
+    """Scores items for every channel from one keyword scan per item."""
+    
+    def __init__(
+        self,
+        profiles: List[ChannelProfile],
+        recency_weight: float = 0.5,
+        authority: Optional[AuthorityTable] = None,
+    ):
+        """
+        Compile the channels' keywords into one matcher.
+        
+        Args:
+            profiles: Channel profiles, in the order scores are returned
+            recency_weight: Weight for recency boost (shared by all channels)
+            authority: Source credibility table (default: built-in weights)
+        """
+        self.profiles = profiles
+        self.recency_weight = recency_weight
+        self.authority = authority or DEFAULT_TABLE
+        vocabulary = set()
+        for profile in profiles:
+            vocabulary |= profile.ai_keywords | profile.finance_keywords | profile.exclude_keywords
+        self.matcher = KeywordMatcher(vocabulary)
+        logger.info(f"Channel scorer: {len(profiles)} channels, {len(self.matcher.keywords)} distinct keywords")
+    
+    def keyword_scores(self, text_lower: str) -> List[Optional[float]]:
+        """
+        Score the keyword part of every channel.
+        
+        Args:
+            text_lower: Lowercased title + description
+            
+        Returns:
+            Base score per profile, None where the text is excluded or
+            misses a category
+        """
+        if EXCLUDE_PATTERN.search(text_lower):
+            return [None] * len(self.profiles)
+        
+        found = self.matcher.matches(text_lower)
+        scores = []
+        for profile in self.profiles:
+            ai_matches = len(found & profile.ai_keywords)
+            finance_matches = len(found & profile.finance_keywords)
+            if not ai_matches or not finance_matches or not found.isdisjoint(profile.exclude_keywords):
+                scores.append(None)
+            else:
+                scores.append((ai_matches * profile.agent_weight) * (finance_matches * profile.finance_weight))
+        return scores
+    
+    def add_boosts(self, bases: List[Optional[float]], source: str, domain: str, hours_ago: float) -> List[float]:
+        """
+        Complete keyword scores with the recency and source boosts.
+        
+        Args:
+            bases: Result of keyword_scores
+            source: Item source
+            domain: Item's registrable domain
+            hours_ago: Item age in hours
+            
+        Returns:
+            One relevance score per profile (0.0 where the base is None)
+        """
+        shared = recency_boost(hours_ago, self.recency_weight) + self.authority.boost(source, domain)
+        return [0.0 if base is None else base + shared for base in bases]
+    
+    def score(self, item: NewsItem, now: datetime) -> List[float]:
+        """
+        Score an item for every channel.
+        
+        Args:
+            item: Item to score
+            now: Reference time for recency
+            
+        Returns:
+            One relevance score per profile (0.0 if excluded or missing a category)
+        """
+        bases = self.keyword_scores(item.lowered_text())
+        if all(base is None for base in bases):
+            # Rejected everywhere: never parse the URL
+            return [0.0] * len(bases)
+        hours_ago = (now - item.published_at).total_seconds() / 3600
+        return self.add_boosts(bases, item.source, item.registrable_domain, hours_ago)
@@ -1,13 +1,53 @@
 """Configuration management using Pydantic Settings and python-dotenv."""
 
+import json
 import os
 from pathlib import Path
 from typing import List, Optional
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class ChannelCredentials(BaseSettings):
+    """X credentials of a channel account, read from prefixed environment variables."""
+    
+    x_api_key: str = Field(..., description="X API Key")
+    x_api_secret: str = Field(..., description="X API Secret")
+    x_access_token: str = Field(..., description="X Access Token")
+    x_access_secret: str = Field(..., description="X Access Token Secret")
+    
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
+
+
+class ChannelConfig(BaseModel):
+    """
+    One topical feed of a multi-channel run.
+    
+    Unset fields fall back to the main configuration and the built-in
+    keyword lists; exclude_keywords add to the built-in exclusions.
+    """
+    
+    name: str = Field(..., description="Channel name (also its dedup key)", pattern="^[a-z0-9_-]+$")
+    ai_keywords: Optional[List[str]] = Field(None, description="AI keywords (default: built-in list)")
+    finance_keywords: Optional[List[str]] = Field(None, description="Topic keywords (default: built-in finance list)")
+    exclude_keywords: List[str] = Field(default_factory=list, description="Extra hard-exclusion keywords")
+    min_score_threshold: Optional[float] = Field(None, description="Minimum relevance score to post", ge=0.0)
+    max_posts_per_run: Optional[int] = Field(None, description="Maximum tweets per run", ge=1, le=20)
+    max_posts_per_domain: Optional[int] = Field(None, description="Max posts from single domain per run", ge=1, le=10)
+    agent_keyword_weight: Optional[float] = Field(None, description="Weight for AI keywords", ge=0.0)
+    finance_keyword_weight: Optional[float] = Field(None, description="Weight for topic keywords", ge=0.0)
+    x_env_prefix: Optional[str] = Field(
+        None,
+        description="Read this channel's X credentials from <PREFIX>_X_API_KEY etc. (default: main account)"
+    )
+
+
 class Config(BaseSettings):
     """Application configuration loaded from environment variables."""
     
@@ -27,6 +67,16 @@ class Config(BaseSettings):
         "AI agents finance,autonomous agents banking,LLM agents fintech,agentic AI insurance",
         description="Comma-separated YouTube search queries"
     )
+    youtube_cache_ttl_hours: float = Field(
+        6.0,
+        description="Reuse cached YouTube search responses for this long (0 = always query)",
+        ge=0.0
+    )
+    youtube_daily_quota: int = Field(10000, description="YouTube Data API quota units per day", ge=0)
+    youtube_discovery_cache: Optional[Path] = Field(
+        Path("./data/youtube_v3_discovery.json"),
+        description="Local copy of the YouTube discovery document (None = bundled copy only)"
+    )
     
     # ===========================
     # RSS Feeds
@@ -35,6 +85,15 @@ class Config(BaseSettings):
         "",
         description="Comma-separated RSS feed URLs"
     )
+    rss_adaptive_polling: bool = Field(
+        False,
+        description="Poll each RSS feed only when its learned publication rate makes new entries likely"
+    )
+    rss_max_staleness_hours: float = Field(
+        6.0,
+        description="Longest time an RSS feed goes without a poll under adaptive polling (capped at the lookback)",
+        gt=0.0
+    )
     
     # ===========================
     # arXiv Research Papers
@@ -44,6 +103,21 @@ class Config(BaseSettings):
         description="Comma-separated arXiv search queries"
     )
     arxiv_max_results: int = Field(25, description="Max papers per arXiv query", ge=1, le=100)
+    arxiv_watermarks: bool = Field(
+        True,
+        description="Persist a per-query high-water mark so later runs only read new papers"
+    )
+    arxiv_max_pages: int = Field(
+        5,
+        description="Max result pages per arXiv query when new papers exceed one page",
+        ge=1,
+        le=20,
+    )
+    arxiv_batch_queries: bool = Field(
+        False,
+        description="Merge arXiv queries into OR'd search expressions (fewer requests)"
+    )
+    arxiv_page_delay_seconds: float = Field(3.0, description="Delay between arXiv page requests", ge=0.0)
     
     # ===========================
     # Operational Settings
@@ -54,6 +128,85 @@ class Config(BaseSettings):
     max_posts_per_run: int = Field(5, description="Maximum tweets per run", ge=1, le=20)
     max_posts_per_domain: int = Field(1, description="Max posts from single domain per run", ge=1, le=10)
     min_score_threshold: float = Field(5.0, description="Minimum relevance score to post", ge=0.0)
+    source_prefilter: bool = Field(
+        True,
+        description="Drop stale, excluded and single-category entries inside source adapters"
+    )
+    max_description_length: int = Field(
+        1000,
+        description="Cut normalized item descriptions to this many characters",
+        ge=100,
+    )
+    candidate_store: bool = Field(
+        True,
+        description="Keep every scored item in a full-text searchable candidate store"
+    )
+    candidate_retention_days: int = Field(
+        30,
+        description="Delete stored candidates published more than N days ago",
+        ge=1,
+    )
+    learned_scorer: bool = Field(
+        False,
+        description="Also score stored candidates with the trained n-gram model (shadow mode, needs NumPy)"
+    )
+    public_suffix_list: Optional[Path] = Field(
+        None,
+        description="public_suffix_list.dat used to group hosts by registrable domain (default: built-in subset)"
+    )
+    streaming_mode: bool = Field(
+        False,
+        description="Stream items from sources through scoring and dedup into a bounded top-K selector"
+    )
+    parallel_workers: int = Field(
+        0,
+        description="Processes that score and canonicalize large item batches (0 or 1 = in-process)",
+        ge=0,
+        le=64,
+    )
+    parallel_min_batch: int = Field(
+        5000,
+        description="Batches smaller than this are scored in-process even with PARALLEL_WORKERS set",
+        ge=1,
+    )
+    query_mode: str = Field(
+        "manual",
+        description="Source queries: 'manual' (configured/built-in) or 'compiled' (from scoring keywords)",
+        pattern="^(manual|compiled)$"
+    )
+    run_deadline_seconds: float = Field(
+        600.0,
+        description="Time budget for collecting from all sources (0 = none); sources still running "
+                    "when their share runs out are cut off and keep what they yielded",
+        ge=0.0
+    )
+    source_timeout_seconds: float = Field(
+        30.0,
+        description="Timeout for each source HTTP request",
+        gt=0.0
+    )
+    circuit_breaker_failures: int = Field(
+        3,
+        description="Consecutive failed requests after which a source host is skipped (0 = never)",
+        ge=0
+    )
+    circuit_breaker_cooldown_minutes: float = Field(
+        30.0,
+        description="How long a failing source host is skipped before a probe request",
+        ge=0.0
+    )
+    hedge_requests: bool = Field(
+        False,
+        description="Send a second copy of a source GET that is slower than its host's p95 latency"
+    )
+    
+    # ===========================
+    # Channels
+    # ===========================
+    channels_file: Optional[Path] = Field(
+        None,
+        description="JSON list of channel definitions; when set, one collection pass feeds every channel"
+    )
     
     # ===========================
     # Database
@@ -77,6 +230,61 @@ class Config(BaseSettings):
     # ===========================
     gdelt_mode: str = Field("ArtList", description="GDELT search mode")
     gdelt_max_records: int = Field(250, description="Max GDELT articles to fetch", ge=1, le=500)
+    gdelt_harvest: bool = Field(
+        False,
+        description="Fetch the lookback window as concurrent time slices (beyond the max_records cap)"
+    )
+    gdelt_harvest_workers: int = Field(4, description="Concurrent GDELT slice requests", ge=1, le=16)
+    gdelt_harvest_slices: int = Field(4, description="Initial number of GDELT time slices", ge=1, le=96)
+    gdelt_min_slice_minutes: int = Field(
+        15,
+        description="GDELT slices hitting the cap are split down to this size",
+        ge=1
+    )
+    gdelt_watermarks: bool = Field(
+        True,
+        description="Only fetch GDELT articles seen since the last run's newest seendate"
+    )
+    gdelt_overlap_minutes: int = Field(
+        30,
+        description="Re-fetch this much before the GDELT watermark for late-indexed articles",
+        ge=0
+    )
+    
+    # ===========================
+    # Source Endpoints (override to point at a local stand-in server)
+    # ===========================
+    gdelt_base_url: str = Field(
+        "https://api.gdeltproject.org/api/v2/doc/doc",
+        description="GDELT DOC API endpoint"
+    )
+    arxiv_base_url: str = Field(
+        "http://export.arxiv.org/api/query",
+        description="arXiv API query endpoint"
+    )
+    youtube_base_url: Optional[str] = Field(
+        None,
+        description="YouTube Data API root URL override (None = Google default)"
+    )
+    x_api_base_url: str = Field("https://api.twitter.com/2", description="X API v2 base URL")
+    
+    # ===========================
+    # Source Response Cache
+    # ===========================
+    response_cache_mode: str = Field(
+        "off",
+        description="Raw source response cache: 'off', 'record' (reuse fresh, store new) or 'replay' (cache only)",
+        pattern="^(off|record|replay)$"
+    )
+    response_cache_dir: Path = Field(
+        Path("./data/response_cache"),
+        description="Directory of the source response cache"
+    )
+    response_cache_ttl_hours: float = Field(
+        6.0,
+        description="How long record mode reuses a cached response",
+        ge=0.0
+    )
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -103,6 +311,39 @@ class Config(BaseSettings):
             return []
         return [q.strip() for q in self.arxiv_queries.split(",") if q.strip()]
     
+    def get_channels(self) -> List[ChannelConfig]:
+        """Load the channel definitions (empty unless channels_file is set)."""
+        if not self.channels_file:
+            return []
+        with open(self.channels_file, encoding="utf-8") as f:
+            channels = [ChannelConfig(**entry) for entry in json.load(f)]
+        names = [channel.name for channel in channels]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate channel names in {self.channels_file}")
+        return channels
+    
+    def for_channel(self, channel: ChannelConfig) -> "Config":
+        """
+        Derive the configuration a channel selects and posts with.
+        
+        Args:
+            channel: Channel definition
+            
+        Returns:
+            Copy of this configuration with the channel's overrides applied
+        """
+        overrides = {
+            key: value
+            for key, value in channel.model_dump(include={
+                "min_score_threshold", "max_posts_per_run", "max_posts_per_domain",
+                "agent_keyword_weight", "finance_keyword_weight",
+            }).items()
+            if value is not None
+        }
+        if channel.x_env_prefix:
+            overrides.update(ChannelCredentials(_env_prefix=f"{channel.x_env_prefix}_").model_dump())
+        return self.model_copy(update=overrides)
+    
     def ensure_db_directory(self) -> None:
         """Ensure database directory exists."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
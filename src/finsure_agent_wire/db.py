@@ -1,93 +1,32 @@
 """Database operations for deduplication and state tracking."""
 
-import hashlib
+import json
 import logging
 import sqlite3
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Set
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from .models import NewsItem
+from .urls import canonicalize_url, hash_url  # noqa: F401 (re-exported)
 
 logger = logging.getLogger(__name__)
 
+# Relative weight of title and description matches in BM25 ranking
+BM25_TITLE_WEIGHT = 2.0
+BM25_DESCRIPTION_WEIGHT = 1.0
 
-def canonicalize_url(url: str) -> str:
-    """
-    Canonicalize URL by:
-    1. Normalizing scheme (http -> https where appropriate)
-    2. Removing tracking parameters (utm_*, fbclid, etc.)
-    3. Removing trailing slashes
-    4. Lowercasing domain
-    
-    Args:
-        url: Original URL
-        
-    Returns:
-        Canonicalized URL
-    """
-    try:
-        parsed = urlparse(url)
-        
-        # Lowercase domain
-        netloc = parsed.netloc.lower()
-        
-        # Remove tracking parameters
-        tracking_params = {
-            'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content',
-            'fbclid', 'gclid', 'msclkid',
-            'mc_cid', 'mc_eid',  # Mailchimp
-            '_ga', '_gl',  # Google Analytics
-            'ref', 'referer', 'referrer',
-        }
-        
-        # Parse and filter query params
-        query_params = parse_qs(parsed.query)
-        clean_params = {
-            k: v for k, v in query_params.items()
-            if k.lower() not in tracking_params
-        }
-        
-        # Rebuild query string
-        clean_query = urlencode(clean_params, doseq=True) if clean_params else ''
-        
-        # Remove trailing slash from path
-        path = parsed.path.rstrip('/') if parsed.path != '/' else parsed.path
-        
-        # Prefer https over http for common domains
-        scheme = parsed.scheme
-        if scheme == 'http' and netloc in {'www.youtube.com', 'medium.com', 'techcrunch.com'}:
-            scheme = 'https'
-        
-        # Rebuild URL
-        canonical = urlunparse((
-            scheme,
-            netloc,
-            path,
-            parsed.params,
-            clean_query,
-            ''  # Remove fragment
-        ))
-        
-        return canonical
-    
-    except Exception as e:
-        logger.warning(f"Error canonicalizing URL {url}: {e}")
-        return url
-
-
-def hash_url(url: str) -> str:
-    """
-    Generate SHA-256 hash of URL for deduplication.
-    
-    Args:
-        url: URL to hash (should be canonicalized first)
-        
-    Returns:
-        Hex digest of hash
-    """
-    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+# Every posted URL, from the main run (posted_items) and from channels (channel_posts)
+_ALL_POSTS = """
+    SELECT url_hash, MIN(title) AS title
+    FROM (
+        SELECT url_hash, title FROM posted_items
+        UNION ALL
+        SELECT url_hash, title FROM channel_posts
+    )
+    GROUP BY url_hash
+"""
 
 
 class Database:
@@ -104,6 +43,7 @@ class Database:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = sqlite3.connect(str(db_path))
         self.conn.row_factory = sqlite3.Row
+        self.fts_available = False
         self._create_tables()
     
     def _create_tables(self) -> None:
@@ -137,29 +77,224 @@ class Database:
             ON posted_items(posted_at)
         """)
         
+        # Posts of multi-channel runs; each channel dedups on its own history
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS channel_posts (
+                channel TEXT NOT NULL,
+                url_hash TEXT NOT NULL,
+                canonical_url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                source TEXT NOT NULL,
+                posted_at TEXT NOT NULL,
+                relevance_score REAL,
+                PRIMARY KEY (channel, url_hash)
+            )
+        """)
+        
+        # Per-source high-water marks for incremental fetching
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS source_watermarks (
+                source TEXT NOT NULL,
+                key TEXT NOT NULL,
+                watermark TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (source, key)
+            )
+        """)
+        
+        # Cached API search responses (per query and window), with fetch time for TTL
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS search_cache (
+                source TEXT NOT NULL,
+                query TEXT NOT NULL,
+                window TEXT NOT NULL,
+                response TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                PRIMARY KEY (source, query, window)
+            )
+        """)
+        
+        # API quota units spent per quota day
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS api_quota (
+                api TEXT NOT NULL,
+                day TEXT NOT NULL,
+                units INTEGER NOT NULL,
+                PRIMARY KEY (api, day)
+            )
+        """)
+        
+        # Per-host circuit breaker state and recent request latencies
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS host_health (
+                host TEXT PRIMARY KEY,
+                failures INTEGER NOT NULL,
+                open_until TEXT,
+                latencies TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        
+        # Per-feed poll history for adaptive RSS polling
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_history (
+                url TEXT PRIMARY KEY,
+                polled_at TEXT NOT NULL,
+                changed_at TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                rate_per_hour REAL NOT NULL
+            )
+        """)
+        
+        # Source credibility weights; every replacement writes a new version
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS domain_authority (
+                source TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                weight REAL NOT NULL,
+                version INTEGER NOT NULL,
+                PRIMARY KEY (source, domain)
+            )
+        """)
+        
+        # Every scored item of recent runs, for search (see store_candidates)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS candidates (
+                id INTEGER PRIMARY KEY,
+                url_hash TEXT UNIQUE NOT NULL,
+                canonical_url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL,
+                source TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                published_at TEXT NOT NULL,
+                relevance_score REAL NOT NULL,
+                collected_at TEXT NOT NULL
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_candidates_published_at
+            ON candidates(published_at)
+        """)
+        
+        self._create_candidate_index(cursor)
+        
+        # Learned relevance models (see learned.py); weights are float32 bytes
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS learned_models (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                hash_bits INTEGER NOT NULL,
+                bias REAL NOT NULL,
+                weights BLOB NOT NULL,
+                examples INTEGER NOT NULL,
+                positives INTEGER NOT NULL,
+                trained_at TEXT NOT NULL
+            )
+        """)
+        
+        # Learned-model scores of stored candidates, for offline comparison
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS learned_scores (
+                url_hash TEXT PRIMARY KEY,
+                model_version INTEGER NOT NULL,
+                score REAL NOT NULL,
+                scored_at TEXT NOT NULL
+            )
+        """)
+        
+        # Completed chunks of backfill runs, so an interrupted run resumes
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS backfill_chunks (
+                run_id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                chunk_start TEXT NOT NULL,
+                chunk_end TEXT NOT NULL,
+                items INTEGER NOT NULL,
+                completed_at TEXT NOT NULL,
+                PRIMARY KEY (run_id, source, chunk_start)
+            )
+        """)
+        
         self.conn.commit()
         logger.info(f"Database initialized at {self.db_path}")
     
-    def get_posted_url_hashes(self) -> Set[str]:
+    def _create_candidate_index(self, cursor: sqlite3.Cursor) -> None:
+        """Create the FTS5 index over candidates, kept in sync by triggers."""
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+                    title, description, content='candidates', content_rowid='id'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite lacks FTS5 ({e}); candidate search is unavailable")
+            return
+        
+        cursor.executescript("""
+            CREATE TRIGGER IF NOT EXISTS candidates_ai AFTER INSERT ON candidates BEGIN
+                INSERT INTO candidates_fts (rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS candidates_ad AFTER DELETE ON candidates BEGIN
+                INSERT INTO candidates_fts (candidates_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS candidates_au AFTER UPDATE OF title, description ON candidates BEGIN
+                INSERT INTO candidates_fts (candidates_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO candidates_fts (rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END;
+        """)
+        self.fts_available = True
+    
+    def get_posted_url_hashes(self, channel: Optional[str] = None) -> Set[str]:
         """
         Get set of all URL hashes that have been posted.
         
+        Args:
+            channel: Channel of a multi-channel run (None = the main account)
+            
         Returns:
             Set of URL hashes
         """
         cursor = self.conn.cursor()
-        cursor.execute("SELECT url_hash FROM posted_items")
+        if channel is not None:
+            cursor.execute("SELECT url_hash FROM channel_posts WHERE channel = ?", (channel,))
+        else:
+            cursor.execute("SELECT url_hash FROM posted_items")
         return {row['url_hash'] for row in cursor.fetchall()}
     
-    def mark_as_posted(self, item: NewsItem) -> None:
+    def mark_as_posted(self, item: NewsItem, channel: Optional[str] = None) -> None:
         """
         Mark an item as posted.
         
         Args:
             item: NewsItem that was posted
+            channel: Channel it was posted to (None = the main account)
         """
         cursor = self.conn.cursor()
         
+        if channel is not None:
+            with self.conn:
+                cursor.execute("""
+                    INSERT OR IGNORE INTO channel_posts (
+                        channel, url_hash, canonical_url, title, source, posted_at, relevance_score
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    channel,
+                    item.url_hash,
+                    item.canonical_url,
+                    item.title,
+                    item.source,
+                    datetime.now().isoformat(),
+                    item.relevance_score,
+                ))
+            logger.debug(f"Marked as posted to {channel}: {item.canonical_url}")
+            return
+        
         try:
             cursor.execute("""
                 INSERT INTO posted_items (
@@ -184,6 +319,601 @@ class Database:
             # Already posted (duplicate hash)
             logger.warning(f"Attempted to mark duplicate as posted: {item.canonical_url}")
     
+    def get_watermark(self, source: str, key: str) -> Optional[datetime]:
+        """
+        Get the high-water mark recorded for a source query.
+        
+        Args:
+            source: Source name (e.g. 'arxiv')
+            key: Query the watermark belongs to
+            
+        Returns:
+            Latest processed publication time, or None if never recorded
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT watermark FROM source_watermarks WHERE source = ? AND key = ?",
+            (source, key),
+        )
+        row = cursor.fetchone()
+        return datetime.fromisoformat(row['watermark']) if row else None
+    
+    def set_watermark(self, source: str, key: str, watermark: datetime) -> None:
+        """
+        Advance the high-water mark for a source query (never moves it back).
+        
+        Args:
+            source: Source name (e.g. 'arxiv')
+            key: Query the watermark belongs to
+            watermark: Latest processed publication time (timezone-aware)
+        """
+        value = watermark.astimezone(timezone.utc).isoformat()
+        self.conn.execute("""
+            INSERT INTO source_watermarks (source, key, watermark, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(source, key) DO UPDATE SET
+                watermark = MAX(watermark, excluded.watermark),
+                updated_at = excluded.updated_at
+        """, (source, key, value, datetime.now().isoformat()))
+        self.conn.commit()
+        logger.debug(f"Watermark for {source} '{key}' -> {value}")
+    
+    def get_cached_search(self, source: str, query: str, window: str, max_age: timedelta) -> Optional[dict]:
+        """
+        Get a cached search response if it is younger than max_age.
+        
+        Args:
+            source: Source name (e.g. 'youtube')
+            query: Search query
+            window: Search window key (e.g. lookback and page size)
+            max_age: Time-to-live of cached responses
+            
+        Returns:
+            Decoded response, or None if missing or expired
+        """
+        cutoff = (datetime.now(timezone.utc) - max_age).isoformat()
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT response FROM search_cache WHERE source = ? AND query = ? AND window = ? AND fetched_at >= ?",
+            (source, query, window, cutoff),
+        )
+        row = cursor.fetchone()
+        return json.loads(row['response']) if row else None
+    
+    def get_search_fetched_at(self, source: str, query: str, window: str) -> Optional[datetime]:
+        """
+        Get when a search was last fetched from the API, expired or not.
+        
+        Args:
+            source: Source name (e.g. 'youtube')
+            query: Search query
+            window: Search window key
+            
+        Returns:
+            Fetch time, or None if never fetched
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT fetched_at FROM search_cache WHERE source = ? AND query = ? AND window = ?",
+            (source, query, window),
+        )
+        row = cursor.fetchone()
+        return datetime.fromisoformat(row['fetched_at']) if row else None
+    
+    def cache_search(self, source: str, query: str, window: str, response: dict) -> None:
+        """
+        Store a search response.
+        
+        Args:
+            source: Source name (e.g. 'youtube')
+            query: Search query
+            window: Search window key
+            response: Decoded API response
+        """
+        self.conn.execute("""
+            INSERT OR REPLACE INTO search_cache (source, query, window, response, fetched_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, (source, query, window, json.dumps(response), datetime.now(timezone.utc).isoformat()))
+        self.conn.commit()
+    
+    def get_quota_used(self, api: str, day: str) -> int:
+        """
+        Get the quota units spent on an API during a quota day.
+        
+        Args:
+            api: API name (e.g. 'youtube')
+            day: Quota day (YYYY-MM-DD in the API's reset timezone)
+            
+        Returns:
+            Units spent
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT units FROM api_quota WHERE api = ? AND day = ?", (api, day))
+        row = cursor.fetchone()
+        return row['units'] if row else 0
+    
+    def add_quota_used(self, api: str, day: str, units: int) -> None:
+        """
+        Record quota units spent on an API.
+        
+        Args:
+            api: API name (e.g. 'youtube')
+            day: Quota day (YYYY-MM-DD in the API's reset timezone)
+            units: Units to add
+        """
+        self.conn.execute("""
+            INSERT INTO api_quota (api, day, units) VALUES (?, ?, ?)
+            ON CONFLICT(api, day) DO UPDATE SET units = units + excluded.units
+        """, (api, day, units))
+        self.conn.commit()
+    
+    def get_host_health(self) -> Dict[str, dict]:
+        """
+        Get the stored health of every source host.
+        
+        Returns:
+            Host -> {'failures', 'open_until' (datetime or None), 'latencies' (seconds)}
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT host, failures, open_until, latencies FROM host_health")
+        return {
+            row['host']: {
+                'failures': row['failures'],
+                'open_until': datetime.fromisoformat(row['open_until']) if row['open_until'] else None,
+                'latencies': json.loads(row['latencies']),
+            }
+            for row in cursor.fetchall()
+        }
+    
+    def save_host_health(
+        self,
+        host: str,
+        failures: int,
+        open_until: Optional[datetime],
+        latencies: List[float],
+    ) -> None:
+        """
+        Store the health of a source host.
+        
+        Args:
+            host: Host name (with port, if any)
+            failures: Consecutive failed requests
+            open_until: End of the breaker cooldown (None = closed)
+            latencies: Recent request latencies in seconds
+        """
+        self.conn.execute("""
+            INSERT INTO host_health (host, failures, open_until, latencies, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(host) DO UPDATE SET
+                failures = excluded.failures,
+                open_until = excluded.open_until,
+                latencies = excluded.latencies,
+                updated_at = excluded.updated_at
+        """, (
+            host,
+            failures,
+            open_until.astimezone(timezone.utc).isoformat() if open_until else None,
+            json.dumps([round(latency, 4) for latency in latencies]),
+            datetime.now().isoformat(),
+        ))
+        self.conn.commit()
+    
+    def get_feed_history(self, urls: Optional[List[str]] = None) -> Dict[str, dict]:
+        """
+        Get the poll history of RSS feeds.
+        
+        Args:
+            urls: Feeds to look up (None = all)
+            
+        Returns:
+            URL -> {'polled_at', 'changed_at', 'fingerprint', 'rate_per_hour'}
+        """
+        cursor = self.conn.cursor()
+        if urls is None:
+            cursor.execute("SELECT * FROM feed_history")
+        else:
+            cursor.execute(
+                f"SELECT * FROM feed_history WHERE url IN ({', '.join('?' * len(urls))})",
+                urls,
+            )
+        return {
+            row['url']: {
+                'polled_at': datetime.fromisoformat(row['polled_at']),
+                'changed_at': datetime.fromisoformat(row['changed_at']),
+                'fingerprint': row['fingerprint'],
+                'rate_per_hour': row['rate_per_hour'],
+            }
+            for row in cursor.fetchall()
+        }
+    
+    def save_feed_history(
+        self,
+        url: str,
+        polled_at: datetime,
+        changed_at: datetime,
+        fingerprint: str,
+        rate_per_hour: float,
+    ) -> None:
+        """
+        Store the poll history of an RSS feed.
+        
+        Args:
+            url: Feed URL
+            polled_at: Time of the latest successful poll
+            changed_at: Time the feed's entries last changed
+            fingerprint: Hash of the feed's entry links
+            rate_per_hour: Smoothed publication rate
+        """
+        self.conn.execute("""
+            INSERT INTO feed_history (url, polled_at, changed_at, fingerprint, rate_per_hour)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                polled_at = excluded.polled_at,
+                changed_at = excluded.changed_at,
+                fingerprint = excluded.fingerprint,
+                rate_per_hour = excluded.rate_per_hour
+        """, (
+            url,
+            polled_at.astimezone(timezone.utc).isoformat(),
+            changed_at.astimezone(timezone.utc).isoformat(),
+            fingerprint,
+            rate_per_hour,
+        ))
+        self.conn.commit()
+    
+    def get_domain_authority_version(self) -> int:
+        """
+        Get the version of the stored domain authority table.
+        
+        Returns:
+            Version number (0 if the table is empty)
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT COALESCE(MAX(version), 0) AS version FROM domain_authority")
+        return cursor.fetchone()['version']
+    
+    def get_domain_authority(self) -> Tuple[int, List[Tuple[str, str, float]]]:
+        """
+        Get the stored domain authority table.
+        
+        Returns:
+            (version, [(source, domain, weight), ...])
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT source, domain, weight, version FROM domain_authority")
+        rows = cursor.fetchall()
+        version = max((row['version'] for row in rows), default=0)
+        return version, [(row['source'], row['domain'], row['weight']) for row in rows]
+    
+    def replace_domain_authority(self, rows: Iterable[Tuple[str, str, float]]) -> int:
+        """
+        Replace the domain authority table in one transaction.
+        
+        Args:
+            rows: (source, domain, weight); an empty list restores the built-in weights
+            
+        Returns:
+            New version number (the replacement time in milliseconds, so
+            versions keep increasing across a reset)
+        """
+        version = max(self.get_domain_authority_version() + 1, int(time.time() * 1000))
+        with self.conn:
+            self.conn.execute("DELETE FROM domain_authority")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO domain_authority (source, domain, weight, version) VALUES (?, ?, ?, ?)",
+                [(source, domain, weight, version) for source, domain, weight in rows],
+            )
+        return version
+    
+    def store_candidates(self, items: Iterable[NewsItem]) -> int:
+        """
+        Upsert scored items into the candidate store in one transaction.
+        
+        An item seen again keeps its row; title, description and score are
+        refreshed.
+        
+        Args:
+            items: Scored NewsItems
+            
+        Returns:
+            Number of items written
+        """
+        collected_at = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (
+                item.url_hash,
+                item.canonical_url,
+                item.title,
+                item.description or '',
+                item.source,
+                item.domain,
+                item.published_at.astimezone(timezone.utc).isoformat(),
+                item.relevance_score,
+                collected_at,
+            )
+            for item in items
+        ]
+        if not rows:
+            return 0
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO candidates (
+                    url_hash, canonical_url, title, description, source,
+                    domain, published_at, relevance_score, collected_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url_hash) DO UPDATE SET
+                    title = excluded.title,
+                    description = excluded.description,
+                    relevance_score = excluded.relevance_score,
+                    collected_at = excluded.collected_at
+            """, rows)
+        return len(rows)
+    
+    def search_candidates(
+        self,
+        match: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        source: Optional[str] = None,
+        min_bm25: Optional[float] = None,
+        limit: int = 50,
+    ) -> List[dict]:
+        """
+        Full-text search the candidate store, best BM25 match first.
+        
+        Args:
+            match: FTS5 query ('fraud AND agent*', '"claims automation" OR underwriting')
+            since: Only items published at or after this time
+            until: Only items published before this time
+            source: Only items from this source
+            min_bm25: Only matches scoring at least this
+            limit: Maximum rows returned
+            
+        Returns:
+            Candidate rows as dicts, with 'bm25' (higher = better match)
+            
+        Raises:
+            RuntimeError: SQLite was built without FTS5
+            sqlite3.OperationalError: The query is not valid FTS5 syntax
+        """
+        if not self.fts_available:
+            raise RuntimeError("Candidate search needs SQLite with FTS5")
+        
+        rank = f"-bm25(candidates_fts, {BM25_TITLE_WEIGHT}, {BM25_DESCRIPTION_WEIGHT})"
+        conditions = ["candidates_fts MATCH ?"]
+        params: list = [match]
+        if since is not None:
+            conditions.append("c.published_at >= ?")
+            params.append(since.astimezone(timezone.utc).isoformat())
+        if until is not None:
+            conditions.append("c.published_at < ?")
+            params.append(until.astimezone(timezone.utc).isoformat())
+        if source is not None:
+            conditions.append("c.source = ?")
+            params.append(source)
+        if min_bm25 is not None:
+            conditions.append(f"{rank} >= ?")
+            params.append(min_bm25)
+        params.append(limit)
+        
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT c.*, {rank} AS bm25
+            FROM candidates_fts
+            JOIN candidates c ON c.id = candidates_fts.rowid
+            WHERE {' AND '.join(conditions)}
+            ORDER BY bm25 DESC
+            LIMIT ?
+        """, params)
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def prune_candidates(self, older_than: datetime) -> int:
+        """
+        Delete candidates published before a cutoff.
+        
+        Args:
+            older_than: Cutoff time
+            
+        Returns:
+            Number of rows deleted
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM candidates WHERE published_at < ?",
+                (older_than.astimezone(timezone.utc).isoformat(),),
+            )
+            self.conn.execute(
+                "DELETE FROM learned_scores WHERE url_hash NOT IN (SELECT url_hash FROM candidates)"
+            )
+        return cursor.rowcount
+    
+    def get_training_examples(self) -> List[Tuple[str, str, Optional[float], int]]:
+        """
+        Get labeled examples for the learned relevance model.
+        
+        Items posted by the main run or any channel are positives; every
+        other stored candidate is a negative. Posted items no longer in the
+        candidate store contribute their title only.
+        
+        Returns:
+            (title, description, keyword relevance score or None, label) tuples
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            WITH posted AS ({_ALL_POSTS})
+            SELECT c.title, c.description, c.relevance_score,
+                   p.url_hash IS NOT NULL AS label
+            FROM candidates c
+            LEFT JOIN posted p ON p.url_hash = c.url_hash
+            UNION ALL
+            SELECT p.title, '', NULL, 1
+            FROM posted p
+            WHERE p.url_hash NOT IN (SELECT url_hash FROM candidates)
+        """)
+        return [
+            (row['title'], row['description'], row['relevance_score'], int(row['label']))
+            for row in cursor.fetchall()
+        ]
+    
+    def save_learned_model(
+        self,
+        name: str,
+        hash_bits: int,
+        bias: float,
+        weights: bytes,
+        examples: int,
+        positives: int,
+    ) -> int:
+        """
+        Store a trained model, replacing the previous one of that name.
+        
+        Args:
+            name: Model name
+            hash_bits: Feature space size (2 ** hash_bits weights)
+            bias: Intercept
+            weights: Weights as little-endian float32 bytes
+            examples: Training examples used
+            positives: Positive examples among them
+            
+        Returns:
+            New model version
+        """
+        with self.conn:
+            row = self.conn.execute("SELECT version FROM learned_models WHERE name = ?", (name,)).fetchone()
+            version = (row['version'] if row else 0) + 1
+            self.conn.execute("""
+                INSERT OR REPLACE INTO learned_models (
+                    name, version, hash_bits, bias, weights, examples, positives, trained_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (name, version, hash_bits, bias, weights, examples, positives,
+                  datetime.now(timezone.utc).isoformat()))
+        return version
+    
+    def get_learned_model(self, name: str) -> Optional[dict]:
+        """
+        Get a stored model.
+        
+        Args:
+            name: Model name
+            
+        Returns:
+            Row as a dict (weights as bytes), or None if never trained
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT * FROM learned_models WHERE name = ?", (name,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+    
+    def store_learned_scores(self, model_version: int, scores: Iterable[Tuple[str, float]]) -> int:
+        """
+        Record learned-model scores next to the candidate store.
+        
+        Args:
+            model_version: Version of the model that produced the scores
+            scores: (url_hash, score) pairs
+            
+        Returns:
+            Number of scores written
+        """
+        scored_at = datetime.now(timezone.utc).isoformat()
+        rows = [(url_hash, model_version, score, scored_at) for url_hash, score in scores]
+        if not rows:
+            return 0
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO learned_scores (url_hash, model_version, score, scored_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+    
+    def get_score_comparison(self, since: Optional[datetime] = None) -> List[dict]:
+        """
+        Get stored candidates with both scores and whether they were posted
+        (by the main run or any channel).
+        
+        Args:
+            since: Only candidates published at or after this time
+            
+        Returns:
+            Rows with title, canonical_url, source, relevance_score,
+            learned_score, model_version and posted (0/1)
+        """
+        cursor = self.conn.cursor()
+        query = f"""
+            WITH posted AS ({_ALL_POSTS})
+            SELECT c.title, c.canonical_url, c.source, c.relevance_score,
+                   l.score AS learned_score, l.model_version,
+                   p.url_hash IS NOT NULL AS posted
+            FROM candidates c
+            JOIN learned_scores l ON l.url_hash = c.url_hash
+            LEFT JOIN posted p ON p.url_hash = c.url_hash
+        """
+        params = []
+        if since is not None:
+            query += " WHERE c.published_at >= ?"
+            params.append(since.astimezone(timezone.utc).isoformat())
+        cursor.execute(query, params)
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def get_completed_backfill_chunks(self, run_id: str) -> Set[Tuple[str, str]]:
+        """
+        Get the chunks of a backfill run that already completed.
+        
+        Args:
+            run_id: Backfill run identifier
+            
+        Returns:
+            Set of (source, chunk start in UTC ISO format)
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT source, chunk_start FROM backfill_chunks WHERE run_id = ?", (run_id,))
+        return {(row['source'], row['chunk_start']) for row in cursor.fetchall()}
+    
+    def mark_backfill_chunk_done(
+        self,
+        run_id: str,
+        source: str,
+        chunk_start: datetime,
+        chunk_end: datetime,
+        items: int,
+    ) -> None:
+        """
+        Checkpoint a completed backfill chunk.
+        
+        Args:
+            run_id: Backfill run identifier
+            source: Source the chunk covered
+            chunk_start: Chunk start (inclusive)
+            chunk_end: Chunk end (exclusive)
+            items: Items stored for the chunk
+        """
+        with self.conn:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO backfill_chunks (run_id, source, chunk_start, chunk_end, items, completed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                run_id,
+                source,
+                chunk_start.astimezone(timezone.utc).isoformat(),
+                chunk_end.astimezone(timezone.utc).isoformat(),
+                items,
+                datetime.now(timezone.utc).isoformat(),
+            ))
+    
+    def clear_backfill_run(self, run_id: str) -> int:
+        """
+        Forget the checkpoints of a backfill run so it starts over.
+        
+        Args:
+            run_id: Backfill run identifier
+            
+        Returns:
+            Number of checkpoints removed
+        """
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM backfill_chunks WHERE run_id = ?", (run_id,))
+        return cursor.rowcount
+    
     def get_stats(self) -> dict:
         """
         Get database statistics.
@@ -210,9 +940,13 @@ class Database:
         """)
         last_7_days = cursor.fetchone()['count']
         
+        cursor.execute("SELECT channel, COUNT(*) as count FROM channel_posts GROUP BY channel")
+        by_channel = {row['channel']: row['count'] for row in cursor.fetchall()}
+        
         return {
             'total_posted': total,
             'by_source': by_source,
+            'by_channel': by_channel,
             'last_7_days': last_7_days,
         }
     
@@ -223,6 +957,153 @@ class Database:
             logger.debug("Database connection closed")
 
 
+class WatermarkLedger:
+    """
+    Source watermarks of one run, written only once its items are dealt with.
+    
+    Sources read stored watermarks through the ledger and record new ones
+    in it, as they would with the Database. Nothing is written until
+    commit(), which the pipeline calls after a live run posted its
+    selection. Relevant items the run left unposted (cut by the selection
+    limits, or failed to post) are held: the watermark of their source
+    stays below the oldest of them, so the next run fetches them again.
+    
+    RSS feed polls (sources.feed_schedule) go through the ledger the same
+    way, so a dry run does not push back the next live poll of a feed.
+    """
+    
+    def __init__(self, db: Database):
+        """
+        Initialize an empty ledger.
+        
+        Args:
+            db: Database holding the stored watermarks
+        """
+        self.db = db
+        self._pending: Dict[Tuple[str, str], datetime] = {}
+        self._held: Dict[str, datetime] = {}
+        self._feed_polls: Dict[str, Tuple[datetime, datetime, str, float]] = {}
+    
+    def get_watermark(self, source: str, key: str) -> Optional[datetime]:
+        """
+        Get the stored high-water mark for a source query.
+        
+        Args:
+            source: Source name (e.g. 'arxiv')
+            key: Query the watermark belongs to
+            
+        Returns:
+            Watermark stored by earlier runs (pending ones are not visible)
+        """
+        return self.db.get_watermark(source, key)
+    
+    def set_watermark(self, source: str, key: str, watermark: datetime) -> None:
+        """
+        Record a new high-water mark, written on commit().
+        
+        Args:
+            source: Source name (e.g. 'arxiv')
+            key: Query the watermark belongs to
+            watermark: Latest fetched publication time (timezone-aware)
+        """
+        current = self._pending.get((source, key))
+        if current is None or watermark > current:
+            self._pending[(source, key)] = watermark
+    
+    def hold(self, items: Iterable[NewsItem]) -> None:
+        """
+        Keep the watermarks of these items' sources below them.
+        
+        Args:
+            items: Relevant items this run did not post
+        """
+        for item in items:
+            self.hold_at(item.source, item.published_at)
+    
+    def hold_at(self, source: str, published_at: datetime) -> None:
+        """
+        Keep a source's watermarks below a publication time.
+        
+        Args:
+            source: Source name (NewsItem.source)
+            published_at: Publication time of an item to fetch again
+        """
+        current = self._held.get(source)
+        if current is None or published_at < current:
+            self._held[source] = published_at
+    
+    def get_feed_history(self, urls: Optional[List[str]] = None) -> Dict[str, dict]:
+        """
+        Get the poll history of RSS feeds.
+        
+        Args:
+            urls: Feeds to look up (None = all)
+            
+        Returns:
+            History stored by earlier runs (see Database.get_feed_history)
+        """
+        return self.db.get_feed_history(urls)
+    
+    def save_feed_history(
+        self,
+        url: str,
+        polled_at: datetime,
+        changed_at: datetime,
+        fingerprint: str,
+        rate_per_hour: float,
+    ) -> None:
+        """
+        Record a feed poll, written on commit().
+        
+        Args:
+            url: Feed URL
+            polled_at: Time of the latest successful poll
+            changed_at: Time the feed's entries last changed
+            fingerprint: Hash of the feed's entry links
+            rate_per_hour: Smoothed publication rate
+        """
+        self._feed_polls[url] = (polled_at, changed_at, fingerprint, rate_per_hour)
+    
+    def commit(self) -> int:
+        """
+        Write the pending watermarks, capped below held items, and feed polls.
+        
+        Returns:
+            Number of watermarks and feed polls written
+        """
+        for (source, key), watermark in self._pending.items():
+            held = self._held.get(source)
+            if held is not None and held <= watermark:
+                # Stored watermarks never move back, so this may leave it unchanged
+                watermark = held - timedelta(microseconds=1)
+                logger.info(f"Watermark for {source} '{key}' held at {watermark:%Y-%m-%d %H:%M} UTC "
+                            f"for unposted items")
+            self.db.set_watermark(source, key, watermark)
+        for url, poll in self._feed_polls.items():
+            self.db.save_feed_history(url, *poll)
+        written = len(self._pending) + len(self._feed_polls)
+        self._pending.clear()
+        self._held.clear()
+        self._feed_polls.clear()
+        return written
+
+
+def prepare_item_for_dedup(item: NewsItem) -> NewsItem:
+    """
+    Canonicalize a single item's URL and generate its hash.
+    
+    Both are lazy properties of NewsItem; this computes them up front.
+    
+    Args:
+        item: NewsItem
+        
+    Returns:
+        Same item with canonical_url and url_hash cached
+    """
+    item.url_hash  # also caches canonical_url
+    return item
+
+
 def prepare_items_for_dedup(items: List[NewsItem]) -> List[NewsItem]:
     """
     Prepare items for deduplication by canonicalizing URLs and generating hashes.
@@ -234,8 +1115,7 @@ def prepare_items_for_dedup(items: List[NewsItem]) -> List[NewsItem]:
         Same list with canonical_url and url_hash fields populated
     """
     for item in items:
-        item.canonical_url = canonicalize_url(item.url)
-        item.url_hash = hash_url(item.canonical_url)
+        prepare_item_for_dedup(item)
     
     return items
 
@@ -0,0 +1,314 @@
+"""Learned relevance model: logistic regression on hashed n-grams.
+
+An optional companion to the keyword scorer, trained on the only labels we
+have: items that were posted (positives) against every other stored
+candidate (negatives). Unigrams and bigrams of the lowercased title and
+description are hashed into 2 ** hash_bits signed features (the hashing
+trick), so there is no vocabulary to store and unseen words cost nothing.
+Weights are kept in the learned_models table. Inference builds one sparse
+(coordinate-format) matrix per batch and scores it with two vectorized
+NumPy calls; it runs in shadow mode next to the keyword scorer, writing
+to learned_scores for offline comparison, and never changes what is
+posted. NumPy is optional and only needed when the model is used.
+"""
+
+import logging
+import math
+import re
+import zlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from .config import Config
+from .models import NewsItem
+
+if TYPE_CHECKING:
+    from .db import Database
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = 'relevance'
+DEFAULT_HASH_BITS = 18
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+# Top hash bit picks the feature's sign; hash_bits stays below it
+_SIGN_BIT = 1 << 31
+MAX_HASH_BITS = 24
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("The learned scorer needs NumPy (pip install numpy)")
+
+
+def gram_hashes(text_lower: str) -> set:
+    """
+    Hash the unigrams and bigrams of a text.
+    
+    Args:
+        text_lower: Lowercased text (see NewsItem.lowered_text)
+        
+    Returns:
+        Set of 32-bit CRC hashes (stable across processes, unlike hash())
+    """
+    tokens = _TOKEN.findall(text_lower)
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return {zlib.crc32(gram.encode()) for gram in grams}
+
+
+@dataclass
+class FeatureMatrix:
+    """Sparse rows x 2 ** hash_bits matrix in coordinate format."""
+    
+    rows: "np.ndarray"
+    cols: "np.ndarray"
+    values: "np.ndarray"
+    n_rows: int
+    
+    @classmethod
+    def from_texts(cls, texts: Sequence[str], hash_bits: int) -> "FeatureMatrix":
+        """
+        Featurize texts: binary signed n-gram features, L2-normalized per row.
+        
+        Args:
+            texts: Lowercased texts
+            hash_bits: Feature space size exponent
+            
+        Returns:
+            FeatureMatrix with one row per text
+        """
+        _require_numpy()
+        mask = (1 << hash_bits) - 1
+        rows: List[int] = []
+        cols: List[int] = []
+        values: List[float] = []
+        for i, text in enumerate(texts):
+            hashes = gram_hashes(text)
+            if not hashes:
+                continue
+            value = 1.0 / math.sqrt(len(hashes))
+            for h in hashes:
+                rows.append(i)
+                cols.append(h & mask)
+                values.append(value if h & _SIGN_BIT else -value)
+        return cls(
+            np.array(rows, dtype=np.int64),
+            np.array(cols, dtype=np.int64),
+            np.array(values, dtype=np.float64),
+            len(texts),
+        )
+    
+    def dot(self, weights: "np.ndarray") -> "np.ndarray":
+        """Matrix-vector product X @ weights, one value per row."""
+        return np.bincount(self.rows, weights=self.values * weights[self.cols], minlength=self.n_rows)
+    
+    def rdot(self, row_values: "np.ndarray", size: int) -> "np.ndarray":
+        """Transposed product X.T @ row_values, one value per feature."""
+        return np.bincount(self.cols, weights=self.values * row_values[self.rows], minlength=size)
+
+
+def _sigmoid(z: "np.ndarray") -> "np.ndarray":
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30.0, 30.0)))
+
+
+def auc(scores: Sequence[float], labels: Sequence[int]) -> Optional[float]:
+    """
+    Area under the ROC curve (probability a positive outranks a negative).
+    
+    Args:
+        scores: Scores, higher = more relevant
+        labels: 1 for positives, 0 for negatives
+        
+    Returns:
+        AUC in [0, 1], or None without both classes
+    """
+    _require_numpy()
+    scores = np.asarray(scores, dtype=np.float64)
+    labels = np.asarray(labels, dtype=bool)
+    positives = int(labels.sum())
+    negatives = len(labels) - positives
+    if not positives or not negatives:
+        return None
+    # Average ranks, so ties count half (Mann-Whitney U)
+    order = np.argsort(scores, kind='mergesort')
+    ranks = np.empty(len(scores))
+    sorted_scores = scores[order]
+    _, first, counts = np.unique(sorted_scores, return_index=True, return_counts=True)
+    average = first + (counts + 1) / 2.0
+    ranks[order] = np.repeat(average, counts)
+    return float((ranks[labels].sum() - positives * (positives + 1) / 2.0) / (positives * negatives))
+
+
+class LearnedModel:
+    """Logistic regression over hashed unigram and bigram features."""
+    
+    def __init__(self, weights: "np.ndarray", bias: float, hash_bits: int, version: int = 0):
+        """
+        Wrap trained parameters.
+        
+        Args:
+            weights: 2 ** hash_bits feature weights
+            bias: Intercept
+            hash_bits: Feature space size exponent
+            version: Stored version (0 = not saved)
+        """
+        self.weights = weights
+        self.bias = bias
+        self.hash_bits = hash_bits
+        self.version = version
+    
+    @classmethod
+    def train(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[int],
+        hash_bits: int = DEFAULT_HASH_BITS,
+        epochs: int = 200,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+    ) -> "LearnedModel":
+        """
+        Fit the model with full-batch AdaGrad.
+        
+        Classes are weighted to equal total mass, since posted items are a
+        small minority of what is collected.
+        
+        Args:
+            texts: Lowercased texts
+            labels: 1 = posted, 0 = not posted
+            hash_bits: Feature space size exponent
+            epochs: Gradient steps over the whole set
+            learning_rate: AdaGrad step size
+            l2: L2 penalty on the feature weights
+            
+        Returns:
+            Trained (unsaved) model
+        """
+        _require_numpy()
+        if not 1 <= hash_bits <= MAX_HASH_BITS:
+            raise ValueError(f"hash_bits must be between 1 and {MAX_HASH_BITS}")
+        y = np.asarray(labels, dtype=np.float64)
+        positives = int(y.sum())
+        if not 0 < positives < len(y):
+            raise ValueError("Training needs both posted and unposted examples")
+        
+        features = FeatureMatrix.from_texts(texts, hash_bits)
+        size = 1 << hash_bits
+        sample_weight = np.where(y == 1, len(y) / (2.0 * positives), len(y) / (2.0 * (len(y) - positives)))
+        weights = np.zeros(size)
+        bias = 0.0
+        weight_history = np.zeros(size)
+        bias_history = 0.0
+        for _ in range(epochs):
+            error = sample_weight * (_sigmoid(features.dot(weights) + bias) - y) / len(y)
+            gradient = features.rdot(error, size) + l2 * weights
+            bias_gradient = float(error.sum())
+            weight_history += gradient * gradient
+            bias_history += bias_gradient * bias_gradient
+            weights -= learning_rate * gradient / (np.sqrt(weight_history) + 1e-8)
+            bias -= learning_rate * bias_gradient / (math.sqrt(bias_history) + 1e-8)
+        return cls(weights.astype(np.float32), bias, hash_bits)
+    
+    @classmethod
+    def load(cls, db: "Database", name: str = MODEL_NAME) -> Optional["LearnedModel"]:
+        """
+        Load the stored model.
+        
+        Args:
+            db: Database holding learned_models
+            name: Model name
+            
+        Returns:
+            LearnedModel, or None if none was trained
+            
+        Raises:
+            RuntimeError: NumPy is not installed
+        """
+        _require_numpy()
+        row = db.get_learned_model(name)
+        if row is None:
+            return None
+        weights = np.frombuffer(row['weights'], dtype='<f4')
+        return cls(weights, row['bias'], row['hash_bits'], row['version'])
+    
+    def save(self, db: "Database", examples: int, positives: int, name: str = MODEL_NAME) -> int:
+        """
+        Store the model, replacing the previous version.
+        
+        Args:
+            db: Database holding learned_models
+            examples: Training examples used
+            positives: Positive examples among them
+            name: Model name
+            
+        Returns:
+            New version
+        """
+        self.version = db.save_learned_model(
+            name,
+            self.hash_bits,
+            self.bias,
+            self.weights.astype('<f4').tobytes(),
+            examples,
+            positives,
+        )
+        return self.version
+    
+    def predict(self, texts: Sequence[str]) -> "np.ndarray":
+        """
+        Score a batch of texts.
+        
+        Args:
+            texts: Lowercased texts
+            
+        Returns:
+            Probability of being posted, per text
+        """
+        if not texts:
+            return np.zeros(0)
+        return _sigmoid(FeatureMatrix.from_texts(texts, self.hash_bits).dot(self.weights) + self.bias)
+    
+    def predict_items(self, items: Sequence[NewsItem]) -> List[float]:
+        """
+        Score a batch of items.
+        
+        Args:
+            items: Items to score
+            
+        Returns:
+            Probability of being posted, per item
+        """
+        return self.predict([item.lowered_text() for item in items]).tolist()
+
+
+def load_learned_model(config: Config, db: "Database") -> Optional[LearnedModel]:
+    """
+    Load the model a run scores with in shadow mode.
+    
+    Args:
+        config: Application configuration
+        db: Database holding learned_models
+        
+    Returns:
+        LearnedModel, or None when disabled, untrained or NumPy is missing
+    """
+    if not config.learned_scorer:
+        return None
+    if not config.candidate_store:
+        logger.warning("Learned scorer needs CANDIDATE_STORE=true (scores are kept next to candidates)")
+        return None
+    try:
+        model = LearnedModel.load(db)
+    except RuntimeError as e:
+        logger.warning(f"Learned scorer disabled: {e}")
+        return None
+    if model is None:
+        logger.warning("Learned scorer enabled but no model is trained yet (scripts/learned_model.py train)")
+        return None
+    logger.info(f"Learned scorer: model v{model.version} ({1 << model.hash_bits} features), shadow mode")
+    return model
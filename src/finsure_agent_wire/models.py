@@ -1,14 +1,25 @@
 """Data models for news items."""
 
-import re
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
+from .domains import registrable_domain
+from .render import render_tweet
+from .text import searchable_text
+from .urls import canonicalize_url, hash_url, url_domain
 
-@dataclass
+
+@dataclass(slots=True)
 class NewsItem:
-    """Represents a news article, video, or RSS item."""
+    """
+    Represents a news article, video, or RSS item.
+    
+    Slotted to keep large populations (backfills, streaming) compact.
+    domain, canonical_url and url_hash are derived from url on first
+    access and cached, so items dropped by scoring never parse their URL.
+    """
     
     # Required fields
     url: str
@@ -18,122 +29,100 @@ class NewsItem:
     
     # Optional fields
     description: Optional[str] = None
-    domain: Optional[str] = None
-    canonical_url: Optional[str] = None
-    url_hash: Optional[str] = None
     
     # Scoring
     relevance_score: float = 0.0
     
+    # Source metadata
+    matched_queries: Optional[List[str]] = None  # search queries that returned this item
+    
+    # Lowercased title + description for keyword matching (see lowered_text)
+    text_lower: Optional[str] = None
+    
+    # Caches behind the derived properties below
+    _domain: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _registrable_domain: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _canonical_url: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _url_hash: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
-        """Post-initialization processing."""
-        if not self.domain and self.url:
-            from urllib.parse import urlparse
-            self.domain = urlparse(self.url).netloc.lower()
+        """Intern the source name, shared by every item from that source."""
+        self.source = sys.intern(self.source)
+    
+    @property
+    def domain(self) -> str:
+        """Lowercased host of url."""
+        if self._domain is None:
+            self._domain = url_domain(self.url) if self.url else ''
+        return self._domain
+    
+    @domain.setter
+    def domain(self, value: str) -> None:
+        self._domain = value
+        self._registrable_domain = None
+    
+    @property
+    def registrable_domain(self) -> str:
+        """eTLD+1 of domain ('uk.reuters.com' -> 'reuters.com'), the site an item counts against."""
+        if self._registrable_domain is None:
+            self._registrable_domain = registrable_domain(self.domain)
+        return self._registrable_domain
+    
+    @registrable_domain.setter
+    def registrable_domain(self, value: str) -> None:
+        self._registrable_domain = value
+    
+    @property
+    def canonical_url(self) -> str:
+        """url without tracking parameters, fragment or trailing slash (see urls.canonicalize_url)."""
+        if self._canonical_url is None:
+            self._canonical_url = canonicalize_url(self.url)
+        return self._canonical_url
+    
+    @canonical_url.setter
+    def canonical_url(self, value: str) -> None:
+        self._canonical_url = value
+        self._url_hash = None
+    
+    @property
+    def url_hash(self) -> str:
+        """SHA-256 of canonical_url, the deduplication key."""
+        if self._url_hash is None:
+            self._url_hash = hash_url(self.canonical_url)
+        return self._url_hash
+    
+    @url_hash.setter
+    def url_hash(self, value: str) -> None:
+        self._url_hash = value
+    
+    def lowered_text(self) -> str:
+        """Lowercased title + description, computed once and kept on the item."""
+        if self.text_lower is None:
+            self.text_lower = searchable_text(self.title, self.description)
+        return self.text_lower
     
     def to_dict(self) -> dict:
         """Convert to dictionary for database storage."""
         return {
             "url": self.url,
-            "canonical_url": self.canonical_url or self.url,
-            "url_hash": self.url_hash or "",
+            "canonical_url": self.canonical_url,
+            "url_hash": self.url_hash,
             "title": self.title,
             "description": self.description or "",
             "source": self.source,
-            "domain": self.domain or "",
+            "domain": self.domain,
             "published_at": self.published_at.isoformat(),
             "relevance_score": self.relevance_score,
         }
     
-    def _truncate_text(self, text: str, max_len: int) -> str:
-        """Trim text to a maximum length, adding ellipsis when needed."""
-        if len(text) <= max_len:
-            return text
-        return text[: max_len - 3].rstrip(" ,;:.") + "..."
-    
-    def _extract_summary(self, max_len: int = 180) -> str:
-        """Pull a short summary from description or title."""
-        text = (self.description or self.title or "").strip()
-        if not text:
-            return ""
-        
-        sentences = re.split(r"(?<=[.!?])\s+", text)
-        summary = sentences[0] if sentences else text
-        return self._truncate_text(summary, max_len)
-    
-    def _pick_tone(self) -> str:
-        """
-        Choose a tone for the tweet based on content keywords.
-        
-        Returns one of: 'news', 'serious', 'light'
-        """
-        text = f"{self.title} {self.description or ''}".lower()
-        
-        serious_keywords = [
-            "fraud", "regulation", "regulatory", "breach",
-            "lawsuit", "crime", "guilty", "sec ", "fine",
-            "compliance", "penalty", "probe",
-        ]
-        upbeat_keywords = [
-            "launch", "introduces", "debuts", "announces",
-            "survey", "report", "forecasts", "budget",
-            "funding", "round", "earnings", "expands",
-            "autonomous", "agents", "ai", "cloud",
-        ]
-        
-        if any(kw in text for kw in serious_keywords):
-            return "serious"
-        if any(kw in text for kw in upbeat_keywords):
-            return "news"
-        
-        if self.url_hash:
-            tones = ["news", "serious", "light"]
-            return tones[int(self.url_hash, 16) % len(tones)]
-        return "news"
-    
     def format_tweet(self, max_length: int = 280) -> str:
         """
-        Format item as a tweet with a short summary and tone-aware template.
+        Format item as a tweet (see render.render_tweet).
         
-        Tones:
-            - news: concise headline-style
-            - serious: cautionary or weighty items
-            - light: slightly playful TL;DR
+        Args:
+            max_length: Maximum tweet length
+            
+        Returns:
+            Tweet text
         """
-        link = self.canonical_url or self.url
-        title = (self.title or "").strip()
-        summary = self._extract_summary(max_len=140)
-        
-        if summary.lower() == title.lower():
-            summary = ""
-        
-        tone = self._pick_tone()
-        
-        templates = {
-            "news": "AI+finance brief: {summary} | {title}. {link}",
-            "serious": "Heads-up: {summary} | {title}. Read: {link}",
-            "light": "Quick take: {summary} ({title}) {link}",
-        }
-        
-        template = templates.get(tone, templates["news"])
-        
-        def build(summary_text: str) -> str:
-            summary_part = summary_text if summary_text else title
-            return template.format(summary=summary_part, title=title, link=link).strip()
-        
-        tweet = build(summary)
-        
-        if len(tweet) > max_length and summary:
-            room = max_length - (len(tweet) - len(summary))
-            if room > 20:
-                shortened = self._truncate_text(summary, room)
-                tweet = build(shortened)
-        
-        if len(tweet) > max_length:
-            compact = f"{title} - {link}"
-            if len(compact) > max_length:
-                available = max_length - len(link) - 3  # room for separator and ellipsis
-                compact = f"{self._truncate_text(title, available)} - {link}"
-            tweet = compact[:max_length]
-        
-        return tweet
+        return render_tweet(self, max_length)
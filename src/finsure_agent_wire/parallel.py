@@ -0,0 +1,218 @@
+"""Process-pool scoring and URL canonicalization for large batches.
+
+Keyword matching and URL canonicalization are pure Python and CPU-bound,
+so on large batches (backfills, multi-channel runs) they are sharded across
+worker processes. Workers receive compact rows of plain strings and floats
+(lowered text, URL, source, age in hours) instead of pickled NewsItems, and
+send back scores plus, for items some channel scored, the derived domain,
+registrable domain, canonical URL and hash. Shards are mapped in order, so
+results line up with the input. Batches below min_batch, or a pool of one
+worker, are scored in-process, which gives identical results. Workers are
+started with forkserver (spawn where it is unavailable), never fork: the
+pool is started from threaded code (backfill), and a forked child could
+inherit a lock some other thread held.
+"""
+
+import logging
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .authority import AuthorityTable
+from .channels import ChannelProfile, ChannelScorer
+from .config import Config
+from .domains import registrable_domain, use_public_suffix_list
+from .models import NewsItem
+from .urls import canonicalize_url, hash_url, url_domain
+
+logger = logging.getLogger(__name__)
+
+# Shards per worker, so a slow shard does not leave the other workers idle
+SHARDS_PER_WORKER = 4
+
+# Start method for workers; fork is unsafe once other threads are running
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# (lowered text, url, source, hours ago)
+Row = Tuple[str, str, str, float]
+# (scores, (domain, registrable domain, canonical url, url hash) if any channel scored)
+Result = Tuple[List[float], Optional[Tuple[str, str, str, str]]]
+
+# Worker-process state, set by _init_worker
+_worker_scorer: Optional[ChannelScorer] = None
+
+
+def _init_worker(scorer: ChannelScorer, public_suffix_list: Optional[Path]) -> None:
+    global _worker_scorer
+    if public_suffix_list:
+        use_public_suffix_list(public_suffix_list)
+    _worker_scorer = scorer
+
+
+def score_rows(scorer: ChannelScorer, rows: Sequence[Row]) -> List[Result]:
+    """
+    Score rows and derive URL fields for the ones any channel scored.
+    
+    Args:
+        scorer: Channel scorer
+        rows: Compact item rows
+        
+    Returns:
+        One result per row, in order
+    """
+    results = []
+    for text_lower, url, source, hours_ago in rows:
+        bases = scorer.keyword_scores(text_lower)
+        if all(base is None for base in bases):
+            results.append(([0.0] * len(bases), None))
+            continue
+        domain = url_domain(url) if url else ''
+        site = registrable_domain(domain)
+        canonical = canonicalize_url(url)
+        results.append((
+            scorer.add_boosts(bases, source, site, hours_ago),
+            (domain, site, canonical, hash_url(canonical)),
+        ))
+    return results
+
+
+def _score_shard(rows: List[Row]) -> List[Result]:
+    return score_rows(_worker_scorer, rows)
+
+
+class ParallelScorer:
+    """Scores item batches for one or more channels, in a process pool when they are large."""
+    
+    def __init__(
+        self,
+        scorer: ChannelScorer,
+        workers: int = 0,
+        min_batch: int = 5000,
+        public_suffix_list: Optional[Path] = None,
+    ):
+        """
+        Initialize the scorer; the pool starts on the first large batch.
+        
+        Args:
+            scorer: Channel scorer (copied into each worker)
+            workers: Worker processes (0 or 1 = always in-process)
+            min_batch: Smaller batches are scored in-process
+            public_suffix_list: Suffix list the workers load (see domains.use_public_suffix_list)
+        """
+        self.scorer = scorer
+        self.workers = workers
+        self.min_batch = min_batch
+        self.public_suffix_list = public_suffix_list
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(
+        cls,
+        config: Config,
+        profiles: Optional[List[ChannelProfile]] = None,
+        authority: Optional[AuthorityTable] = None,
+    ) -> "ParallelScorer":
+        """
+        Build a scorer from the configuration.
+        
+        Args:
+            config: Application configuration
+            profiles: Channel profiles (default: the main scoring profile)
+            authority: Source credibility table (default: built-in weights)
+            
+        Returns:
+            ParallelScorer instance
+        """
+        scorer = ChannelScorer(
+            profiles or [ChannelProfile.default(config)],
+            recency_weight=config.recency_weight,
+            authority=authority,
+        )
+        return cls(scorer, config.parallel_workers, config.parallel_min_batch, config.public_suffix_list)
+    
+    def __enter__(self) -> "ParallelScorer":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(START_METHOD),
+                    initializer=_init_worker,
+                    initargs=(self.scorer, self.public_suffix_list),
+                )
+                logger.info(f"Scoring pool started with {self.workers} processes")
+            return self._pool
+    
+    def score_items(self, items: List[NewsItem], now: datetime) -> List[List[float]]:
+        """
+        Score a batch for every channel.
+        
+        In the pool, items some channel scored also get their domain,
+        canonical_url and url_hash filled in, so dedup does no URL work.
+        
+        Args:
+            items: Items to score
+            now: Reference time for recency
+            
+        Returns:
+            Scores per item (one per channel), in item order
+        """
+        if self.workers <= 1 or len(items) < self.min_batch:
+            return [self.scorer.score(item, now) for item in items]
+        
+        rows = [
+            (item.lowered_text(), item.url, item.source, (now - item.published_at).total_seconds() / 3600)
+            for item in items
+        ]
+        size = math.ceil(len(rows) / (self.workers * SHARDS_PER_WORKER))
+        shards = [rows[i:i + size] for i in range(0, len(rows), size)]
+        results = chain.from_iterable(self._get_pool().map(_score_shard, shards))
+        
+        scores = []
+        for item, (item_scores, fields) in zip(items, results):
+            if fields is not None:
+                item.domain, item.registrable_domain, item.canonical_url, item.url_hash = fields
+            scores.append(item_scores)
+        return scores
+    
+    def iter_scores(self, items: Iterable[NewsItem], now: datetime) -> Iterator[Tuple[NewsItem, List[float]]]:
+        """
+        Score a stream, in min_batch-sized batches when a pool is configured.
+        
+        Args:
+            items: Item stream
+            now: Reference time for recency
+            
+        Yields:
+            (item, scores per channel) in stream order
+        """
+        if self.workers <= 1:
+            for item in items:
+                yield item, self.scorer.score(item, now)
+            return
+        
+        batch: List[NewsItem] = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= self.min_batch:
+                yield from zip(batch, self.score_items(batch, now))
+                batch = []
+        yield from zip(batch, self.score_items(batch, now))
+    
+    def close(self) -> None:
+        """Shut the pool down."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
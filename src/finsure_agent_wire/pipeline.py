@@ -1,102 +1,457 @@
 """Main pipeline orchestration for news collection, scoring, and posting."""
 
+import copy
 import logging
 from collections import Counter
-from typing import List
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-from .config import Config
-from .db import Database, prepare_items_for_dedup, deduplicate_items
+from .authority import AuthorityTable
+from .channels import ChannelProfile, category_keywords
+from .config import ChannelConfig, Config
+from .db import Database, WatermarkLedger, prepare_item_for_dedup, prepare_items_for_dedup, deduplicate_items
+from .domains import use_public_suffix_list
+from .learned import LearnedModel, load_learned_model
 from .models import NewsItem
-from .scoring import score_items
-from .sources import fetch_gdelt_articles, fetch_youtube_videos, fetch_rss_feeds
-from .sources.arxiv import fetch_arxiv_papers
+from .parallel import ParallelScorer
+from .queries import compile_arxiv_queries, compile_gdelt_queries, compile_youtube_queries
+from .render import render_all, render_tweet
+from .scoring import compile_keyword_pattern, score_items
+from .sources import iter_gdelt_articles, iter_youtube_videos, iter_rss_feeds
+from .sources.arxiv import iter_arxiv_papers
+from .sources.filters import ItemFilter
+from .sources.feed_schedule import FeedScheduler
+from .sources.health import HostHealth
+from .sources.http import Deadline, DeadlineExceeded, HttpFetcher, ResponseCache
 from .x_client import XClient
 
 logger = logging.getLogger(__name__)
 
+# Scored items buffered per candidate-store write in streaming mode
+CANDIDATE_BATCH = 500
 
-def collect_news(config: Config) -> List[NewsItem]:
+
+@dataclass
+class CollectionReport:
+    """Per-source outcome of one collection run."""
+    
+    counts: Dict[str, int] = field(default_factory=dict)
+    cut_off: List[str] = field(default_factory=list)  # still running at their deadline
+    failed: List[str] = field(default_factory=list)
+    
+    def log_summary(self) -> None:
+        """Log the sources that did not finish."""
+        if self.cut_off:
+            logger.warning(f"Sources cut off at the deadline: {', '.join(self.cut_off)}")
+        if self.failed:
+            logger.warning(f"Sources failed: {', '.join(self.failed)}")
+
+
+def _channel_keywords(config: Config) -> Optional[Tuple[List[str], List[str]]]:
     """
-    Collect news from all configured sources.
+    Category keywords a multi-channel run collects for.
     
     Args:
         config: Application configuration
         
     Returns:
-        List of all collected NewsItems
+        (AI keywords, finance keywords) over all channels, or None without
+        channels (the built-in lists apply)
     """
-    logger.info("=== Starting News Collection ===")
+    channels = config.get_channels()
+    if not channels:
+        return None
+    return category_keywords([ChannelProfile.from_config(channel, config) for channel in channels])
+
+
+def _build_item_filter(config: Config, keywords: Optional[Tuple[List[str], List[str]]] = None) -> ItemFilter:
+    """
+    Build the filter pushed down into source adapters.
     
-    all_items = []
+    Args:
+        config: Application configuration
+        keywords: (AI, finance) keywords the pre-filter requires (None = built-in lists)
+        
+    Returns:
+        ItemFilter (cutoff only when source_prefilter is disabled)
+    """
+    kwargs = {'max_description_length': config.max_description_length}
+    if keywords is not None:
+        kwargs['ai_pattern'] = compile_keyword_pattern(keywords[0])
+        kwargs['finance_pattern'] = compile_keyword_pattern(keywords[1])
+    if config.source_prefilter:
+        return ItemFilter.for_lookback(config.lookback_hours, **kwargs)
+    return ItemFilter.cutoff_only(config.lookback_hours, **kwargs)
+
+
+def build_fetcher(config: Config, db: Optional[Database] = None) -> HttpFetcher:
+    """
+    Build the HTTP fetcher shared by the source adapters.
     
-    # GDELT
-    try:
-        gdelt_items = fetch_gdelt_articles(
-            lookback_hours=config.lookback_hours,
-            max_records=config.gdelt_max_records,
+    Args:
+        config: Application configuration
+        db: Database holding host health across runs (optional)
+        
+    Returns:
+        HttpFetcher with per-host breakers, and a ResponseCache unless
+        response_cache_mode is 'off'
+    """
+    cache = None
+    if config.response_cache_mode != "off":
+        cache = ResponseCache(
+            config.response_cache_dir,
+            ttl=timedelta(hours=config.response_cache_ttl_hours),
+            mode=config.response_cache_mode,
         )
-        all_items.extend(gdelt_items)
-        logger.info(f"GDELT: Fetched {len(gdelt_items)} articles")
-    except Exception as e:
-        logger.error(f"GDELT fetch failed: {e}")
+        logger.info(f"Response cache: {config.response_cache_mode} ({config.response_cache_dir})")
+    
+    health = HostHealth(
+        db,
+        failure_threshold=config.circuit_breaker_failures,
+        cooldown=timedelta(minutes=config.circuit_breaker_cooldown_minutes),
+    )
+    return HttpFetcher(
+        cache,
+        timeout=config.source_timeout_seconds,
+        health=health,
+        hedge=config.hedge_requests,
+    )
+
+
+def source_queries(
+    config: Config,
+    keywords: Optional[Tuple[List[str], List[str]]] = None,
+) -> Tuple[Optional[List[str]], List[str], List[str]]:
+    """
+    Pick the server-side queries: configured by hand, or compiled from the scoring keywords.
+    
+    Args:
+        config: Application configuration
+        keywords: (AI, finance) keywords to compile from (None = built-in lists)
+        
+    Returns:
+        (GDELT queries or None for the default, YouTube queries, arXiv queries)
+    """
+    if config.query_mode == "compiled":
+        kwargs = {}
+        if keywords is not None:
+            kwargs = {'ai_keywords': keywords[0], 'finance_keywords': keywords[1]}
+        gdelt_queries = compile_gdelt_queries(**kwargs)
+        youtube_queries = compile_youtube_queries(**kwargs)
+        arxiv_queries = compile_arxiv_queries(**kwargs)
+        logger.info(f"Compiled queries: GDELT {len(gdelt_queries)}, YouTube {len(youtube_queries)}, "
+                    f"arXiv {len(arxiv_queries)}")
+        return gdelt_queries, youtube_queries, arxiv_queries
+    return None, config.get_youtube_query_list(), config.get_arxiv_query_list()
+
+
+def _source_streams(
+    config: Config,
+    item_filter: ItemFilter,
+    db: Optional[Database] = None,
+    watermarks: Optional[WatermarkLedger] = None,
+    keywords: Optional[Tuple[List[str], List[str]]] = None,
+) -> List[Tuple[str, str, Callable[[HttpFetcher], Iterator[NewsItem]]]]:
+    """
+    Build the list of enabled sources as lazy item streams.
+    
+    Args:
+        config: Application configuration
+        item_filter: Filter applied by each source while parsing
+        db: Database for incremental-fetch state (optional)
+        watermarks: Run's watermark ledger (None = no watermarks read or written)
+        keywords: (AI, finance) keywords compiled queries use (None = built-in lists)
+        
+    Returns:
+        (name, item noun, stream factory taking the source's fetcher) tuples in collection order
+    """
+    streams = []
+    gdelt_queries, youtube_queries, arxiv_queries = source_queries(config, keywords)
+    
+    # GDELT
+    streams.append(("GDELT", "articles", lambda fetcher: iter_gdelt_articles(
+        lookback_hours=config.lookback_hours,
+        max_records=config.gdelt_max_records,
+        base_url=config.gdelt_base_url,
+        item_filter=item_filter,
+        queries=gdelt_queries,
+        harvest=config.gdelt_harvest,
+        workers=config.gdelt_harvest_workers,
+        initial_slices=config.gdelt_harvest_slices,
+        min_slice_minutes=config.gdelt_min_slice_minutes,
+        db=watermarks if config.gdelt_watermarks else None,
+        overlap_minutes=config.gdelt_overlap_minutes,
+        fetcher=fetcher,
+    )))
     
     # YouTube
     if config.youtube_api_key:
-        try:
-            youtube_items = fetch_youtube_videos(
-                api_key=config.youtube_api_key,
-                queries=config.get_youtube_query_list(),
-                lookback_hours=config.lookback_hours,
-            )
-            all_items.extend(youtube_items)
-            logger.info(f"YouTube: Fetched {len(youtube_items)} videos")
-        except Exception as e:
-            logger.error(f"YouTube fetch failed: {e}")
+        streams.append(("YouTube", "videos", lambda fetcher: iter_youtube_videos(
+            api_key=config.youtube_api_key,
+            queries=youtube_queries,
+            lookback_hours=config.lookback_hours,
+            api_endpoint=config.youtube_base_url,
+            item_filter=item_filter,
+            db=db,
+            cache_ttl_hours=config.youtube_cache_ttl_hours,
+            daily_quota=config.youtube_daily_quota,
+            discovery_cache=config.youtube_discovery_cache,
+            fetcher=fetcher,
+        )))
     else:
         logger.info("YouTube: Skipped (no API key)")
     
     # RSS
     rss_feeds = config.get_rss_feed_list()
+    rss_scheduler = None
+    if config.rss_adaptive_polling and db:
+        # Polling at least once per lookback keeps every item from aging out unseen;
+        # polls recorded in the ledger are only saved after a live run
+        rss_scheduler = FeedScheduler(
+            watermarks if watermarks is not None else db,
+            max_staleness=timedelta(hours=min(config.rss_max_staleness_hours, config.lookback_hours)),
+        )
     if rss_feeds:
-        try:
-            rss_items = fetch_rss_feeds(
-                feed_urls=rss_feeds,
-                lookback_hours=config.lookback_hours,
-            )
-            all_items.extend(rss_items)
-            logger.info(f"RSS: Fetched {len(rss_items)} items")
-        except Exception as e:
-            logger.error(f"RSS fetch failed: {e}")
+        streams.append(("RSS", "items", lambda fetcher: iter_rss_feeds(
+            feed_urls=rss_feeds,
+            lookback_hours=config.lookback_hours,
+            item_filter=item_filter,
+            fetcher=fetcher,
+            scheduler=rss_scheduler,
+        )))
     else:
         logger.info("RSS: Skipped (no feeds configured)")
     
     # arXiv Research Papers
-    arxiv_queries = config.get_arxiv_query_list()
     if arxiv_queries:
-        try:
-            arxiv_items = fetch_arxiv_papers(
-                queries=arxiv_queries,
-                lookback_hours=config.lookback_hours,
-                max_results=config.arxiv_max_results,
-            )
-            all_items.extend(arxiv_items)
-            logger.info(f"arXiv: Fetched {len(arxiv_items)} papers")
-        except Exception as e:
-            logger.error(f"arXiv fetch failed: {e}")
+        streams.append(("arXiv", "papers", lambda fetcher: iter_arxiv_papers(
+            queries=arxiv_queries,
+            lookback_hours=config.lookback_hours,
+            max_results=config.arxiv_max_results,
+            base_url=config.arxiv_base_url,
+            item_filter=item_filter,
+            db=watermarks if config.arxiv_watermarks else None,
+            max_pages=config.arxiv_max_pages,
+            page_delay=config.arxiv_page_delay_seconds,
+            batch_queries=config.arxiv_batch_queries,
+            fetcher=fetcher,
+        )))
     else:
         logger.info("arXiv: Skipped (no queries configured)")
     
+    return streams
+
+
+def _iter_until(items: Iterator[NewsItem], deadline: Deadline) -> Iterator[NewsItem]:
+    """
+    Pass a source's items through until its deadline passes.
+    
+    Requests are already bounded by the fetcher's deadline; this also stops
+    a source that keeps yielding without making requests. A source closed
+    early never advances its watermarks.
+    
+    Args:
+        items: Source item stream
+        deadline: Source deadline
+        
+    Yields:
+        Items from the source
+    """
+    try:
+        for item in items:
+            yield item
+            if deadline.expired:
+                raise DeadlineExceeded("Source deadline reached")
+    finally:
+        items.close()
+
+
+def _iter_sources(
+    config: Config,
+    db: Optional[Database],
+    report: CollectionReport,
+    watermarks: Optional[WatermarkLedger] = None,
+) -> Iterator[Tuple[str, str, Iterator[NewsItem]]]:
+    """
+    Start each enabled source under its share of the run deadline.
+    
+    Each source gets an equal share of the time left when it starts, so
+    time a fast source leaves unused goes to the ones after it.
+    
+    Replaying the response cache collects without the database: no
+    watermarks, feed schedule, search cache, quota ledger or host health
+    are read or written, so every replay of a recording sees the same items.
+    
+    With channels configured, the pre-filter and compiled queries use the
+    union of the channels' keywords, so no channel loses items to them.
+    
+    Args:
+        config: Application configuration
+        db: Database for incremental-fetch state (optional)
+        report: Collection report the caller fills in
+        watermarks: Run's watermark ledger (optional)
+        
+    Yields:
+        (name, item noun, item stream) per source, in collection order
+    """
+    if config.response_cache_mode == "replay":
+        db = None
+        watermarks = None
+    keywords = _channel_keywords(config)
+    item_filter = _build_item_filter(config, keywords)
+    fetcher = build_fetcher(config, db)
+    deadline = Deadline(config.run_deadline_seconds or None)
+    streams = _source_streams(config, item_filter, db, watermarks, keywords)
+    
+    try:
+        for index, (name, noun, stream) in enumerate(streams):
+            source_deadline = deadline.share(len(streams) - index)
+            yield name, noun, _iter_until(stream(fetcher.with_deadline(source_deadline)), source_deadline)
+    finally:
+        fetcher.close()
+    
+    item_filter.log_summary()
+    if fetcher.cache:
+        fetcher.cache.log_summary()
+    fetcher.health.log_summary()
+    fetcher.health.save()
+    report.log_summary()
+
+
+def collect_news(
+    config: Config,
+    db: Optional[Database] = None,
+    report: Optional[CollectionReport] = None,
+    watermarks: Optional[WatermarkLedger] = None,
+) -> List[NewsItem]:
+    """
+    Collect news from all configured sources.
+    
+    Sources cut off at the deadline keep the items they yielded before it.
+    
+    Args:
+        config: Application configuration
+        db: Database for incremental-fetch state (optional)
+        report: Collection report to fill in (optional)
+        watermarks: Run's watermark ledger; sources record new watermarks in
+            it instead of the database (None = no watermarks)
+            
+    Returns:
+        List of all collected NewsItems
+    """
+    logger.info("=== Starting News Collection ===")
+    
+    all_items = []
+    report = report if report is not None else CollectionReport()
+    
+    for name, noun, stream in _iter_sources(config, db, report, watermarks):
+        source_items = []
+        try:
+            for item in stream:
+                source_items.append(item)
+        except DeadlineExceeded:
+            report.cut_off.append(name)
+            logger.warning(f"{name}: cut off at its deadline")
+        except Exception as e:
+            report.failed.append(name)
+            logger.error(f"{name} fetch failed: {e}")
+        all_items.extend(source_items)
+        report.counts[name] = len(source_items)
+        logger.info(f"{name}: Fetched {len(source_items)} {noun}")
+    
     logger.info(f"Total items collected: {len(all_items)}")
     return all_items
 
 
-def filter_and_score(items: List[NewsItem], config: Config) -> List[NewsItem]:
+def stream_news(
+    config: Config,
+    db: Optional[Database] = None,
+    report: Optional[CollectionReport] = None,
+    watermarks: Optional[WatermarkLedger] = None,
+) -> Iterator[NewsItem]:
+    """
+    Yield news from all configured sources as each source parses it.
+    
+    Nothing is materialized between sources, so memory does not grow with
+    the number of records, feeds or the lookback window.
+    
+    Args:
+        config: Application configuration
+        db: Database for incremental-fetch state (optional)
+        report: Collection report to fill in (optional)
+        watermarks: Run's watermark ledger (see collect_news)
+        
+    Yields:
+        Collected NewsItems
+    """
+    logger.info("=== Starting News Collection (streaming) ===")
+    
+    report = report if report is not None else CollectionReport()
+    
+    for name, noun, stream in _iter_sources(config, db, report, watermarks):
+        count = 0
+        try:
+            for item in stream:
+                count += 1
+                yield item
+        except DeadlineExceeded:
+            report.cut_off.append(name)
+            logger.warning(f"{name}: cut off at its deadline")
+        except Exception as e:
+            report.failed.append(name)
+            logger.error(f"{name} fetch failed: {e}")
+        report.counts[name] = count
+        logger.info(f"{name}: Streamed {count} {noun}")
+
+
+def write_candidates(db: Database, items: List[NewsItem], learned: Optional[LearnedModel] = None) -> int:
+    """
+    Store a batch in the candidate store, shadow-scoring it with the learned model.
+    
+    Args:
+        db: Database with the candidate store
+        items: Scored items
+        learned: Learned model from load_learned_model (None = keyword scores only)
+        
+    Returns:
+        Number of candidates written
+    """
+    stored = db.store_candidates(items)
+    if learned is not None and items:
+        db.store_learned_scores(
+            learned.version,
+            zip((item.url_hash for item in items), learned.predict_items(items)),
+        )
+    return stored
+
+
+def _prune_candidates(config: Config, db: Database, stored: int) -> None:
+    """
+    Expire old candidates and log the store's activity for this run.
+    
+    Args:
+        config: Application configuration
+        db: Database with the candidate store
+        stored: Items written this run
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=config.candidate_retention_days)
+    pruned = db.prune_candidates(cutoff)
+    logger.info(f"Candidate store: {stored} items written, {pruned} expired")
+
+
+def filter_and_score(
+    items: List[NewsItem],
+    config: Config,
+    authority: Optional[AuthorityTable] = None,
+) -> List[NewsItem]:
     """
     Score items and filter by relevance threshold.
     
     Args:
         items: List of NewsItems
         config: Application configuration
+        authority: Source credibility table (default: built-in weights)
         
     Returns:
         Filtered and scored list
@@ -104,12 +459,20 @@ def filter_and_score(items: List[NewsItem], config: Config) -> List[NewsItem]:
     logger.info("=== Scoring and Filtering ===")
     
     # Score all items
-    scored_items = score_items(
-        items,
-        agent_weight=config.agent_keyword_weight,
-        finance_weight=config.finance_keyword_weight,
-        recency_weight=config.recency_weight,
-    )
+    if config.parallel_workers > 1:
+        now = datetime.now(timezone.utc)
+        with ParallelScorer.from_config(config, authority=authority) as scorer:
+            for item, scores in zip(items, scorer.score_items(items, now)):
+                item.relevance_score = scores[0]
+        scored_items = items
+    else:
+        scored_items = score_items(
+            items,
+            agent_weight=config.agent_keyword_weight,
+            finance_weight=config.finance_keyword_weight,
+            recency_weight=config.recency_weight,
+            authority=authority,
+        )
     
     # Filter by minimum score
     before_count = len(scored_items)
@@ -169,41 +532,294 @@ def select_items_to_post(
         if len(selected) >= config.max_posts_per_run:
             break
         
-        # Check per-domain limit
-        if domain_counts[item.domain] >= config.max_posts_per_domain:
-            logger.debug(f"Skipping {item.url} (domain limit reached for {item.domain})")
+        # Check per-domain limit (subdomains count against their site)
+        domain = item.registrable_domain
+        if domain_counts[domain] >= config.max_posts_per_domain:
+            logger.debug(f"Skipping {item.url} (domain limit reached for {domain})")
             continue
         
         selected.append(item)
-        domain_counts[item.domain] += 1
+        domain_counts[domain] += 1
     
     logger.info(f"Selected {len(selected)} items to post (max={config.max_posts_per_run})")
     return selected
 
 
+class TopKSelector:
+    """
+    Bounded streaming equivalent of rank_items + select_items_to_post.
+    
+    Keeps at most max_posts candidates, at most max_per_domain per
+    registrable domain, and at most one per url_hash. An item evicted here can never re-enter the
+    final selection, because everything that displaced it only gets replaced
+    by stronger items, so memory stays O(max_posts) for any input size.
+    Only the oldest publication time of the items dropped per source is
+    kept, for WatermarkLedger.hold_at.
+    """
+    
+    def __init__(self, max_posts: int, max_per_domain: int):
+        """
+        Initialize the selector.
+        
+        Args:
+            max_posts: Maximum items to select
+            max_per_domain: Maximum items per domain
+        """
+        self.max_posts = max_posts
+        self.max_per_domain = max_per_domain
+        self._kept: Dict[str, NewsItem] = {}
+        self._domain_counts = Counter()
+        self.oldest_dropped: Dict[str, datetime] = {}
+    
+    @staticmethod
+    def _rank_key(item: NewsItem) -> Tuple[float, float]:
+        return (item.relevance_score, item.published_at.timestamp())
+    
+    def _remove(self, item: NewsItem) -> None:
+        del self._kept[item.url_hash]
+        self._domain_counts[item.registrable_domain] -= 1
+    
+    def _add(self, item: NewsItem) -> None:
+        self._kept[item.url_hash] = item
+        self._domain_counts[item.registrable_domain] += 1
+    
+    def _drop(self, item: NewsItem) -> None:
+        oldest = self.oldest_dropped.get(item.source)
+        if oldest is None or item.published_at < oldest:
+            self.oldest_dropped[item.source] = item.published_at
+    
+    def offer(self, item: NewsItem) -> None:
+        """
+        Consider an item (must have url_hash populated).
+        
+        Args:
+            item: Scored candidate
+        """
+        key = self._rank_key(item)
+        
+        # Same canonical URL already held: keep the stronger one
+        existing = self._kept.get(item.url_hash)
+        if existing is not None:
+            if key <= self._rank_key(existing):
+                self._drop(item)
+                return
+            self._remove(existing)
+            self._drop(existing)
+        
+        # Domain full: only displace that domain's weakest item
+        domain = item.registrable_domain
+        if self._domain_counts[domain] >= self.max_per_domain:
+            weakest = min(
+                (kept for kept in self._kept.values() if kept.registrable_domain == domain),
+                key=self._rank_key,
+            )
+            if key <= self._rank_key(weakest):
+                self._drop(item)
+                return
+            self._remove(weakest)
+            self._drop(weakest)
+            self._add(item)
+            return
+        
+        self._add(item)
+        if len(self._kept) > self.max_posts:
+            evicted = min(self._kept.values(), key=self._rank_key)
+            self._remove(evicted)
+            self._drop(evicted)
+    
+    def selected(self) -> List[NewsItem]:
+        """
+        Return the selection, ranked by score then recency.
+        
+        Returns:
+            Items to post
+        """
+        return rank_items(list(self._kept.values()))
+
+
+def stream_select_items(
+    config: Config,
+    db: Database,
+    report: Optional[CollectionReport] = None,
+    watermarks: Optional[WatermarkLedger] = None,
+) -> Tuple[List[NewsItem], Dict[str, int]]:
+    """
+    Score, filter, canonicalize and dedup items one at a time as sources
+    yield them, feeding a bounded top-K selector.
+    
+    Args:
+        config: Application configuration
+        db: Database for posted-history dedup
+        report: Collection report to fill in (optional)
+        watermarks: Run's watermark ledger; relevant items the selector
+            drops are held in it (optional)
+            
+    Returns:
+        (items to post, stage counters)
+    """
+    posted_hashes = db.get_posted_url_hashes()
+    authority = AuthorityTable.load(db)
+    now = datetime.now(timezone.utc)
+    selector = TopKSelector(config.max_posts_per_run, config.max_posts_per_domain)
+    counts = Counter()
+    pending: List[NewsItem] = []
+    scorer = ParallelScorer.from_config(config, authority=authority)
+    learned = load_learned_model(config, db)
+    
+    with scorer:
+        for item, scores in scorer.iter_scores(stream_news(config, db, report, watermarks), now):
+            counts['collected'] += 1
+            
+            item.relevance_score = scores[0]
+            if config.candidate_store:
+                pending.append(item)
+                if len(pending) >= CANDIDATE_BATCH:
+                    counts['stored'] += write_candidates(db, pending, learned)
+                    pending = []
+            if item.relevance_score < config.min_score_threshold:
+                continue
+            counts['relevant'] += 1
+            
+            prepare_item_for_dedup(item)
+            if item.url_hash in posted_hashes:
+                counts['already_posted'] += 1
+                continue
+            
+            selector.offer(item)
+    
+    if config.candidate_store:
+        counts['stored'] += write_candidates(db, pending, learned)
+        _prune_candidates(config, db, counts['stored'])
+    if watermarks is not None:
+        for source, oldest in selector.oldest_dropped.items():
+            watermarks.hold_at(source, oldest)
+    
+    selected = selector.selected()
+    logger.info(
+        f"Streamed {counts['collected']} items: {counts['relevant']} relevant "
+        f"(threshold >= {config.min_score_threshold}), {counts['already_posted']} already posted"
+    )
+    logger.info(f"Selected {len(selected)} items to post (max={config.max_posts_per_run})")
+    return selected, dict(counts)
+
+
+def select_channel_items(
+    config: Config,
+    channels: List[ChannelConfig],
+    db: Database,
+    report: Optional[CollectionReport] = None,
+    watermarks: Optional[WatermarkLedger] = None,
+) -> Tuple[Dict[str, List[NewsItem]], Dict[str, int]]:
+    """
+    Collect once and select items for every channel in one pass.
+    
+    Each item is scored for all channels from one keyword scan; a channel
+    whose threshold it passes, and which has not posted it yet, is offered
+    a copy carrying that channel's score. Selection per channel is the
+    bounded TopKSelector, so memory stays flat in streaming mode.
+    
+    Args:
+        config: Application configuration
+        channels: Channel definitions
+        db: Database for per-channel posted history
+        report: Collection report to fill in (optional)
+        watermarks: Run's watermark ledger; relevant items a channel's
+            selector drops are held in it (optional)
+            
+    Returns:
+        (items to post per channel name, stage counters)
+    """
+    channel_configs = [config.for_channel(channel) for channel in channels]
+    scorer = ParallelScorer.from_config(
+        config,
+        [ChannelProfile.from_config(channel, config) for channel in channels],
+        AuthorityTable.load(db),
+    )
+    learned = load_learned_model(config, db)
+    posted = [db.get_posted_url_hashes(channel.name) for channel in channels]
+    selectors = [
+        TopKSelector(channel_config.max_posts_per_run, channel_config.max_posts_per_domain)
+        for channel_config in channel_configs
+    ]
+    thresholds = [channel_config.min_score_threshold for channel_config in channel_configs]
+    now = datetime.now(timezone.utc)
+    counts = Counter()
+    pending: List[NewsItem] = []
+    
+    if config.streaming_mode:
+        items = stream_news(config, db, report, watermarks)
+    else:
+        items = collect_news(config, db, report, watermarks)
+    with scorer:
+        for item, scores in scorer.iter_scores(items, now):
+            counts['collected'] += 1
+            
+            # The candidate store keeps each item once, under its best channel score
+            item.relevance_score = max(scores)
+            if config.candidate_store:
+                pending.append(item)
+                if len(pending) >= CANDIDATE_BATCH:
+                    counts['stored'] += write_candidates(db, pending, learned)
+                    pending = []
+            if item.relevance_score == 0.0:
+                continue
+            
+            prepare_item_for_dedup(item)
+            for channel, score, threshold, posted_hashes, selector in zip(
+                channels, scores, thresholds, posted, selectors
+            ):
+                if score < threshold:
+                    continue
+                counts[f'{channel.name}.relevant'] += 1
+                if item.url_hash in posted_hashes:
+                    counts[f'{channel.name}.already_posted'] += 1
+                    continue
+                candidate = copy.copy(item)
+                candidate.relevance_score = score
+                selector.offer(candidate)
+    
+    if config.candidate_store:
+        counts['stored'] += write_candidates(db, pending, learned)
+        _prune_candidates(config, db, counts['stored'])
+    
+    selected = {}
+    for channel, selector in zip(channels, selectors):
+        if watermarks is not None:
+            for source, oldest in selector.oldest_dropped.items():
+                watermarks.hold_at(source, oldest)
+        selected[channel.name] = selector.selected()
+        logger.info(
+            f"Channel {channel.name}: {counts[f'{channel.name}.relevant']} relevant, "
+            f"{counts[f'{channel.name}.already_posted']} already posted, "
+            f"{len(selected[channel.name])} selected"
+        )
+    return selected, dict(counts)
+
+
 def post_items(
     items: List[NewsItem],
     config: Config,
     db: Database,
+    channel: Optional[str] = None,
 ) -> int:
     """
     Post items to X (Twitter).
     
     Args:
         items: Items to post
-        config: Application configuration
+        config: Application configuration (a channel's, for channel posts)
         db: Database for tracking posted items
+        channel: Channel the items are posted to (None = the main account)
         
     Returns:
         Number of items successfully posted
     """
     if config.review_mode:
         logger.info("=== REVIEW MODE: Tweet Drafts ===")
-        for i, item in enumerate(items, 1):
-            tweet = item.format_tweet()
+        for i, (item, tweet) in enumerate(zip(items, render_all(items)), 1):
             logger.info(f"\n--- Draft {i}/{len(items)} ---")
             logger.info(f"Title: {item.title}")
-            logger.info(f"URL: {item.canonical_url or item.url}")
+            logger.info(f"URL: {item.canonical_url}")
             logger.info(f"Score: {item.relevance_score:.1f}")
             logger.info(f"Tweet:\n{tweet}")
             logger.info(f"Length: {len(tweet)}/280")
@@ -212,8 +828,7 @@ def post_items(
     
     if config.dry_run:
         logger.info(f"DRY_RUN mode: Would post {len(items)} tweets (not actually posting)")
-        for i, item in enumerate(items, 1):
-            tweet = item.format_tweet()
+        for i, (item, tweet) in enumerate(zip(items, render_all(items)), 1):
             logger.info(f"[DRY RUN {i}] {tweet[:100]}... (score={item.relevance_score:.1f})")
         return 0
     
@@ -226,6 +841,7 @@ def post_items(
             api_secret=config.x_api_secret,
             access_token=config.x_access_token,
             access_secret=config.x_access_secret,
+            base_url=config.x_api_base_url,
         )
         
         # Verify credentials first
@@ -239,13 +855,13 @@ def post_items(
     
     for item in items:
         try:
-            tweet = item.format_tweet()
+            tweet = render_tweet(item)
             logger.info(f"Posting: {tweet[:80]}...")
             
             x_client.create_tweet(tweet)
             
             # Mark as posted in database
-            db.mark_as_posted(item)
+            db.mark_as_posted(item, channel=channel)
             
             posted_count += 1
             logger.info(f"Posted {posted_count}/{len(items)}")
@@ -259,10 +875,184 @@ def post_items(
     return posted_count
 
 
+def _hold_unposted(
+    watermarks: Optional[WatermarkLedger],
+    items: List[NewsItem],
+    db: Database,
+    channel: Optional[str] = None,
+) -> None:
+    """
+    Hold the watermarks below relevant items that were not posted.
+    
+    Args:
+        watermarks: Run's watermark ledger (None = nothing to do)
+        items: Relevant, previously unposted items of this run
+        db: Database with the posted history
+        channel: Channel the items were meant for (None = the main account)
+    """
+    if watermarks is None or not items:
+        return
+    posted = db.get_posted_url_hashes(channel)
+    watermarks.hold(item for item in items if item.url_hash not in posted)
+
+
+def _save_watermarks(config: Config, watermarks: WatermarkLedger) -> None:
+    """
+    Write the run's watermarks and feed polls, unless nothing was actually posted for real.
+    
+    Args:
+        config: Application configuration
+        watermarks: Run's watermark ledger
+    """
+    if config.dry_run or config.review_mode:
+        logger.info("Source watermarks and feed polls not saved (DRY_RUN or REVIEW_MODE)")
+        return
+    written = watermarks.commit()
+    if written:
+        logger.info(f"Saved {written} source watermarks and feed polls")
+
+
+def run_channel_pipeline(
+    config: Config,
+    channels: List[ChannelConfig],
+    db: Database,
+    watermarks: Optional[WatermarkLedger] = None,
+) -> None:
+    """
+    Run a multi-channel pass: collect once, then select and post per channel.
+    
+    Args:
+        config: Application configuration
+        channels: Channel definitions
+        db: Database
+        watermarks: Run's watermark ledger (optional)
+    """
+    report = CollectionReport()
+    selected, counts = select_channel_items(config, channels, db, report, watermarks)
+    
+    posted = {}
+    for channel in channels:
+        items = selected[channel.name]
+        logger.info(f"=== Channel: {channel.name} ===")
+        posted[channel.name] = post_items(items, config.for_channel(channel), db, channel=channel.name) if items else 0
+        _hold_unposted(watermarks, items, db, channel.name)
+    
+    logger.info("=== Pipeline Complete (channels) ===")
+    logger.info(f"Collected: {counts.get('collected', 0)}")
+    for channel in channels:
+        logger.info(
+            f"{channel.name}: relevant {counts.get(f'{channel.name}.relevant', 0)}, "
+            f"posted {posted[channel.name]}"
+        )
+    if report.cut_off:
+        logger.info(f"Cut off: {', '.join(report.cut_off)}")
+    logger.info(f"Database stats: {db.get_stats()}")
+
+
+def run_streaming_pipeline(
+    config: Config,
+    db: Database,
+    watermarks: Optional[WatermarkLedger] = None,
+) -> None:
+    """
+    Run a streaming pass: select while collecting, then post.
+    
+    Args:
+        config: Application configuration
+        db: Database
+        watermarks: Run's watermark ledger (optional)
+    """
+    report = CollectionReport()
+    items_to_post, counts = stream_select_items(config, db, report, watermarks)
+    posted_count = post_items(items_to_post, config, db) if items_to_post else 0
+    _hold_unposted(watermarks, items_to_post, db)
+    
+    logger.info("=== Pipeline Complete (streaming) ===")
+    logger.info(f"Collected: {counts.get('collected', 0)}")
+    logger.info(f"Relevant: {counts.get('relevant', 0)}")
+    logger.info(f"Posted: {posted_count}")
+    if report.cut_off:
+        logger.info(f"Cut off: {', '.join(report.cut_off)}")
+    logger.info(f"Database stats: {db.get_stats()}")
+
+
+def run_batch_pipeline(
+    config: Config,
+    db: Database,
+    watermarks: Optional[WatermarkLedger] = None,
+) -> None:
+    """
+    Run a batch pass: collect, score, dedupe, rank, post.
+    
+    Args:
+        config: Application configuration
+        db: Database
+        watermarks: Run's watermark ledger (optional)
+    """
+    report = CollectionReport()
+    
+    # 1. Collect
+    items = collect_news(config, db, report, watermarks)
+    
+    if not items:
+        logger.warning("No items collected from any source. Exiting.")
+        return
+    
+    # 2. Score and filter
+    relevant_items = filter_and_score(items, config, AuthorityTable.load(db))
+    if config.candidate_store:
+        _prune_candidates(config, db, write_candidates(db, items, load_learned_model(config, db)))
+    
+    if not relevant_items:
+        logger.warning("No items passed relevance filter. Exiting.")
+        return
+    
+    # 3. Prepare for deduplication
+    prepare_items_for_dedup(relevant_items)
+    
+    # 4. Deduplicate
+    unique_items = deduplicate_items(relevant_items, db)
+    
+    if not unique_items:
+        logger.info("All items were duplicates (already posted). Exiting.")
+        return
+    
+    # 5. Rank
+    ranked_items = rank_items(unique_items)
+    
+    # 6. Select top items
+    items_to_post = select_items_to_post(ranked_items, config)
+    
+    if not items_to_post:
+        logger.info("No items selected for posting (domain limits or empty). Exiting.")
+        _hold_unposted(watermarks, ranked_items, db)
+        return
+    
+    # 7. Post (items cut by the limits or not posted keep their source's watermark back)
+    posted_count = post_items(items_to_post, config, db)
+    _hold_unposted(watermarks, ranked_items, db)
+    
+    # 8. Summary
+    logger.info("=== Pipeline Complete ===")
+    logger.info(f"Collected: {len(items)}")
+    logger.info(f"Relevant: {len(relevant_items)}")
+    logger.info(f"Unique: {len(unique_items)}")
+    logger.info(f"Posted: {posted_count}")
+    if report.cut_off:
+        logger.info(f"Cut off: {', '.join(report.cut_off)}")
+    
+    # Database stats
+    stats = db.get_stats()
+    logger.info(f"Database stats: {stats}")
+
+
 def run_pipeline(config: Config) -> None:
     """
     Run the complete pipeline: collect, score, dedupe, rank, post.
     
+    Source watermarks are only saved once the run finished and posted
+    for real (see db.WatermarkLedger).
+    
     Args:
         config: Application configuration
     """
@@ -273,57 +1063,24 @@ def run_pipeline(config: Config) -> None:
     logger.info(f"Max posts: {config.max_posts_per_run}")
     logger.info(f"Min score: {config.min_score_threshold}")
     
+    if config.public_suffix_list:
+        use_public_suffix_list(config.public_suffix_list)
+    
     # Initialize database
     db = Database(config.db_path)
+    watermarks = WatermarkLedger(db)
     
     try:
-        # 1. Collect
-        items = collect_news(config)
-        
-        if not items:
-            logger.warning("No items collected from any source. Exiting.")
-            return
-        
-        # 2. Score and filter
-        relevant_items = filter_and_score(items, config)
-        
-        if not relevant_items:
-            logger.warning("No items passed relevance filter. Exiting.")
-            return
-        
-        # 3. Prepare for deduplication
-        prepare_items_for_dedup(relevant_items)
-        
-        # 4. Deduplicate
-        unique_items = deduplicate_items(relevant_items, db)
-        
-        if not unique_items:
-            logger.info("All items were duplicates (already posted). Exiting.")
-            return
-        
-        # 5. Rank
-        ranked_items = rank_items(unique_items)
-        
-        # 6. Select top items
-        items_to_post = select_items_to_post(ranked_items, config)
-        
-        if not items_to_post:
-            logger.info("No items selected for posting (domain limits or empty). Exiting.")
-            return
-        
-        # 7. Post
-        posted_count = post_items(items_to_post, config, db)
-        
-        # 8. Summary
-        logger.info("=== Pipeline Complete ===")
-        logger.info(f"Collected: {len(items)}")
-        logger.info(f"Relevant: {len(relevant_items)}")
-        logger.info(f"Unique: {len(unique_items)}")
-        logger.info(f"Posted: {posted_count}")
+        channels = config.get_channels()
+        if channels:
+            logger.info(f"Channels: {', '.join(channel.name for channel in channels)}")
+            run_channel_pipeline(config, channels, db, watermarks)
+        elif config.streaming_mode:
+            run_streaming_pipeline(config, db, watermarks)
+        else:
+            run_batch_pipeline(config, db, watermarks)
         
-        # Database stats
-        stats = db.get_stats()
-        logger.info(f"Database stats: {stats}")
+        _save_watermarks(config, watermarks)
     
     finally:
         db.close()
@@ -0,0 +1,237 @@
+"""Compile the scoring keyword lists into server-side source queries.
+
+The hand-written source queries are much broader than the scorer, so most
+of what they return scores 0.0. The compilers here turn AI_KEYWORDS,
+FINANCE_KEYWORDS and EXCLUDE_KEYWORDS (or, in multi-channel runs, the
+union of the channels' category keywords) into the most selective query
+each API supports, split into several queries where an API's length limit
+requires it.
+"""
+
+import logging
+import re
+from typing import Iterable, List
+
+from .scoring import AI_KEYWORDS, EXCLUDE_KEYWORDS, FINANCE_KEYWORDS
+from .sources.arxiv import ARXIV_MAX_QUERY_LENGTH
+
+logger = logging.getLogger(__name__)
+
+# GDELT rejects keywords shorter than 3 characters; it publishes no query
+# length limit but errors out on very long queries
+GDELT_MIN_TERM_LENGTH = 3
+GDELT_MAX_QUERY_LENGTH = 1000
+
+ARXIV_AI_CATEGORIES = ['cs.AI', 'cs.MA']
+ARXIV_FINANCE_CATEGORIES = [
+    'q-fin.CP', 'q-fin.EC', 'q-fin.GN', 'q-fin.MF', 'q-fin.PM',
+    'q-fin.PR', 'q-fin.RM', 'q-fin.ST', 'q-fin.TR',
+]
+
+# YouTube documents no limit for q; every query costs 100 quota units, so
+# this keeps the compiled set at about as many queries as the default config
+YOUTUBE_MAX_QUERY_LENGTH = 1000
+
+# Terms made only of letters, digits, spaces and hyphens survive every API's tokenizer
+_SAFE_TERM = re.compile(r'^[a-z0-9][a-z0-9 \-]*$')
+
+
+def _words(term: str) -> List[str]:
+    return re.findall(r'[a-z0-9]+', term)
+
+
+def reduce_terms(terms: Iterable[str], min_length: int = 1) -> List[str]:
+    """
+    Drop terms that cannot change which documents an OR group matches.
+    
+    A multi-word term is redundant when one of its words is itself a term
+    (e.g. 'llm agent' next to 'agent'); terms are matched on word
+    boundaries, so the single word already matches everything the phrase
+    does. Terms shorter than min_length or containing punctuation an API
+    would mangle are dropped too.
+    
+    Args:
+        terms: Lowercase keywords
+        min_length: Minimum term length
+        
+    Returns:
+        Remaining terms in original order, without duplicates
+    """
+    unique = list(dict.fromkeys(t.strip().lower() for t in terms))
+    kept = [t for t in unique if len(t) >= min_length and _SAFE_TERM.match(t)]
+    single_words = {t for t in kept if len(_words(t)) == 1 and _words(t)[0] == t}
+    return [t for t in kept if t in single_words or not single_words.intersection(_words(t))]
+
+
+def _quote(term: str) -> str:
+    """Quote terms that are not a single plain word."""
+    return term if re.fullmatch(r'[a-z0-9]+', term) else f'"{term}"'
+
+
+def _pack(parts: List[str], joiner: str, budget: int) -> List[List[str]]:
+    """
+    Greedily pack parts into groups whose joined length fits the budget.
+    
+    Args:
+        parts: Rendered terms
+        joiner: Separator placed between parts
+        budget: Maximum joined length per group
+        
+    Returns:
+        Groups of parts (a part longer than the budget gets its own group)
+    """
+    groups: List[List[str]] = []
+    current: List[str] = []
+    length = 0
+    for part in parts:
+        added = len(part) + (len(joiner) if current else 0)
+        if current and length + added > budget:
+            groups.append(current)
+            current, length = [], 0
+            added = len(part)
+        current.append(part)
+        length += added
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _fit_negations(negations: List[str], budget: int) -> List[str]:
+    """Keep as many negations as fit in the space left over."""
+    kept = []
+    length = 0
+    for negation in negations:
+        if length + len(negation) + 1 > budget:
+            break
+        kept.append(negation)
+        length += len(negation) + 1
+    return kept
+
+
+def compile_gdelt_queries(
+    max_length: int = GDELT_MAX_QUERY_LENGTH,
+    negate: bool = True,
+    ai_keywords: Iterable[str] = AI_KEYWORDS,
+    finance_keywords: Iterable[str] = FINANCE_KEYWORDS,
+) -> List[str]:
+    """
+    Compile GDELT DOC API queries: (AI terms) (finance terms) -exclusions.
+    
+    Phrases are quoted, OR groups parenthesized, terms shorter than three
+    characters dropped (GDELT rejects them) and exclusions appended as
+    negations while they fit. GDELT applies negations to the full article
+    text, so negate=False keeps articles that only mention an excluded word
+    in the body.
+    
+    Args:
+        max_length: Maximum length of one query
+        negate: Append EXCLUDE_KEYWORDS as negations
+        ai_keywords: AI terms
+        finance_keywords: Finance terms
+        
+    Returns:
+        Query strings; together they cover the full keyword cross product
+    """
+    ai_terms = [_quote(t) for t in reduce_terms(ai_keywords, GDELT_MIN_TERM_LENGTH)]
+    finance_terms = [_quote(t) for t in reduce_terms(finance_keywords, GDELT_MIN_TERM_LENGTH)]
+    negations = [f'-{_quote(t)}' for t in reduce_terms(EXCLUDE_KEYWORDS, GDELT_MIN_TERM_LENGTH)] if negate else []
+    
+    def group(chunk: List[str]) -> str:
+        return chunk[0] if len(chunk) == 1 else f"({' OR '.join(chunk)})"
+    
+    # Each OR group gets half of what is left after reserving a quarter for
+    # negations; the cross product of the chunks matches exactly what one
+    # unlimited query would
+    budget = max((max_length - (max_length // 4 if negations else 0) - 1) // 2 - 2, 1)
+    queries = []
+    for ai_chunk in _pack(ai_terms, ' OR ', budget):
+        for finance_chunk in _pack(finance_terms, ' OR ', budget):
+            query = f"{group(ai_chunk)} {group(finance_chunk)}"
+            kept = _fit_negations(negations, max_length - len(query) - 1)
+            if kept:
+                query = f"{query} {' '.join(kept)}"
+            queries.append(query)
+    
+    logger.debug(f"Compiled {len(queries)} GDELT queries")
+    return queries
+
+
+def compile_arxiv_queries(
+    max_length: int = ARXIV_MAX_QUERY_LENGTH,
+    ai_keywords: Iterable[str] = AI_KEYWORDS,
+    finance_keywords: Iterable[str] = FINANCE_KEYWORDS,
+) -> List[str]:
+    """
+    Compile arXiv search_query expressions from categories and abstract terms.
+    
+    Two families: AI-category papers (cs.AI, cs.MA) whose abstract mentions
+    a finance term, and quantitative-finance papers (q-fin.*) whose abstract
+    mentions an AI term. The results already carry field prefixes, so
+    sources.arxiv uses them as-is.
+    
+    Args:
+        max_length: Maximum length of one expression
+        ai_keywords: AI terms
+        finance_keywords: Finance terms
+        
+    Returns:
+        search_query expressions
+    """
+    ai_terms = [f'abs:{_quote(t)}' for t in reduce_terms(ai_keywords)]
+    finance_terms = [f'abs:{_quote(t)}' for t in reduce_terms(finance_keywords)]
+    
+    def category_group(categories: List[str]) -> str:
+        return '(' + ' OR '.join(f'cat:{c}' for c in categories) + ')'
+    
+    queries = []
+    for categories, terms in (
+        (ARXIV_AI_CATEGORIES, finance_terms),
+        (ARXIV_FINANCE_CATEGORIES, ai_terms),
+    ):
+        prefix = f"{category_group(categories)} AND "
+        for chunk in _pack(terms, ' OR ', max_length - len(prefix) - 2):
+            queries.append(f"{prefix}({' OR '.join(chunk)})")
+    
+    logger.debug(f"Compiled {len(queries)} arXiv queries")
+    return queries
+
+
+def compile_youtube_queries(
+    max_length: int = YOUTUBE_MAX_QUERY_LENGTH,
+    negate: bool = True,
+    ai_keywords: Iterable[str] = AI_KEYWORDS,
+    finance_keywords: Iterable[str] = FINANCE_KEYWORDS,
+) -> List[str]:
+    """
+    Compile YouTube search q values: ai|terms finance|terms -exclusions.
+    
+    YouTube supports OR ('|') and NOT ('-') but no grouping, so each query
+    is one AI alternation and one finance alternation separated by a space
+    (AND).
+    
+    Args:
+        max_length: Maximum length of one query
+        negate: Append EXCLUDE_KEYWORDS as negations
+        ai_keywords: AI terms
+        finance_keywords: Finance terms
+        
+    Returns:
+        q values
+    """
+    ai_terms = [_quote(t) for t in reduce_terms(ai_keywords)]
+    finance_terms = [_quote(t) for t in reduce_terms(finance_keywords)]
+    negations = [f'-{_quote(t)}' for t in reduce_terms(EXCLUDE_KEYWORDS)] if negate else []
+    
+    budget = max((max_length - (max_length // 4 if negations else 0) - 1) // 2, 1)
+    queries = []
+    for ai_chunk in _pack(ai_terms, '|', budget):
+        for finance_chunk in _pack(finance_terms, '|', budget):
+            query = f"{'|'.join(ai_chunk)} {'|'.join(finance_chunk)}"
+            kept = _fit_negations(negations, max_length - len(query) - 1)
+            if kept:
+                query = f"{query} {' '.join(kept)}"
+            queries.append(query)
+    
+    logger.debug(f"Compiled {len(queries)} YouTube queries")
+    return queries
+
@@ -0,0 +1,158 @@
+"""Tweet rendering for news items.
+
+Tone keywords are compiled once at import, and rendered tweets are cached
+by (url_hash, TEMPLATE_VERSION, max_length), so review, dry-run and live
+posting render each item only once per process. Bump TEMPLATE_VERSION
+whenever the templates or the rendering rules change.
+"""
+
+import re
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+if TYPE_CHECKING:
+    from .models import NewsItem
+
+TEMPLATE_VERSION = 1
+
+# Rendered tweets kept; the oldest are dropped beyond this
+RENDER_CACHE_SIZE = 10_000
+
+TEMPLATES = {
+    "news": "AI+finance brief: {summary} | {title}. {link}",
+    "serious": "Heads-up: {summary} | {title}. Read: {link}",
+    "light": "Quick take: {summary} ({title}) {link}",
+}
+
+# Fallback order when no keyword decides, picked by url_hash
+TONES = ["news", "serious", "light"]
+
+SERIOUS_KEYWORDS = [
+    "fraud", "regulation", "regulatory", "breach",
+    "lawsuit", "crime", "guilty", "sec ", "fine",
+    "compliance", "penalty", "probe",
+]
+UPBEAT_KEYWORDS = [
+    "launch", "introduces", "debuts", "announces",
+    "survey", "report", "forecasts", "budget",
+    "funding", "round", "earnings", "expands",
+    "autonomous", "agents", "ai", "cloud",
+]
+
+
+def _substring_pattern(keywords: List[str]) -> re.Pattern:
+    # Plain substring alternation, matching `any(kw in text ...)` exactly
+    return re.compile('|'.join(re.escape(k) for k in keywords))
+
+
+SERIOUS_PATTERN = _substring_pattern(SERIOUS_KEYWORDS)
+UPBEAT_PATTERN = _substring_pattern(UPBEAT_KEYWORDS)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+_cache: Dict[Tuple[str, int, int], str] = {}
+
+
+def truncate(text: str, max_len: int) -> str:
+    """Trim text to a maximum length, adding ellipsis when needed."""
+    if len(text) <= max_len:
+        return text
+    return text[: max_len - 3].rstrip(" ,;:.") + "..."
+
+
+def extract_summary(item: "NewsItem", max_len: int = 180) -> str:
+    """Pull a short summary (the first sentence) from description or title."""
+    text = (item.description or item.title or "").strip()
+    if not text:
+        return ""
+    summary = _SENTENCE_END.split(text, maxsplit=1)[0]
+    return truncate(summary, max_len)
+
+
+def pick_tone(item: "NewsItem") -> str:
+    """
+    Choose a tone for the tweet based on content keywords.
+    
+    Returns one of: 'news', 'serious', 'light'
+    """
+    text = item.lowered_text()
+    if SERIOUS_PATTERN.search(text):
+        return "serious"
+    if UPBEAT_PATTERN.search(text):
+        return "news"
+    return TONES[int(item.url_hash, 16) % len(TONES)]
+
+
+def _render(item: "NewsItem", max_length: int) -> str:
+    link = item.canonical_url
+    title = (item.title or "").strip()
+    summary = extract_summary(item, max_len=140)
+    
+    if summary.lower() == title.lower():
+        summary = ""
+    
+    template = TEMPLATES[pick_tone(item)]
+    
+    def build(summary_text: str) -> str:
+        summary_part = summary_text if summary_text else title
+        return template.format(summary=summary_part, title=title, link=link).strip()
+    
+    tweet = build(summary)
+    
+    if len(tweet) > max_length and summary:
+        room = max_length - (len(tweet) - len(summary))
+        if room > 20:
+            tweet = build(truncate(summary, room))
+    
+    if len(tweet) > max_length:
+        compact = f"{title} - {link}"
+        if len(compact) > max_length:
+            available = max_length - len(link) - 3  # room for separator and ellipsis
+            compact = f"{truncate(title, available)} - {link}"
+        tweet = compact[:max_length]
+    
+    return tweet
+
+
+def render_tweet(item: "NewsItem", max_length: int = 280) -> str:
+    """
+    Format an item as a tweet with a short summary and tone-aware template.
+    
+    Tones:
+        - news: concise headline-style
+        - serious: cautionary or weighty items
+        - light: slightly playful TL;DR
+        
+    Args:
+        item: Item to render
+        max_length: Maximum tweet length
+        
+    Returns:
+        Tweet text (cached per url_hash, template version and max_length)
+    """
+    key = (item.url_hash, TEMPLATE_VERSION, max_length)
+    tweet = _cache.get(key)
+    if tweet is None:
+        tweet = _render(item, max_length)
+        if len(_cache) >= RENDER_CACHE_SIZE:
+            del _cache[next(iter(_cache))]
+        _cache[key] = tweet
+    return tweet
+
+
+def render_all(items: Iterable["NewsItem"], max_length: int = 280) -> List[str]:
+    """
+    Render a batch of items in one pass (review and dry-run output).
+    
+    Args:
+        items: Items to render
+        max_length: Maximum tweet length
+        
+    Returns:
+        Tweets in item order
+    """
+    return [render_tweet(item, max_length) for item in items]
+
+
+def clear_render_cache() -> None:
+    """Drop all cached tweets."""
+    _cache.clear()
@@ -2,10 +2,15 @@
 
 import logging
 import re
-from typing import List
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Pattern, Set, Tuple
 
+from .authority import DEFAULT_TABLE, AuthorityTable
 from .models import NewsItem
 
+if TYPE_CHECKING:
+    from .db import Database
+
 logger = logging.getLogger(__name__)
 
 # ===========================
@@ -84,6 +89,100 @@ EXCLUDE_KEYWORDS = [
 ]
 
 
+def compile_keyword_pattern(keywords: List[str]) -> Pattern[str]:
+    """
+    Compile keywords into a single word-bounded alternation.
+    
+    A search with the compiled pattern succeeds exactly when at least one
+    keyword matches on its own with word boundaries, so it can replace a
+    per-keyword loop wherever only presence matters.
+    
+    Args:
+        keywords: Lowercase keywords
+        
+    Returns:
+        Compiled pattern (match against lowercased text)
+    """
+    alternatives = sorted({re.escape(k) for k in keywords}, key=len, reverse=True)
+    return re.compile(r'\b(?:' + '|'.join(alternatives) + r')\b')
+
+
+AI_PATTERN = compile_keyword_pattern(AI_KEYWORDS)
+FINANCE_PATTERN = compile_keyword_pattern(FINANCE_KEYWORDS)
+EXCLUDE_PATTERN = compile_keyword_pattern(EXCLUDE_KEYWORDS)
+
+
+class KeywordMatcher:
+    """
+    Find which of many keywords occur in a text with one scan.
+    
+    A lookahead alternation visits every position where some keyword
+    matches with word boundaries; only the keywords sharing that position's
+    prefix are then checked. The result is exactly the set of keywords
+    count_keyword_matches would count, so any number of keyword lists can be
+    scored from one scan by intersecting with it.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Compile keywords.
+        
+        Args:
+            keywords: Lowercase keywords (duplicates are ignored)
+        """
+        self.keywords = sorted(set(keywords))
+        alternatives = sorted((re.escape(k) for k in self.keywords), key=len, reverse=True)
+        self._scan = re.compile(r'(?=\b(?:' + '|'.join(alternatives) + r')\b)')
+        # Candidates are indexed by their first characters (two, unless a keyword is shorter)
+        self._prefix = min([2] + [len(k) for k in self.keywords])
+        self._by_prefix: Dict[str, List[Tuple[str, Pattern[str]]]] = {}
+        for keyword in self.keywords:
+            self._by_prefix.setdefault(keyword[:self._prefix], []).append(
+                (keyword, re.compile(r'\b' + re.escape(keyword) + r'\b'))
+            )
+    
+    def matches(self, text_lower: str) -> Set[str]:
+        """
+        Find the keywords present in a text.
+        
+        Args:
+            text_lower: Lowercased text
+            
+        Returns:
+            Keywords that occur with word boundaries
+        """
+        found = set()
+        if not self.keywords:
+            return found
+        prefix = self._prefix
+        for hit in self._scan.finditer(text_lower):
+            position = hit.start()
+            for keyword, pattern in self._by_prefix.get(text_lower[position:position + prefix], ()):
+                if pattern.match(text_lower, position):
+                    found.add(keyword)
+        return found
+
+
+def fts_any(keywords: List[str]) -> str:
+    """
+    Build an FTS5 query matching any of the keywords as a phrase.
+    
+    Args:
+        keywords: Keywords (punctuation is dropped by the FTS tokenizer)
+        
+    Returns:
+        Query like '"ai" OR "machine learning"'
+    """
+    return ' OR '.join('"' + keyword.replace('"', '') + '"' for keyword in keywords)
+
+
+# SQL-side counterpart of the dual-category requirement and hard exclusions,
+# for the candidate store (tokenized matching approximates the \b regexes)
+RELEVANCE_MATCH = (
+    f"({fts_any(AI_KEYWORDS)}) AND ({fts_any(FINANCE_KEYWORDS)}) NOT ({fts_any(EXCLUDE_KEYWORDS)})"
+)
+
+
 def should_exclude(text: str) -> bool:
     """
     Hard filter: exclude items matching exclude keywords.
@@ -94,11 +193,7 @@ def should_exclude(text: str) -> bool:
     Returns:
         True if item should be excluded
     """
-    text_lower = text.lower()
-    for keyword in EXCLUDE_KEYWORDS:
-        if re.search(r'\b' + re.escape(keyword) + r'\b', text_lower):
-            return True
-    return False
+    return EXCLUDE_PATTERN.search(text.lower()) is not None
 
 
 def count_keyword_matches(text: str, keywords: List[str]) -> int:
@@ -112,7 +207,10 @@ def count_keyword_matches(text: str, keywords: List[str]) -> int:
     Returns:
         Number of unique keywords matched
     """
-    text_lower = text.lower()
+    return _count_matches_lower(text.lower(), keywords)
+
+
+def _count_matches_lower(text_lower: str, keywords: List[str]) -> int:
     matches = 0
     for keyword in keywords:
         # Use word boundaries to avoid partial matches
@@ -122,11 +220,27 @@ def count_keyword_matches(text: str, keywords: List[str]) -> int:
     return matches
 
 
+def recency_boost(hours_ago: float, recency_weight: float) -> float:
+    """
+    Score boost for newer items over a 7-day window.
+    
+    Args:
+        hours_ago: Item age in hours
+        recency_weight: Weight for recency boost
+        
+    Returns:
+        Boost (0.0 for items a week old or more)
+    """
+    return max(0, (168 - hours_ago) * recency_weight / 10)
+
+
 def calculate_relevance_score(
     item: NewsItem,
     agent_weight: float = 1.0,
     finance_weight: float = 1.0,
     recency_weight: float = 0.5,
+    now: Optional[datetime] = None,
+    authority: Optional[AuthorityTable] = None,
 ) -> float:
     """
     Calculate relevance score for a news item.
@@ -142,23 +256,23 @@ def calculate_relevance_score(
         agent_weight: Weight for agent keyword matches
         finance_weight: Weight for finance keyword matches
         recency_weight: Weight for recency boost
+        now: Reference time for recency (defaults to current time)
+        authority: Source credibility table (defaults to the built-in weights)
         
     Returns:
         Relevance score (0.0 if excluded or missing category)
     """
-    # Combine title and description for analysis
-    text = item.title
-    if item.description:
-        text += " " + item.description
+    # Combined, lowercased title and description (built once per item)
+    text = item.lowered_text()
     
     # Hard exclusion filter
-    if should_exclude(text):
+    if EXCLUDE_PATTERN.search(text):
         logger.debug(f"Excluded (filter): {item.title}")
         return 0.0
     
     # Count keyword matches
-    ai_matches = count_keyword_matches(text, AI_KEYWORDS)
-    finance_matches = count_keyword_matches(text, FINANCE_KEYWORDS)
+    ai_matches = _count_matches_lower(text, AI_KEYWORDS)
+    finance_matches = _count_matches_lower(text, FINANCE_KEYWORDS)
     
     # Must have BOTH categories
     if ai_matches == 0 or finance_matches == 0:
@@ -174,31 +288,19 @@ def calculate_relevance_score(
     # Recency boost (optional)
     # Newer items get slight boost; this is already handled by sorting later
     # but we include it in score for transparency
-    from datetime import datetime, timezone
-    now = datetime.now(timezone.utc)
-    hours_ago = (now - item.published_at).total_seconds() / 3600
-    recency_boost = max(0, (168 - hours_ago) * recency_weight / 10)  # Adjusted for 7-day window
-    
-    # Source credibility boost
-    # Research papers and premium news sources are higher quality
-    source_boost = 0.0
-    if item.source == 'arxiv':
-        source_boost = 10.0  # Strong boost for academic papers
-    elif item.source == 'rss':
-        # Premium RSS feeds get modest boost
-        if item.domain and any(premium in item.domain.lower() for premium in 
-                               ['ft.com', 'reuters', 'bloomberg', 'wsj', 'americanbanker', 
-                                'insurancejournal', 'technologyreview.com', 'wired.com', 
-                                'techcrunch.com', 'venturebeat.com', 'coindesk.com']):
-            source_boost = 5.0
-    # GDELT gets no boost (baseline)
-    
-    total_score = base_score + recency_boost + source_boost
+    if now is None:
+        now = datetime.now(timezone.utc)
+    recency = recency_boost((now - item.published_at).total_seconds() / 3600, recency_weight)
+    
+    # Source credibility boost (research papers and premium news sites)
+    source_boost = (authority or DEFAULT_TABLE).boost(item.source, item.registrable_domain)
+    
+    total_score = base_score + recency + source_boost
     
     logger.debug(
         f"Scored: {item.title} | "
         f"AI={ai_matches}, Finance={finance_matches}, "
-        f"Base={base_score:.1f}, Recency={recency_boost:.1f}, Source={source_boost:.1f}, Total={total_score:.1f}"
+        f"Base={base_score:.1f}, Recency={recency:.1f}, Source={source_boost:.1f}, Total={total_score:.1f}"
     )
     
     return total_score
@@ -209,6 +311,8 @@ def score_items(
     agent_weight: float = 1.0,
     finance_weight: float = 1.0,
     recency_weight: float = 0.5,
+    now: Optional[datetime] = None,
+    authority: Optional[AuthorityTable] = None,
 ) -> List[NewsItem]:
     """
     Score all items and update their relevance_score field.
@@ -218,16 +322,55 @@ def score_items(
         agent_weight: Weight for agent keywords
         finance_weight: Weight for finance keywords
         recency_weight: Weight for recency
+        now: Reference time for recency, shared by the whole batch
+        authority: Source credibility table (defaults to the built-in weights)
         
     Returns:
         Same list with updated scores
     """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    
     for item in items:
         item.relevance_score = calculate_relevance_score(
             item,
             agent_weight=agent_weight,
             finance_weight=finance_weight,
             recency_weight=recency_weight,
+            now=now,
+            authority=authority,
         )
     
     return items
+
+
+def score_candidates_bm25(
+    db: "Database",
+    query: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    source: Optional[str] = None,
+    min_bm25: Optional[float] = None,
+    limit: int = 1000,
+) -> List[dict]:
+    """
+    Score and filter stored candidates inside SQLite.
+    
+    The dual-category requirement and exclusions run as an FTS5 MATCH and
+    ranking is BM25 (title weighted over description), so thousands of
+    stored items are filtered without loading them into Python.
+    
+    Args:
+        db: Database with the candidate store
+        query: Extra FTS5 query the items must also match (e.g. 'fraud')
+        since: Only items published at or after this time
+        until: Only items published before this time
+        source: Only items from this source
+        min_bm25: Only items scoring at least this
+        limit: Maximum rows returned
+        
+    Returns:
+        Candidate rows, best match first, with 'bm25' (higher = better)
+    """
+    match = f"({query}) AND ({RELEVANCE_MATCH})" if query else RELEVANCE_MATCH
+    return db.search_candidates(match, since=since, until=until, source=source, min_bm25=min_bm25, limit=limit)
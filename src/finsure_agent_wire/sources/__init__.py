@@ -1,11 +1,15 @@
 """Sources package for news aggregation."""
 
-from .gdelt import fetch_gdelt_articles
-from .youtube import fetch_youtube_videos
-from .rss import fetch_rss_feeds
+from .gdelt import fetch_gdelt_articles, iter_gdelt_articles, iter_gdelt_window
+from .youtube import fetch_youtube_videos, iter_youtube_videos
+from .rss import fetch_rss_feeds, iter_rss_feeds
 
 __all__ = [
     'fetch_gdelt_articles',
     'fetch_youtube_videos',
     'fetch_rss_feeds',
+    'iter_gdelt_articles',
+    'iter_gdelt_window',
+    'iter_youtube_videos',
+    'iter_rss_feeds',
 ]
@@ -1,118 +1,417 @@
 """arXiv research paper collector for AI + Finance."""
 
 import logging
-from datetime import datetime, timezone, timedelta
-from typing import List
-import urllib.parse
-import urllib.request
+import re
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
 import xml.etree.ElementTree as ET
 
 from ..models import NewsItem
+from ..text import normalize_text, searchable_text
+from .dates import parse_datetime
+from .filters import ItemFilter
+from .http import DeadlineExceeded, HttpFetcher, default_fetcher
+
+if TYPE_CHECKING:
+    from ..db import Database
 
 logger = logging.getLogger(__name__)
 
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
 
-def fetch_arxiv_papers(
+# arXiv asks clients to wait 3 seconds between consecutive API calls
+ARXIV_PAGE_DELAY_SECONDS = 3.0
+
+# arXiv documents no hard limit, but long search_query strings get rejected
+# or silently truncated by proxies; stay well under common URL limits
+ARXIV_MAX_QUERY_LENGTH = 1000
+
+# Queries that already carry a field prefix are used as-is
+FIELD_PREFIX = re.compile(r'\b(?:ti|au|abs|co|jr|cat|rn|id|all):')
+
+# Namespace for Atom feed
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+NS = {'atom': ATOM_NS}
+ENTRY_TAG = f'{{{ATOM_NS}}}entry'
+
+
+def build_search_expressions(
     queries: List[str],
-    lookback_hours: int = 24,
-    max_results: int = 50
-) -> List[NewsItem]:
+    batch: bool = False,
+    max_length: int = ARXIV_MAX_QUERY_LENGTH,
+) -> List[Tuple[str, List[str]]]:
     """
-    Fetch recent papers from arXiv matching AI + finance topics.
+    Turn configured queries into arXiv search_query expressions.
+    
+    Plain queries are searched in all fields (all:); queries that already
+    use field prefixes (ti:, abs:, cat:, ...) are passed through unchanged.
+    In batch mode, queries are OR'd together (each kept as its own
+    parenthesized clause, so its meaning is unchanged) and packed greedily
+    into as few expressions as fit under max_length.
     
     Args:
-        queries: List of search queries
-        lookback_hours: Only include papers from last N hours
-        max_results: Maximum papers per query
+        queries: Configured search queries
+        batch: Merge queries into OR'd expressions
+        max_length: Maximum search_query length per request
         
     Returns:
-        List of NewsItems representing research papers
+        (search_query, queries it covers) pairs
     """
-    if not queries:
-        logger.info("No arXiv queries configured, skipping arXiv fetch")
-        return []
+    clauses = [(query if FIELD_PREFIX.search(query) else f'all:{query}', query) for query in queries]
+    if not batch:
+        return [(clause, [query]) for clause, query in clauses]
     
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
-    all_items = []
+    expressions = []
+    current: List[Tuple[str, str]] = []
     
-    for query in queries:
-        try:
-            logger.info(f"Searching arXiv for: {query}")
-            
-            # arXiv API endpoint
-            base_url = "http://export.arxiv.org/api/query?"
-            
-            # Build query parameters
-            params = {
-                'search_query': f'all:{query}',
-                'start': 0,
-                'max_results': max_results,
-                'sortBy': 'submittedDate',
-                'sortOrder': 'descending'
-            }
-            
-            url = base_url + urllib.parse.urlencode(params)
-            
-            # Fetch results
-            with urllib.request.urlopen(url) as response:
-                xml_data = response.read()
-            
-            # Parse XML
-            root = ET.fromstring(xml_data)
-            
-            # Namespace for Atom feed
-            ns = {'atom': 'http://www.w3.org/2005/Atom'}
-            
-            entries = root.findall('atom:entry', ns)
-            logger.info(f"arXiv returned {len(entries)} papers for query: {query}")
-            
-            for entry in entries:
+    def flush() -> None:
+        if len(current) == 1:
+            expressions.append((current[0][0], [current[0][1]]))
+        elif current:
+            expression = ' OR '.join(f'({clause})' for clause, _ in current)
+            expressions.append((expression, [query for _, query in current]))
+    
+    for clause, query in clauses:
+        candidate = current + [(clause, query)]
+        length = sum(len(c) + 2 for c, _ in candidate) + 4 * (len(candidate) - 1)
+        if current and length > max_length:
+            flush()
+            current = []
+        current.append((clause, query))
+    flush()
+    
+    return expressions
+
+
+def arxiv_id(entry_id: str) -> str:
+    """
+    Normalize an entry id URL to a version-less arXiv id.
+    
+    Args:
+        entry_id: e.g. 'http://arxiv.org/abs/2401.01234v2'
+        
+    Returns:
+        e.g. '2401.01234'
+    """
+    paper_id = entry_id.rsplit('/abs/', 1)[-1]
+    return re.sub(r'v\d+$', '', paper_id)
+
+
+def _matching_queries(queries: List[str], text: str) -> List[str]:
+    """
+    Find which of a batch's queries a paper matches, by local term match.
+    
+    arXiv does not say which OR'd clause matched, so a query counts as
+    matched when all of its words appear in the title or abstract. When
+    none match locally (arXiv also searches authors, comments and stems),
+    the paper is tagged with the whole batch.
+    
+    Args:
+        queries: Queries covered by the request
+        text: Title and abstract
+        
+    Returns:
+        Matching queries
+    """
+    if len(queries) == 1:
+        return list(queries)
+    words = set(re.findall(r'\w+', text.lower()))
+    matched = [q for q in queries if all(w in words for w in re.findall(r'\w+', q.lower()))]
+    return matched or list(queries)
+
+
+def _parse_entry(
+    entry: ET.Element,
+    pub_date: datetime,
+    item_filter: ItemFilter,
+    queries: List[str],
+) -> Optional[NewsItem]:
+    """
+    Build a NewsItem from an Atom entry element.
+    
+    Args:
+        entry: Parsed <entry> element
+        pub_date: Already-parsed publication date
+        item_filter: Push-down filter
+        queries: Queries covered by the request, for tagging
+        
+    Returns:
+        NewsItem, or None if the filter rejects the entry
+    """
+    # Get title and abstract (plain text: a literal '<' in math is not markup)
+    title = normalize_text(entry.find('atom:title', NS).text, markup=False)
+    summary = normalize_text(entry.find('atom:summary', NS).text, markup=False)
+    
+    # Get URL
+    link = entry.find('atom:id', NS).text
+    
+    # Get authors (first 3)
+    authors = entry.findall('atom:author', NS)
+    author_names = [a.find('atom:name', NS).text for a in authors[:3]]
+    if len(authors) > 3:
+        author_str = f"{', '.join(author_names)} et al."
+    else:
+        author_str = ', '.join(author_names)
+    
+    # Enhanced description with authors
+    enhanced_description = f"[arXiv Paper] {author_str} — {summary[:300]}..."
+    
+    title = f"📄 {title}"  # Add paper emoji
+    text_lower = searchable_text(title, enhanced_description)
+    if item_filter.rejects_text(title, enhanced_description, text_lower):
+        return None
+    
+    return NewsItem(
+        url=link,
+        title=title,
+        description=enhanced_description,
+        source='arxiv',
+        published_at=pub_date,
+        matched_queries=_matching_queries(queries, f"{title} {summary}"),
+        text_lower=text_lower,
+    )
+
+
+def _iter_search(
+    search_query: str,
+    queries: List[str],
+    item_filter: ItemFilter,
+    max_results: int,
+    base_url: str,
+    seen: Dict[str, Optional[NewsItem]],
+    fetcher: HttpFetcher,
+    db: Optional["Database"] = None,
+    max_pages: int = 1,
+    page_delay: float = ARXIV_PAGE_DELAY_SECONDS,
+) -> Iterator[NewsItem]:
+    """
+    Stream one search expression, newest first, stopping at the first entry
+    older than the cutoff or not newer than the stored watermark.
+    
+    Results are read with iterparse, so reading stops as soon as the stop
+    condition is hit instead of downloading and parsing the whole page.
+    Further pages are requested with `start` only while every entry of the
+    previous page was new. The watermark only moves when the scan reached
+    a known or stale paper or a short page; a scan cut off by max_pages
+    leaves it, so the unread papers are scanned again next run.
+    
+    Papers already parsed by an earlier request in the same run are not
+    parsed again; the queries of this request are added to their tags.
+    
+    Args:
+        search_query: arXiv search_query expression
+        queries: Configured queries the expression covers
+        item_filter: Push-down filter (its cutoff ends the scan)
+        max_results: Page size
+        base_url: arXiv API endpoint
+        seen: arXiv id -> item (None if rejected) for papers parsed this run
+        fetcher: HTTP fetcher
+        db: Database or WatermarkLedger holding the per-query watermark (None disables watermarks)
+        max_pages: Maximum pages to request
+        page_delay: Seconds to wait between page requests
+        
+    Yields:
+        NewsItems for papers newer than the cutoff and watermark
+    """
+    watermark = db.get_watermark('arxiv', search_query) if db else None
+    newest = None
+    # Only a scan that reached known papers or the end of the results saw every new paper
+    complete = False
+    
+    for page in range(max_pages):
+        if page and not (fetcher.cache and fetcher.cache.replay):
+            time.sleep(page_delay)
+        
+        params = {
+            'search_query': search_query,
+            'start': page * max_results,
+            'max_results': max_results,
+            'sortBy': 'submittedDate',
+            'sortOrder': 'descending'
+        }
+        
+        entries_read = 0
+        reached_known = False
+        
+        with fetcher.open(base_url, params=params) as response:
+            for _, elem in ET.iterparse(response, events=('end',)):
+                if elem.tag != ENTRY_TAG:
+                    continue
+                entries_read += 1
+                
                 try:
                     # Get publication date
-                    published_str = entry.find('atom:published', ns).text
-                    pub_date = datetime.fromisoformat(published_str.replace('Z', '+00:00'))
-                    
-                    # Filter by cutoff
-                    if pub_date < cutoff:
-                        continue
-                    
-                    # Get title
-                    title = entry.find('atom:title', ns).text.strip().replace('\n', ' ')
-                    
-                    # Get abstract
-                    summary = entry.find('atom:summary', ns).text.strip().replace('\n', ' ')
-                    
-                    # Get URL
-                    link = entry.find('atom:id', ns).text
+                    published_str = elem.find('atom:published', NS).text
+                    pub_date = parse_datetime(published_str, 'arxiv')
+                    if pub_date is None:
+                        raise ValueError(f"Unparseable published date: {published_str!r}")
                     
-                    # Get authors (first 3)
-                    authors = entry.findall('atom:author', ns)
-                    author_names = [a.find('atom:name', ns).text for a in authors[:3]]
-                    if len(authors) > 3:
-                        author_str = f"{', '.join(author_names)} et al."
-                    else:
-                        author_str = ', '.join(author_names)
+                    # Sorted newest first: everything after this is old too
+                    if (watermark and pub_date <= watermark) or item_filter.is_stale(pub_date):
+                        reached_known = True
+                        break
                     
-                    # Enhanced description with authors
-                    enhanced_description = f"[arXiv Paper] {author_str} — {summary[:300]}..."
+                    if newest is None or pub_date > newest:
+                        newest = pub_date
                     
-                    item = NewsItem(
-                        url=link,
-                        title=f"📄 {title}",  # Add paper emoji
-                        description=enhanced_description,
-                        source='arxiv',
-                        published_at=pub_date,
-                    )
+                    paper_id = arxiv_id(elem.find('atom:id', NS).text)
+                    if paper_id in seen:
+                        known = seen[paper_id]
+                        if known is not None:
+                            known.matched_queries.extend(q for q in queries if q not in known.matched_queries)
+                        continue
                     
-                    all_items.append(item)
+                    item = _parse_entry(elem, pub_date, item_filter, queries)
+                    seen[paper_id] = item
                 
                 except Exception as e:
                     logger.warning(f"Error parsing arXiv entry: {e}")
                     continue
+                
+                finally:
+                    elem.clear()
+                
+                if item is not None:
+                    yield item
+        
+        logger.info(f"arXiv page {page + 1}: read {entries_read} entries for query: {search_query}")
+        
+        if reached_known or entries_read < max_results:
+            complete = True
+            break
+    else:
+        logger.warning(f"arXiv: hit max pages ({max_pages}) for query: {search_query}; watermark not moved")
+    
+    if db and newest and complete:
+        db.set_watermark('arxiv', search_query, newest)
+
+
+def iter_arxiv_papers(
+    queries: List[str],
+    lookback_hours: int = 24,
+    max_results: int = 50,
+    base_url: str = ARXIV_API_URL,
+    item_filter: Optional[ItemFilter] = None,
+    db: Optional["Database"] = None,
+    max_pages: int = 1,
+    page_delay: float = ARXIV_PAGE_DELAY_SECONDS,
+    batch_queries: bool = False,
+    fetcher: Optional[HttpFetcher] = None,
+    window: Optional[Tuple[datetime, datetime]] = None,
+    failed: Optional[List[str]] = None,
+) -> Iterator[NewsItem]:
+    """
+    Yield recent papers from arXiv matching AI + finance topics as they are parsed.
+    
+    Args:
+        queries: List of search queries
+        lookback_hours: Only include papers from last N hours
+        max_results: Maximum papers per query page
+        base_url: arXiv API endpoint (override for a local stand-in server)
+        item_filter: Push-down filter applied while parsing (its cutoff replaces lookback_hours)
+        db: Database or WatermarkLedger (the pipeline's, which only writes the marks once
+            the run posted) for per-query high-water marks (None = always scan to the cutoff)
+        max_pages: Maximum pages per query when a burst of new papers exceeds one page
+        page_delay: Seconds to wait between page requests
+        batch_queries: Merge queries into OR'd expressions (fewer round-trips)
+        fetcher: HTTP fetcher (default: shared uncached fetcher)
+        window: (start, end) submission range to search instead of the most
+            recent papers (backfill; pass db=None so no watermark moves)
+        failed: Receives the search expressions whose request failed
+        
+    Yields:
+        NewsItems representing research papers, deduplicated by arXiv id and
+        tagged with the queries that matched (matched_queries)
+    """
+    if not queries:
+        logger.info("No arXiv queries configured, skipping arXiv fetch")
+        return
+    
+    if item_filter is None:
+        item_filter = ItemFilter.cutoff_only(lookback_hours)
+    fetcher = fetcher or default_fetcher()
+    count = 0
+    seen: Dict[str, Optional[NewsItem]] = {}
+    
+    searches = build_search_expressions(queries, batch=batch_queries)
+    if window:
+        date_range = f"submittedDate:[{window[0]:%Y%m%d%H%M} TO {window[1]:%Y%m%d%H%M}]"
+        searches = [(f"({expression}) AND {date_range}", covered) for expression, covered in searches]
+    if batch_queries:
+        logger.info(f"arXiv: {len(queries)} queries merged into {len(searches)} requests")
+    
+    for search_query, covered in searches:
+        try:
+            logger.info(f"Searching arXiv for: {', '.join(covered)}")
             
+            for item in _iter_search(
+                search_query,
+                covered,
+                item_filter,
+                max_results,
+                base_url,
+                seen,
+                fetcher,
+                db=db,
+                max_pages=max_pages,
+                page_delay=page_delay,
+            ):
+                count += 1
+                yield item
+        
+        except DeadlineExceeded:
+            raise
+        
         except Exception as e:
-            logger.error(f"Error fetching arXiv for query '{query}': {e}")
+            logger.error(f"Error fetching arXiv for query '{search_query}': {e}")
+            if failed is not None:
+                failed.append(search_query)
             continue
     
-    logger.info(f"arXiv: Fetched {len(all_items)} papers")
-    return all_items
+    logger.info(f"arXiv: Fetched {count} papers")
+
+
+def fetch_arxiv_papers(
+    queries: List[str],
+    lookback_hours: int = 24,
+    max_results: int = 50,
+    base_url: str = ARXIV_API_URL,
+    item_filter: Optional[ItemFilter] = None,
+    db: Optional["Database"] = None,
+    max_pages: int = 1,
+    page_delay: float = ARXIV_PAGE_DELAY_SECONDS,
+    batch_queries: bool = False,
+    fetcher: Optional[HttpFetcher] = None,
+) -> List[NewsItem]:
+    """
+    Fetch recent papers from arXiv matching AI + finance topics.
+    
+    Args:
+        queries: List of search queries
+        lookback_hours: Only include papers from last N hours
+        max_results: Maximum papers per query page
+        base_url: arXiv API endpoint (override for a local stand-in server)
+        item_filter: Push-down filter applied while parsing (its cutoff replaces lookback_hours)
+        db: Database or WatermarkLedger (the pipeline's, which only writes the marks once
+            the run posted) for per-query high-water marks (None = always scan to the cutoff)
+        max_pages: Maximum pages per query when a burst of new papers exceeds one page
+        page_delay: Seconds to wait between page requests
+        batch_queries: Merge queries into OR'd expressions (fewer round-trips)
+        fetcher: HTTP fetcher (default: shared uncached fetcher)
+        
+    Returns:
+        List of NewsItems representing research papers
+    """
+    return list(iter_arxiv_papers(
+        queries,
+        lookback_hours,
+        max_results,
+        base_url,
+        item_filter,
+        db=db,
+        max_pages=max_pages,
+        page_delay=page_delay,
+        batch_queries=batch_queries,
+        fetcher=fetcher,
+    ))
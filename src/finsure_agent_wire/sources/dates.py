@@ -0,0 +1,172 @@
+"""Timestamp parsing shared by the source adapters.
+
+Each feed or API sticks to one date format, so DateParser remembers which
+format last worked per key (a feed URL or source name) and tries it
+first. Known formats are parsed by precompiled fast paths; the generic
+email.utils parser is only the last resort. All results are timezone-aware
+UTC datetimes.
+"""
+
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+_MONTHS = {
+    name: number for number, name in enumerate(
+        ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1
+    )
+}
+
+# RFC 822 zone names in common use (hours east of UTC)
+_ZONES = {
+    'ut': 0, 'utc': 0, 'gmt': 0, 'z': 0,
+    'est': -5, 'edt': -4, 'cst': -6, 'cdt': -5,
+    'mst': -7, 'mdt': -6, 'pst': -8, 'pdt': -7,
+}
+
+# "Mon, 15 Jan 2024 12:30:00 +0000" with optional weekday, seconds and zone
+_RFC2822 = re.compile(
+    r'(?:[A-Za-z]{3},?\s+)?(\d{1,2})\s+([A-Za-z]{3})[A-Za-z]*\.?\s+(\d{2,4})\s+'
+    r'(\d{1,2}):(\d{2})(?::(\d{2}))?\s*(?:([+-])(\d{2}):?(\d{2})|([A-Za-z]{1,5}))?\s*$'
+)
+
+# GDELT seendate: "20240115T123000Z"
+_COMPACT = re.compile(r'(\d{4})(\d{2})(\d{2})T(\d{2})(\d{2})(\d{2})Z$')
+
+
+def to_utc(dt: datetime) -> datetime:
+    """
+    Normalize a datetime to UTC.
+    
+    Args:
+        dt: Aware or naive datetime (naive is taken as UTC)
+        
+    Returns:
+        Timezone-aware UTC datetime
+    """
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def from_struct_time(value: time.struct_time) -> datetime:
+    """
+    Convert a struct_time in UTC (e.g. feedparser's published_parsed).
+    
+    Args:
+        value: UTC struct_time
+        
+    Returns:
+        Timezone-aware UTC datetime
+    """
+    return datetime(*value[:6], tzinfo=timezone.utc)
+
+
+def _parse_iso(value: str) -> datetime:
+    return to_utc(datetime.fromisoformat(value))
+
+
+def _parse_rfc2822(value: str) -> datetime:
+    match = _RFC2822.match(value)
+    if not match:
+        raise ValueError(f"Not an RFC 2822 date: {value!r}")
+    day, month, year, hour, minute, second, sign, off_h, off_m, zone = match.groups()
+    year = int(year)
+    if year < 100:
+        year += 2000 if year < 50 else 1900
+    parsed = datetime(
+        year, _MONTHS[month.lower()], int(day), int(hour), int(minute), int(second or 0), tzinfo=timezone.utc
+    )
+    # Most feeds publish in UTC, which needs no arithmetic
+    if sign:
+        offset_minutes = int(off_h) * 60 + int(off_m)
+        if offset_minutes:
+            parsed -= timedelta(minutes=offset_minutes if sign == '+' else -offset_minutes)
+    elif zone:
+        hours = _ZONES.get(zone.lower())
+        if hours is None:
+            raise ValueError(f"Unknown zone: {zone}")
+        if hours:
+            parsed -= timedelta(hours=hours)
+    return parsed
+
+
+def _parse_compact(value: str) -> datetime:
+    match = _COMPACT.match(value)
+    if not match:
+        raise ValueError(f"Not a compact timestamp: {value!r}")
+    return datetime(*map(int, match.groups()), tzinfo=timezone.utc)
+
+
+def _parse_email(value: str) -> datetime:
+    return to_utc(parsedate_to_datetime(value))
+
+
+# Tried in this order when a key has no known format yet
+FORMATS: Dict[str, Callable[[str], datetime]] = {
+    'iso': _parse_iso,
+    'rfc2822': _parse_rfc2822,
+    'compact': _parse_compact,
+    'email': _parse_email,
+}
+
+
+class DateParser:
+    """Parses timestamps, remembering the format each key uses."""
+    
+    def __init__(self):
+        self._formats: Dict[str, str] = {}
+    
+    def parse(self, value: str, key: Optional[str] = None) -> Optional[datetime]:
+        """
+        Parse a timestamp.
+        
+        Args:
+            value: Timestamp string
+            key: Feed URL or source name whose format is cached (None = no caching)
+            
+        Returns:
+            Timezone-aware UTC datetime, or None if no format matches
+        """
+        value = value.strip()
+        known = self._formats.get(key) if key else None
+        if known:
+            try:
+                return FORMATS[known](value)
+            except (ValueError, KeyError, TypeError, OverflowError):
+                pass
+        
+        for name, parse in FORMATS.items():
+            if name == known:
+                continue
+            try:
+                parsed = parse(value)
+            except (ValueError, KeyError, TypeError, OverflowError):
+                continue
+            if key:
+                self._formats[key] = name
+            return parsed
+        return None
+    
+    def format_of(self, key: str) -> Optional[str]:
+        """Name of the format last detected for a key."""
+        return self._formats.get(key)
+
+
+_parser = DateParser()
+
+
+def parse_datetime(value: str, key: Optional[str] = None) -> Optional[datetime]:
+    """
+    Parse a timestamp with the shared per-key format cache.
+    
+    Args:
+        value: Timestamp string
+        key: Feed URL or source name whose format is cached
+        
+    Returns:
+        Timezone-aware UTC datetime, or None if no format matches
+    """
+    return _parser.parse(value, key)
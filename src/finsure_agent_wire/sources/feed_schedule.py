@@ -0,0 +1,152 @@
+"""Adaptive polling schedule for RSS feeds.
+
+Each poll records what the feed looked like in the feed_history table:
+when it last changed and an estimate of how many entries it publishes per
+hour. Treating publication as a Poisson process, a feed is polled again
+once a new entry is more likely than not (after ln 2 / rate hours), so
+busy feeds are polled every run and quiet ones rarely. No feed goes longer
+than max_staleness without a poll.
+"""
+
+import hashlib
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from ..db import Database
+
+logger = logging.getLogger(__name__)
+
+# Entries older than this do not count towards the publication rate
+RATE_HORIZON = timedelta(days=7)
+
+# Weight of the latest observation in the smoothed rate
+RATE_SMOOTHING = 0.5
+
+# Poll once a new entry is at least this likely
+NEW_ENTRY_PROBABILITY = 0.5
+
+
+def entries_fingerprint(links: List[str]) -> str:
+    """
+    Hash a feed's entry links, to tell whether it changed between polls.
+    
+    Args:
+        links: Entry links in feed order
+        
+    Returns:
+        Hex digest
+    """
+    return hashlib.sha256('\n'.join(links).encode('utf-8')).hexdigest()
+
+
+def observed_rate(entry_dates: List[datetime], now: datetime) -> float:
+    """
+    Estimate a feed's publication rate from the entry dates it lists.
+    
+    Args:
+        entry_dates: Publication times of the feed's entries
+        now: Current time
+        
+    Returns:
+        Entries per hour over the span the recent entries cover (up to RATE_HORIZON)
+    """
+    recent = [d for d in entry_dates if now - RATE_HORIZON <= d <= now]
+    if not recent:
+        return 0.0
+    # A feed that keeps only its last few entries covers less than the
+    # horizon; the span still runs to now, so a quiet spell lowers the rate
+    span_hours = max((now - min(recent)).total_seconds() / 3600, 1.0)
+    return len(recent) / span_hours
+
+
+class FeedScheduler:
+    """Decides which feeds are due and learns from each poll."""
+    
+    def __init__(self, db: "Database", max_staleness: timedelta):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            db: Database holding feed_history, or the pipeline's WatermarkLedger
+                (which only writes the polls once the run posted)
+            max_staleness: Longest time a feed may go without a poll
+        """
+        self.db = db
+        self.max_staleness = max_staleness
+    
+    def poll_interval(self, rate: float) -> timedelta:
+        """
+        Get the time between polls for a feed.
+        
+        Args:
+            rate: Smoothed entries per hour
+            
+        Returns:
+            Hours until a new entry is NEW_ENTRY_PROBABILITY likely, capped at max_staleness
+        """
+        if rate <= 0:
+            return self.max_staleness
+        hours = -math.log(1 - NEW_ENTRY_PROBABILITY) / rate
+        return min(timedelta(hours=hours), self.max_staleness)
+    
+    def due(self, feed_urls: List[str], now: Optional[datetime] = None) -> List[str]:
+        """
+        Select the feeds to poll this run.
+        
+        Args:
+            feed_urls: Configured feed URLs
+            now: Current time (default: now)
+            
+        Returns:
+            Feeds never polled or whose poll interval has passed, in configured order
+        """
+        now = now or datetime.now(timezone.utc)
+        history = self.db.get_feed_history()
+        selected = []
+        for url in feed_urls:
+            state = history.get(url)
+            if state is None or now >= state['polled_at'] + self.poll_interval(state['rate_per_hour']):
+                selected.append(url)
+        
+        skipped = len(feed_urls) - len(selected)
+        if skipped:
+            logger.info(f"RSS schedule: polling {len(selected)} of {len(feed_urls)} feeds, {skipped} not due yet")
+        return selected
+    
+    def record(
+        self,
+        url: str,
+        entry_dates: List[datetime],
+        fingerprint: str,
+        now: Optional[datetime] = None,
+    ) -> None:
+        """
+        Update a feed's history after a successful poll.
+        
+        Args:
+            url: Feed URL
+            entry_dates: Publication times of the entries that carried one
+            fingerprint: entries_fingerprint of the feed's entries
+            now: Poll time (default: now)
+        """
+        now = now or datetime.now(timezone.utc)
+        previous = self.db.get_feed_history([url]).get(url)
+        changed = previous is None or previous['fingerprint'] != fingerprint
+        changed_at = now if changed else previous['changed_at']
+        
+        if entry_dates:
+            rate = observed_rate(entry_dates, now)
+        elif previous is not None:
+            # Undated feed: one change over the time since the last poll
+            elapsed_hours = max((now - previous['polled_at']).total_seconds() / 3600, 1.0)
+            rate = (1.0 if changed else 0.0) / elapsed_hours
+        else:
+            rate = 0.0
+        if previous is not None:
+            rate = RATE_SMOOTHING * rate + (1 - RATE_SMOOTHING) * previous['rate_per_hour']
+        
+        self.db.save_feed_history(url, now, changed_at, fingerprint, rate)
+        logger.debug(f"RSS schedule: {url} at {rate:.3f} entries/hour, next poll in {self.poll_interval(rate)}")
@@ -0,0 +1,145 @@
+"""Cheap predicates that source adapters apply while parsing, before building NewsItems."""
+
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Pattern
+
+from ..scoring import AI_PATTERN, EXCLUDE_PATTERN, FINANCE_PATTERN
+from ..text import DEFAULT_MAX_DESCRIPTION_LENGTH, searchable_text
+
+logger = logging.getLogger(__name__)
+
+
+class ItemFilter:
+    """
+    Push-down filter for source adapters.
+    
+    Covers the publication cutoff, the hard exclude keywords and a pre-screen
+    requiring at least one AI and one finance keyword. Every check is
+    conservative: it only rejects entries that scoring.calculate_relevance_score
+    (or, given the channels' keywords, every channel) would score 0.0 anyway, so the final selection is unchanged while most
+    entries are dropped before any object is built. It also carries the
+    description cap sources apply when normalizing text.
+    """
+    
+    def __init__(
+        self,
+        cutoff: datetime,
+        exclude: bool = True,
+        require_categories: bool = True,
+        max_description_length: int = DEFAULT_MAX_DESCRIPTION_LENGTH,
+        ai_pattern: Pattern[str] = AI_PATTERN,
+        finance_pattern: Pattern[str] = FINANCE_PATTERN,
+    ):
+        """
+        Initialize the filter.
+        
+        Args:
+            cutoff: Reject entries published before this time
+            exclude: Apply the hard exclude keyword filter
+            require_categories: Require at least one AI and one finance keyword
+            max_description_length: Cap sources apply to normalized descriptions
+            ai_pattern: AI keywords require_categories looks for (default: scoring.AI_KEYWORDS;
+                multi-channel runs pass the union of the channels' keywords)
+            finance_pattern: Finance keywords require_categories looks for
+        """
+        self.cutoff = cutoff
+        self.exclude = exclude
+        self.require_categories = require_categories
+        self.max_description_length = max_description_length
+        self.ai_pattern = ai_pattern
+        self.finance_pattern = finance_pattern
+        self.rejected = Counter()
+    
+    @classmethod
+    def for_lookback(cls, lookback_hours: int, **kwargs) -> "ItemFilter":
+        """
+        Build a filter whose cutoff is N hours before now.
+        
+        Args:
+            lookback_hours: Only accept entries from last N hours
+            **kwargs: Passed to ItemFilter()
+            
+        Returns:
+            ItemFilter instance
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
+        return cls(cutoff, **kwargs)
+    
+    @classmethod
+    def cutoff_only(cls, lookback_hours: int, **kwargs) -> "ItemFilter":
+        """
+        Build a filter that only applies the lookback cutoff.
+        
+        Source adapters fall back to this when no filter is pushed down.
+        
+        Args:
+            lookback_hours: Only accept entries from last N hours
+            **kwargs: Passed to ItemFilter() (e.g. max_description_length)
+            
+        Returns:
+            ItemFilter instance
+        """
+        return cls.for_lookback(lookback_hours, exclude=False, require_categories=False, **kwargs)
+    
+    def is_stale(self, published_at: datetime) -> bool:
+        """
+        Check an entry's publication time against the cutoff.
+        
+        Args:
+            published_at: Parsed publication time
+            
+        Returns:
+            True if the entry should be dropped
+        """
+        if published_at < self.cutoff:
+            self.rejected['stale'] += 1
+            return True
+        return False
+    
+    def rejects_text(
+        self,
+        title: str,
+        description: Optional[str] = None,
+        text_lower: Optional[str] = None,
+    ) -> bool:
+        """
+        Check an entry's text before it is turned into a NewsItem.
+        
+        Sources normalize text first (text.normalize_text), so title and
+        description are exactly what the scorer will see and exclusions can
+        run on both.
+        
+        Args:
+            title: Normalized title
+            description: Normalized description
+            text_lower: searchable_text(title, description), if already built
+            
+        Returns:
+            True if the entry can be dropped
+        """
+        if not (self.exclude or self.require_categories):
+            return False
+        
+        text = text_lower if text_lower is not None else searchable_text(title, description)
+        
+        if self.exclude:
+            if EXCLUDE_PATTERN.search(text):
+                self.rejected['excluded'] += 1
+                return True
+        
+        if self.require_categories:
+            if not self.ai_pattern.search(text):
+                self.rejected['no_ai'] += 1
+                return True
+            if not self.finance_pattern.search(text):
+                self.rejected['no_finance'] += 1
+                return True
+        
+        return False
+    
+    def log_summary(self) -> None:
+        """Log how many entries were dropped at the source, by reason."""
+        if self.rejected:
+            logger.info(f"Source pre-filter dropped {sum(self.rejected.values())} entries: {dict(self.rejected)}")
@@ -1,22 +1,247 @@
 """GDELT DOC API integration for news aggregation."""
 
 import logging
-from datetime import datetime, timezone, timedelta
-from typing import List
+import math
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
 
 import requests
 
 from ..models import NewsItem
+from ..text import normalize_text, searchable_text
+from .dates import parse_datetime
+from .filters import ItemFilter
+from .http import DeadlineExceeded, HttpFetcher, default_fetcher
+
+if TYPE_CHECKING:
+    from ..db import Database
 
 logger = logging.getLogger(__name__)
 
+GDELT_API_URL = 'https://api.gdeltproject.org/api/v2/doc/doc'
 
-def fetch_gdelt_articles(
+# We use broad search terms here and rely on scoring to filter
+GDELT_QUERY = '(agent OR agents OR agentic OR autonomous) AND (finance OR fintech OR insurance OR insurtech OR banking)'
+
+# Format of the startdatetime/enddatetime parameters
+GDELT_DATETIME_FORMAT = '%Y%m%d%H%M%S'
+
+
+def _parse_seendate(article: dict) -> Optional[datetime]:
+    """
+    Parse an article's seendate.
+    
+    Args:
+        article: Article dictionary from the API response
+        
+    Returns:
+        UTC datetime, or None if the article has no (parseable) seendate
+    """
+    # GDELT provides 'seendate' in format like "20240115T123000Z"
+    seendate_str = article.get('seendate', '')
+    if not seendate_str:
+        return None
+    return parse_datetime(seendate_str, 'gdelt')
+
+
+def _parse_article(article: dict, pub_date: datetime, item_filter: ItemFilter) -> Optional[NewsItem]:
+    """
+    Build a NewsItem from one ArtList article.
+    
+    Args:
+        article: Article dictionary from the API response
+        pub_date: Already-parsed publication date
+        item_filter: Push-down filter
+        
+    Returns:
+        NewsItem, or None if the filter rejects the article
+    """
+    # Filter by cutoff
+    if item_filter.is_stale(pub_date):
+        return None
+    
+    title = normalize_text(article.get('title')) or 'Untitled'
+    description = normalize_text(
+        article.get('seendescription') or article.get('socialimage', ''), item_filter.max_description_length
+    )
+    text_lower = searchable_text(title, description)
+    if item_filter.rejects_text(title, description, text_lower):
+        return None
+    
+    return NewsItem(
+        url=article.get('url', ''),
+        title=title,
+        description=description,
+        source='gdelt',
+        published_at=pub_date,
+        text_lower=text_lower,
+    )
+
+
+def _request_articles(params: dict, base_url: str, fetcher: HttpFetcher) -> List[dict]:
+    """
+    Send one ArtList request.
+    
+    Args:
+        params: Query parameters (query, window, maxrecords)
+        base_url: DOC API endpoint
+        fetcher: HTTP fetcher
+        
+    Returns:
+        Article dictionaries
+    """
+    response = fetcher.get(
+        base_url,
+        params={**params, 'mode': 'ArtList', 'format': 'json'},
+        volatile=('startdatetime', 'enddatetime', 'timespan'),
+    )
+    
+    # GDELT answers an empty result with an empty body rather than JSON
+    if not response.content.strip():
+        return []
+    return response.json().get('articles', [])
+
+
+def _fetch_window(
+    query: str,
+    start: datetime,
+    end: datetime,
+    max_records: int,
+    base_url: str,
+    fetcher: HttpFetcher,
+) -> List[dict]:
+    """
+    Fetch the articles seen in [start, end].
+    
+    Args:
+        query: GDELT query string
+        start: Window start (UTC)
+        end: Window end (UTC)
+        max_records: Per-request cap
+        base_url: DOC API endpoint
+        fetcher: HTTP fetcher
+        
+    Returns:
+        Article dictionaries
+    """
+    return _request_articles({
+        'query': query,
+        'maxrecords': max_records,
+        'startdatetime': start.strftime(GDELT_DATETIME_FORMAT),
+        'enddatetime': end.strftime(GDELT_DATETIME_FORMAT),
+    }, base_url, fetcher)
+
+
+def split_window(start: datetime, end: datetime, parts: int) -> List[Tuple[datetime, datetime]]:
+    """
+    Split [start, end] into equal, contiguous slices.
+    
+    Args:
+        start: Window start
+        end: Window end
+        parts: Number of slices
+        
+    Returns:
+        (start, end) slices in chronological order
+    """
+    step = (end - start) / max(parts, 1)
+    return [(start + step * i, end if i == parts - 1 else start + step * (i + 1)) for i in range(max(parts, 1))]
+
+
+def _harvest_articles(
+    query: str,
+    start: datetime,
+    end: datetime,
+    max_records: int,
+    base_url: str,
+    workers: int,
+    initial_slices: int,
+    min_slice: timedelta,
+    fetcher: HttpFetcher,
+    failed: Optional[List[Tuple[datetime, datetime]]] = None,
+) -> Iterator[dict]:
+    """
+    Fetch every article in [start, end] with concurrent time-sliced requests.
+    
+    A slice whose response hits max_records may have lost articles past the
+    cap, so it is split in half and both halves are fetched again, down to
+    min_slice. Articles are yielded as slices complete and may repeat across
+    slices; the caller deduplicates by URL.
+    
+    Args:
+        query: GDELT query string
+        start: Window start (UTC)
+        end: Window end (UTC)
+        max_records: Per-request cap
+        base_url: DOC API endpoint
+        workers: Maximum concurrent requests
+        initial_slices: Number of slices to start with
+        min_slice: Smallest slice that is still subdivided
+        fetcher: HTTP fetcher (shared by the worker threads)
+        failed: Receives the windows whose request failed
+        
+    Yields:
+        Article dictionaries
+    """
+    requests_sent = 0
+    truncated = 0
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='gdelt') as executor:
+        pending = {}
+        
+        def submit(window: Tuple[datetime, datetime]) -> None:
+            nonlocal requests_sent
+            requests_sent += 1
+            pending[executor.submit(_fetch_window, query, *window, max_records, base_url, fetcher)] = window
+        
+        for window in split_window(start, end, initial_slices):
+            submit(window)
+        
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                slice_start, slice_end = pending.pop(future)
+                try:
+                    articles = future.result()
+                except DeadlineExceeded:
+                    raise
+                except Exception as e:
+                    logger.error(f"GDELT slice {slice_start:%Y-%m-%d %H:%M} to {slice_end:%Y-%m-%d %H:%M} failed: {e}")
+                    if failed is not None:
+                        failed.append((slice_start, slice_end))
+                    continue
+                
+                if len(articles) >= max_records:
+                    if slice_end - slice_start > min_slice:
+                        for window in split_window(slice_start, slice_end, 2):
+                            submit(window)
+                    else:
+                        truncated += 1
+                
+                yield from articles
+    
+    logger.info(f"GDELT harvest: {requests_sent} requests")
+    if truncated:
+        logger.warning(f"GDELT harvest: {truncated} minimum-size slices still hit the {max_records}-record cap")
+
+
+def iter_gdelt_articles(
     lookback_hours: int = 24,
     max_records: int = 250,
-) -> List[NewsItem]:
+    base_url: str = GDELT_API_URL,
+    item_filter: Optional[ItemFilter] = None,
+    queries: Optional[List[str]] = None,
+    harvest: bool = False,
+    workers: int = 4,
+    initial_slices: int = 4,
+    min_slice_minutes: int = 15,
+    db: Optional["Database"] = None,
+    overlap_minutes: int = 30,
+    fetcher: Optional[HttpFetcher] = None,
+) -> Iterator[NewsItem]:
     """
-    Fetch recent articles from GDELT DOC API.
+    Yield recent articles from GDELT DOC API as they are parsed.
     
     Uses the GDELT DOC 2.0 API to search for articles about AI agents in finance/insurance.
     
@@ -24,83 +249,250 @@ def fetch_gdelt_articles(
     
     Args:
         lookback_hours: Only fetch articles from last N hours
-        max_records: Maximum number of articles to fetch
+        max_records: Maximum number of articles to fetch (per request in harvest mode)
+        base_url: DOC API endpoint (override for a local stand-in server)
+        item_filter: Push-down filter applied while parsing (its cutoff replaces lookback_hours)
+        queries: GDELT query strings, each fetched (and watermarked) separately
+            (default: GDELT_QUERY)
+        harvest: Split the window into time slices fetched concurrently, so
+            busy periods are not truncated at max_records
+        workers: Maximum concurrent requests in harvest mode
+        initial_slices: Number of slices the window starts with in harvest mode
+        min_slice_minutes: Slices hitting the cap are subdivided down to this size
+        db: Database or WatermarkLedger (the pipeline's, which only writes the mark once the
+            run posted) holding the seendate high-water mark (None = always fetch the full lookback)
+        overlap_minutes: How far before the watermark to start, for late-indexed articles
+        fetcher: HTTP fetcher (default: shared uncached fetcher)
         
-    Returns:
-        List of NewsItems from GDELT
+    Yields:
+        NewsItems from GDELT, unique by URL
     """
-    # Calculate cutoff time
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
+    if item_filter is None:
+        item_filter = ItemFilter.cutoff_only(lookback_hours)
     
-    # GDELT uses format like "24h" or "7d"
-    if lookback_hours <= 24:
-        timespan = f"{lookback_hours}h"
-    else:
-        days = lookback_hours // 24
-        timespan = f"{days}d"
+    if not queries:
+        queries = [GDELT_QUERY]
+    fetcher = fetcher or default_fetcher()
     
-    # Build query
-    # We use broad search terms here and rely on scoring to filter
-    query = '(agent OR agents OR agentic OR autonomous) AND (finance OR fintech OR insurance OR insurtech OR banking)'
+    end = datetime.now(timezone.utc)
+    lookback_start = max(item_filter.cutoff, end - timedelta(hours=lookback_hours))
     
-    params = {
-        'query': query,
-        'mode': 'ArtList',
-        'maxrecords': max_records,
-        'timespan': timespan,
-        'format': 'json',
-    }
-    
-    url = 'https://api.gdeltproject.org/api/v2/doc/doc'
+    seen_urls = set()
+    count = 0
     
-    try:
-        logger.info(f"Fetching GDELT articles (timespan={timespan}, max={max_records})")
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
+    for query in queries:
+        # Only ask for what arrived since the last run (minus an overlap for
+        # articles GDELT indexes late); the full lookback when there is no mark
+        start = lookback_start
+        watermark = db.get_watermark('gdelt', query) if db else None
+        if watermark:
+            start = max(lookback_start, watermark - timedelta(minutes=overlap_minutes))
+            logger.info(f"GDELT watermark {watermark:%Y-%m-%d %H:%M} UTC, fetching from {start:%Y-%m-%d %H:%M}")
         
-        data = response.json()
-        articles = data.get('articles', [])
+        # The watermark only advances when the whole window was covered
+        failed: List[Tuple[datetime, datetime]] = []
+        complete = True
         
-        logger.info(f"GDELT returned {len(articles)} articles")
+        if harvest:
+            # Scale the initial split to the window actually requested
+            slices = max(1, math.ceil(initial_slices * ((end - start) / timedelta(hours=lookback_hours))))
+            logger.info(f"Harvesting GDELT articles ({start:%Y-%m-%d %H:%M} to {end:%Y-%m-%d %H:%M} UTC, "
+                        f"{slices} slices, {workers} workers)")
+            articles = _harvest_articles(
+                query,
+                start,
+                end,
+                max_records,
+                base_url,
+                workers,
+                slices,
+                timedelta(minutes=min_slice_minutes),
+                fetcher,
+                failed,
+            )
+        else:
+            try:
+                if watermark:
+                    logger.info(f"Fetching GDELT articles (since {start:%Y-%m-%d %H:%M} UTC, max={max_records})")
+                    articles = _fetch_window(query, start, end, max_records, base_url, fetcher)
+                else:
+                    # GDELT uses format like "24h" or "7d"
+                    if lookback_hours <= 24:
+                        timespan = f"{lookback_hours}h"
+                    else:
+                        days = lookback_hours // 24
+                        timespan = f"{days}d"
+                    
+                    logger.info(f"Fetching GDELT articles (timespan={timespan}, max={max_records})")
+                    articles = _request_articles({
+                        'query': query,
+                        'maxrecords': max_records,
+                        'timespan': timespan,
+                    }, base_url, fetcher)
+            
+            except DeadlineExceeded:
+                raise
+            
+            except requests.RequestException as e:
+                logger.error(f"GDELT API request failed: {e}")
+                continue
+            
+            except Exception as e:
+                logger.error(f"Unexpected error fetching GDELT: {e}")
+                continue
+            
+            logger.info(f"GDELT returned {len(articles)} articles")
+            if len(articles) >= max_records:
+                logger.warning(f"GDELT hit the {max_records}-record cap; enable GDELT_HARVEST for full coverage")
+                complete = False
         
-        items = []
+        newest = None
         for article in articles:
             try:
-                # Parse publication date
-                # GDELT provides 'seendate' in format like "20240115T123000Z"
-                seendate_str = article.get('seendate', '')
-                if seendate_str:
-                    # Parse: YYYYMMDDTHHMMSSZ
-                    pub_date = datetime.strptime(seendate_str, '%Y%m%dT%H%M%SZ').replace(tzinfo=timezone.utc)
-                else:
-                    # Fallback to now if no date
-                    pub_date = datetime.now(timezone.utc)
+                seendate = _parse_seendate(article)
+                if seendate and (newest is None or seendate > newest):
+                    newest = seendate
                 
-                # Filter by cutoff
-                if pub_date < cutoff:
+                # Other queries (and harvest slices) overlap
+                url = article.get('url', '')
+                if url in seen_urls:
                     continue
+                seen_urls.add(url)
                 
-                item = NewsItem(
-                    url=article.get('url', ''),
-                    title=article.get('title', 'Untitled'),
-                    description=article.get('seendescription') or article.get('socialimage', ''),
-                    source='gdelt',
-                    published_at=pub_date,
-                )
-                
-                items.append(item)
+                # Fallback to now if no date
+                item = _parse_article(article, seendate or end, item_filter)
             
             except Exception as e:
                 logger.warning(f"Error parsing GDELT article: {e}")
                 continue
+            
+            if item is None:
+                continue
+            
+            count += 1
+            yield item
         
-        logger.info(f"GDELT: {len(items)} articles after date filtering")
-        return items
+        if db and newest and complete and not failed:
+            db.set_watermark('gdelt', query, min(newest, end))
     
-    except requests.RequestException as e:
-        logger.error(f"GDELT API request failed: {e}")
-        return []
+    logger.info(f"GDELT: {count} articles after date filtering")
+
+
+def iter_gdelt_window(
+    start: datetime,
+    end: datetime,
+    max_records: int = 250,
+    base_url: str = GDELT_API_URL,
+    item_filter: Optional[ItemFilter] = None,
+    queries: Optional[List[str]] = None,
+    workers: int = 4,
+    initial_slices: int = 4,
+    min_slice_minutes: int = 15,
+    fetcher: Optional[HttpFetcher] = None,
+    failed: Optional[List[Tuple[datetime, datetime]]] = None,
+) -> Iterator[NewsItem]:
+    """
+    Yield the articles GDELT saw in a fixed historical window (backfill).
     
-    except Exception as e:
-        logger.error(f"Unexpected error fetching GDELT: {e}")
-        return []
+    The window is always harvested in time slices and no watermark is read
+    or written, so backfilling never disturbs incremental runs. The DOC API
+    only searches about the last three months.
+    
+    Args:
+        start: Window start (UTC)
+        end: Window end (UTC)
+        max_records: Per-request cap
+        base_url: DOC API endpoint
+        item_filter: Push-down filter (default: cutoff at start)
+        queries: GDELT query strings (default: GDELT_QUERY)
+        workers: Maximum concurrent requests
+        initial_slices: Number of slices the window starts with
+        min_slice_minutes: Slices hitting the cap are subdivided down to this size
+        fetcher: HTTP fetcher (default: shared uncached fetcher)
+        failed: Receives the slices whose request failed
+        
+    Yields:
+        NewsItems from GDELT, unique by URL
+    """
+    if item_filter is None:
+        item_filter = ItemFilter(cutoff=start, exclude=False, require_categories=False)
+    fetcher = fetcher or default_fetcher()
+    seen_urls = set()
+    
+    for query in queries or [GDELT_QUERY]:
+        articles = _harvest_articles(
+            query,
+            start,
+            end,
+            max_records,
+            base_url,
+            workers,
+            initial_slices,
+            timedelta(minutes=min_slice_minutes),
+            fetcher,
+            failed,
+        )
+        for article in articles:
+            url = article.get('url', '')
+            if url in seen_urls:
+                continue
+            seen_urls.add(url)
+            try:
+                item = _parse_article(article, _parse_seendate(article) or end, item_filter)
+            except Exception as e:
+                logger.warning(f"Error parsing GDELT article: {e}")
+                continue
+            if item is not None:
+                yield item
+
+
+def fetch_gdelt_articles(
+    lookback_hours: int = 24,
+    max_records: int = 250,
+    base_url: str = GDELT_API_URL,
+    item_filter: Optional[ItemFilter] = None,
+    queries: Optional[List[str]] = None,
+    harvest: bool = False,
+    workers: int = 4,
+    initial_slices: int = 4,
+    min_slice_minutes: int = 15,
+    db: Optional["Database"] = None,
+    overlap_minutes: int = 30,
+    fetcher: Optional[HttpFetcher] = None,
+) -> List[NewsItem]:
+    """
+    Fetch recent articles from GDELT DOC API.
+    
+    Args:
+        lookback_hours: Only fetch articles from last N hours
+        max_records: Maximum number of articles to fetch (per request in harvest mode)
+        base_url: DOC API endpoint (override for a local stand-in server)
+        item_filter: Push-down filter applied while parsing (its cutoff replaces lookback_hours)
+        queries: GDELT query strings, each fetched (and watermarked) separately
+            (default: GDELT_QUERY)
+        harvest: Split the window into time slices fetched concurrently
+        workers: Maximum concurrent requests in harvest mode
+        initial_slices: Number of slices the window starts with in harvest mode
+        min_slice_minutes: Slices hitting the cap are subdivided down to this size
+        db: Database or WatermarkLedger (the pipeline's, which only writes the mark once the
+            run posted) holding the seendate high-water mark (None = always fetch the full lookback)
+        overlap_minutes: How far before the watermark to start, for late-indexed articles
+        fetcher: HTTP fetcher (default: shared uncached fetcher)
+        
+    Returns:
+        List of NewsItems from GDELT
+    """
+    return list(iter_gdelt_articles(
+        lookback_hours,
+        max_records,
+        base_url,
+        item_filter,
+        queries=queries,
+        harvest=harvest,
+        workers=workers,
+        initial_slices=initial_slices,
+        min_slice_minutes=min_slice_minutes,
+        db=db,
+        overlap_minutes=overlap_minutes,
+        fetcher=fetcher,
+    ))
@@ -0,0 +1,219 @@
+"""Per-host circuit breakers and latency statistics for source requests.
+
+A host whose requests fail failure_threshold times in a row is skipped for
+a cooldown instead of costing a timeout on every run. After the cooldown a
+single probe request is let through: success closes the breaker, failure
+reopens it. Breaker state and recent latencies are loaded from the
+database when a run starts and saved when it ends, so both carry over
+between scheduled runs.
+"""
+
+import logging
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Deque, Dict, Optional, Set
+
+import requests
+
+if TYPE_CHECKING:
+    from ..db import Database
+
+logger = logging.getLogger(__name__)
+
+# Recent latencies kept per host, and how many are needed before the
+# percentiles are trusted (for hedging)
+LATENCY_WINDOW = 100
+MIN_LATENCY_SAMPLES = 20
+
+
+class CircuitOpen(requests.RequestException):
+    """Raised instead of sending a request to a host whose breaker is open."""
+
+
+@dataclass
+class HostState:
+    """Breaker state and recent latencies of one host."""
+    
+    failures: int = 0  # consecutive
+    open_until: Optional[datetime] = None
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    probing: bool = False
+    hedges: int = 0
+
+
+def quantile(values, q: float) -> float:
+    """
+    Get a quantile by the nearest-rank method.
+    
+    Args:
+        values: Non-empty collection of numbers
+        q: Quantile in [0, 1]
+        
+    Returns:
+        Smallest value with at least q of the values at or below it
+    """
+    ordered = sorted(values)
+    rank = min(max(math.ceil(q * len(ordered)), 1), len(ordered))
+    return ordered[rank - 1]
+
+
+class HostHealth:
+    """Thread-safe circuit breakers and latency stats, keyed by host."""
+    
+    def __init__(
+        self,
+        db: Optional["Database"] = None,
+        failure_threshold: int = 3,
+        cooldown: timedelta = timedelta(minutes=30),
+    ):
+        """
+        Initialize and load stored host state.
+        
+        Args:
+            db: Database the state is loaded from and saved to (None = this run only)
+            failure_threshold: Consecutive failures that open a breaker (0 = never open)
+            cooldown: How long an open breaker skips its host
+        """
+        self.db = db
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, HostState] = {}
+        self._dirty: Set[str] = set()
+        
+        if db:
+            for host, stored in db.get_host_health().items():
+                state = HostState(failures=stored['failures'], open_until=stored['open_until'])
+                state.latencies.extend(stored['latencies'])
+                self._hosts[host] = state
+    
+    def _state(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostState()
+        return state
+    
+    def check(self, host: str) -> None:
+        """
+        Let a request to a host through, or refuse it while its breaker is open.
+        
+        Args:
+            host: Request host
+            
+        Raises:
+            CircuitOpen: The breaker is open, or its one probe is already in flight
+        """
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state.open_until is None:
+                return
+            now = datetime.now(timezone.utc)
+            if now < state.open_until:
+                raise CircuitOpen(f"Circuit open for {host} until {state.open_until:%Y-%m-%d %H:%M} UTC")
+            if state.probing:
+                raise CircuitOpen(f"Circuit half-open for {host}, probe in flight")
+            state.probing = True
+        logger.info(f"Circuit half-open for {host}, sending a probe request")
+    
+    def record_success(self, host: str, latency: float) -> None:
+        """
+        Record a request that got a (non-5xx) response.
+        
+        Args:
+            host: Request host
+            latency: Seconds until the response headers arrived
+        """
+        with self._lock:
+            state = self._state(host)
+            if state.open_until is not None:
+                logger.info(f"Circuit closed for {host}")
+            state.failures = 0
+            state.open_until = None
+            state.probing = False
+            state.latencies.append(latency)
+            self._dirty.add(host)
+    
+    def release_probe(self, host: str) -> None:
+        """
+        End a half-open probe that finished without an outcome (cut off by a deadline).
+        
+        The breaker stays half-open, so the next request probes again.
+        
+        Args:
+            host: Request host
+        """
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is not None:
+                state.probing = False
+    
+    def record_failure(self, host: str) -> None:
+        """
+        Record a failed request (connection error, timeout, 429 or 5xx).
+        
+        Args:
+            host: Request host
+        """
+        with self._lock:
+            state = self._state(host)
+            state.failures += 1
+            state.probing = False
+            if self.failure_threshold and state.failures >= self.failure_threshold:
+                state.open_until = datetime.now(timezone.utc) + self.cooldown
+                logger.warning(
+                    f"Circuit open for {host} after {state.failures} consecutive failures, "
+                    f"skipping it until {state.open_until:%Y-%m-%d %H:%M} UTC"
+                )
+            self._dirty.add(host)
+    
+    def record_hedge(self, host: str) -> None:
+        with self._lock:
+            self._state(host).hedges += 1
+    
+    def latency_quantile(self, host: str, q: float = 0.95) -> Optional[float]:
+        """
+        Get a latency quantile for a host.
+        
+        Args:
+            host: Request host
+            q: Quantile in [0, 1]
+            
+        Returns:
+            Latency in seconds, or None with fewer than MIN_LATENCY_SAMPLES samples
+        """
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or len(state.latencies) < MIN_LATENCY_SAMPLES:
+                return None
+            samples = list(state.latencies)
+        return quantile(samples, q)
+    
+    def save(self) -> None:
+        """Store the state of every host that changed this run."""
+        if not self.db:
+            return
+        with self._lock:
+            changed = {host: self._hosts[host] for host in self._dirty}
+            self._dirty.clear()
+        for host, state in changed.items():
+            self.db.save_host_health(host, state.failures, state.open_until, list(state.latencies))
+    
+    def log_summary(self) -> None:
+        """Log per-host latency percentiles, hedges and open breakers."""
+        with self._lock:
+            hosts = {host: state for host, state in self._hosts.items() if host in self._dirty or state.hedges}
+        for host, state in sorted(hosts.items()):
+            if state.latencies:
+                logger.debug(
+                    f"{host}: {len(state.latencies)} samples, p50 {quantile(state.latencies, 0.5):.3f}s, "
+                    f"p95 {quantile(state.latencies, 0.95):.3f}s, {state.hedges} hedged"
+                )
+        hedges = sum(state.hedges for state in hosts.values())
+        if hedges:
+            logger.info(f"Hedged {hedges} slow requests")
+        open_hosts = [host for host, state in self._hosts.items() if state.open_until is not None]
+        if open_hosts:
+            logger.warning(f"Circuit open for: {', '.join(sorted(open_hosts))}")
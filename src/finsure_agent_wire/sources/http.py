@@ -0,0 +1,509 @@
+"""Shared HTTP layer for source adapters, with an on-disk response cache.
+
+Every source fetches through an HttpFetcher. With a ResponseCache attached,
+raw response bodies are stored gzip-compressed and content-addressed
+(identical bodies are stored once), and looked up by a hash of the request:
+
+- ``record``: serve cached responses younger than the TTL, fetch and store
+  the rest
+- ``replay``: serve only from the cache, regardless of age, and never touch
+  the network (a miss raises CacheMiss)
+
+A fetcher can also carry a Deadline: every request's timeout is clamped to
+the time left, and requests after it raise DeadlineExceeded, which sources
+let propagate so the caller can cut them off. With a HostHealth attached,
+requests to hosts whose circuit breaker is open fail fast, and GETs can be
+hedged: if a host has not answered by its observed p95 latency, a second
+identical request is sent and whichever answers first wins.
+"""
+
+import gzip
+import hashlib
+import copy
+import io
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import requests
+
+from .health import HostHealth
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ('off', 'record', 'replay')
+
+DEFAULT_TIMEOUT = 30
+
+# Hedged requests run on a small shared pool; hedges never wait less than this
+HEDGE_WORKERS = 8
+MIN_HEDGE_DELAY = 0.05
+
+# Some feed hosts reject the default python-requests agent
+USER_AGENT = 'finsure-agent-wire/1.0 (news aggregator)'
+
+
+class CacheMiss(requests.RequestException):
+    """Raised in replay mode when a request has no cached response."""
+
+
+class DeadlineExceeded(requests.Timeout):
+    """Raised when a request would run past the fetcher's deadline."""
+
+
+class Deadline:
+    """A point in (monotonic) time by which work has to finish."""
+    
+    def __init__(self, seconds: Optional[float] = None, parent: Optional["Deadline"] = None):
+        """
+        Initialize the deadline.
+        
+        Args:
+            seconds: Time budget from now (None = unlimited)
+            parent: Enclosing deadline; this one never ends after it
+        """
+        ends = [time.monotonic() + seconds] if seconds is not None else []
+        if parent is not None and parent.at is not None:
+            ends.append(parent.at)
+        self.at: Optional[float] = min(ends) if ends else None
+    
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None when unlimited."""
+        if self.at is None:
+            return None
+        return max(self.at - time.monotonic(), 0.0)
+    
+    @property
+    def expired(self) -> bool:
+        return self.at is not None and time.monotonic() >= self.at
+    
+    def share(self, parts: int) -> "Deadline":
+        """
+        Split off an equal share of the remaining time.
+        
+        Time a share does not use stays with this deadline, so later shares
+        get more of it.
+        
+        Args:
+            parts: Number of consumers left, this one included
+            
+        Returns:
+            Child deadline
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return Deadline()
+        return Deadline(remaining / max(parts, 1), parent=self)
+
+
+@dataclass
+class FetchedResponse:
+    """A fetched (or cached) HTTP response body."""
+    
+    url: str
+    status: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+    
+    def json(self):
+        return json.loads(self.content)
+
+
+def request_key(method: str, url: str, params: Optional[dict] = None, body: Optional[bytes] = None) -> str:
+    """
+    Hash a request into a cache key.
+    
+    Args:
+        method: HTTP method
+        url: URL without the query parameters in params
+        params: Query parameters (order-insensitive)
+        body: Request body
+        
+    Returns:
+        Hex SHA-256 of the canonical request
+    """
+    canonical = f"{method.upper()} {url}?{urlencode(sorted((params or {}).items()), doseq=True)}"
+    digest = hashlib.sha256(canonical.encode('utf-8'))
+    if body:
+        digest.update(b'\n')
+        digest.update(body)
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Content-addressed, gzip-compressed on-disk cache of raw responses."""
+    
+    def __init__(self, directory: Path, ttl: timedelta, mode: str = 'record'):
+        """
+        Initialize the cache.
+        
+        Args:
+            directory: Cache root (created on first write)
+            ttl: Age after which record mode refetches a response
+            mode: 'record' or 'replay'
+        """
+        if mode not in CACHE_MODES[1:]:
+            raise ValueError(f"Invalid response cache mode: {mode}")
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def replay(self) -> bool:
+        return self.mode == 'replay'
+    
+    def _ref_path(self, key: str) -> Path:
+        return self.directory / 'refs' / key[:2] / f"{key}.json"
+    
+    def _blob_path(self, digest: str) -> Path:
+        return self.directory / 'blobs' / digest[:2] / f"{digest}.gz"
+    
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    
+    def get(self, keys: Iterable[str]) -> Optional[FetchedResponse]:
+        """
+        Look up a response by the first key that has one.
+        
+        Args:
+            keys: Candidate request keys, most specific first
+            
+        Returns:
+            Cached response, or None if missing (or expired in record mode)
+        """
+        now = datetime.now(timezone.utc)
+        for key in keys:
+            ref_path = self._ref_path(key)
+            if not ref_path.is_file():
+                continue
+            try:
+                ref = json.loads(ref_path.read_text(encoding='utf-8'))
+                if not self.replay and now - datetime.fromisoformat(ref['fetched_at']) > self.ttl:
+                    continue
+                content = gzip.decompress(self._blob_path(ref['blob']).read_bytes())
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable response cache entry {key[:12]}: {e}")
+                continue
+            self.hits += 1
+            return FetchedResponse(ref['url'], ref['status'], content, ref.get('headers', {}), from_cache=True)
+        self.misses += 1
+        return None
+    
+    def put(self, keys: Iterable[str], response: FetchedResponse) -> None:
+        """
+        Store a response under one or more request keys.
+        
+        Args:
+            keys: Request keys to point at the stored body
+            response: Response to store
+        """
+        digest = hashlib.sha256(response.content).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not blob_path.is_file():
+            self._write_atomic(blob_path, gzip.compress(response.content))
+        ref = json.dumps({
+            'url': response.url,
+            'status': response.status,
+            'headers': response.headers,
+            'blob': digest,
+            'fetched_at': datetime.now(timezone.utc).isoformat(),
+        }).encode('utf-8')
+        for key in keys:
+            self._write_atomic(self._ref_path(key), ref)
+    
+    def log_summary(self) -> None:
+        """Log cache hits and misses for the run."""
+        if self.hits or self.misses:
+            logger.info(f"Response cache ({self.mode}): {self.hits} hits, {self.misses} misses")
+
+
+class HttpFetcher:
+    """GET requests for source adapters, optionally through a ResponseCache."""
+    
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        session: Optional[requests.Session] = None,
+        deadline: Optional[Deadline] = None,
+        health: Optional[HostHealth] = None,
+        hedge: bool = False,
+    ):
+        """
+        Initialize the fetcher.
+        
+        Args:
+            cache: Response cache (None = always fetch)
+            timeout: Default per-request timeout in seconds
+            session: requests session (a new one by default)
+            deadline: Deadline for every request (None = per-request timeouts only)
+            health: Per-host circuit breakers and latency stats (None = no breakers)
+            hedge: Hedge GETs at the host's p95 latency (needs health)
+        """
+        self.cache = cache
+        self.timeout = timeout
+        self.deadline = deadline
+        self.health = health
+        self._hedge_pool = (
+            ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix='hedge') if hedge and health else None
+        )
+        if session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+        self.session = session
+    
+    def with_deadline(self, deadline: Optional[Deadline]) -> "HttpFetcher":
+        """
+        Get a fetcher sharing this one's cache and session under another deadline.
+        
+        Args:
+            deadline: Deadline for the new fetcher
+            
+        Returns:
+            New HttpFetcher
+        """
+        fetcher = copy.copy(self)
+        fetcher.deadline = deadline
+        return fetcher
+    
+    def request_timeout(self, timeout: Optional[float] = None) -> float:
+        """
+        Get the timeout for a request starting now.
+        
+        Args:
+            timeout: Requested timeout in seconds (default: the fetcher's)
+            
+        Returns:
+            Timeout clamped to the time left before the deadline
+        """
+        timeout = timeout or self.timeout
+        remaining = self.deadline.remaining() if self.deadline is not None else None
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            raise DeadlineExceeded("Source deadline reached")
+        return min(timeout, remaining)
+    
+    def _keys(self, url: str, params: Optional[dict], volatile: Iterable[str]) -> Tuple[str, ...]:
+        """
+        Exact request key, plus a loose key without volatile params if any are set.
+        
+        The loose key does not depend on which volatile params were set, so
+        requests for the same query with differently expressed windows
+        (a timespan, or start and end times) share it.
+        """
+        params = params or {}
+        exact = request_key('GET', url, params)
+        if not any(name in params for name in volatile):
+            return (exact,)
+        stable = {k: v for k, v in params.items() if k not in volatile}
+        return exact, request_key('GET', url, {**stable, '~volatile': '*'})
+    
+    def get(
+        self,
+        url: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        volatile: Iterable[str] = (),
+    ) -> FetchedResponse:
+        """
+        GET a URL and return the whole body.
+        
+        Args:
+            url: URL to fetch
+            params: Query parameters
+            headers: Extra request headers
+            timeout: Per-request timeout in seconds (default: the fetcher's)
+            volatile: Query parameters that change every run (time windows);
+                replay falls back to the latest response recorded for the
+                request without them
+                
+        Returns:
+            Response (raises requests.HTTPError for error statuses)
+        """
+        keys = self._keys(url, params, volatile)
+        if self.cache:
+            # Record mode only reuses exact matches; replay also accepts the loose key
+            cached = self.cache.get(keys if self.cache.replay else keys[:1])
+            if cached is not None:
+                return cached
+            if self.cache.replay:
+                raise CacheMiss(f"No cached response for {url}")
+        
+        if self._hedge_pool is not None:
+            response = self._send_hedged(url, timeout, params=params, headers=headers)
+        else:
+            response = self._send(url, params=params, headers=headers, timeout=self.request_timeout(timeout))
+        response.raise_for_status()
+        # Keep the URL without query parameters, which may carry API keys
+        fetched = FetchedResponse(
+            url=url,
+            status=response.status_code,
+            content=response.content,
+            headers={k: v for k, v in response.headers.items() if k.lower() in ('content-type', 'content-location')},
+        )
+        if self.cache:
+            self.cache.put(keys, fetched)
+        return fetched
+    
+    def open(
+        self,
+        url: str,
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ) -> BinaryIO:
+        """
+        GET a URL as a readable stream, for incremental parsers.
+        
+        Without a cache the body is streamed from the socket, so a parser
+        that stops early does not download the rest. With a cache the
+        whole body is fetched (or replayed) and wrapped in a BytesIO.
+        
+        Args:
+            url: URL to fetch
+            params: Query parameters
+            timeout: Per-request timeout in seconds (default: the fetcher's)
+            
+        Returns:
+            File-like object; close it (or use it as a context manager) when done
+        """
+        if self.cache:
+            return io.BytesIO(self.get(url, params=params, timeout=timeout).content)
+        
+        response = self._send(url, params=params, timeout=self.request_timeout(timeout), stream=True)
+        response.raise_for_status()
+        response.raw.decode_content = True
+        if self.deadline is None:
+            return response.raw
+        return _DeadlineReader(response.raw, self.deadline)
+    
+    def close(self) -> None:
+        """
+        Shut down the hedge pool and the HTTP session.
+        
+        Copies made by with_deadline share both, so only the original
+        fetcher is closed, once every source is done with it.
+        """
+        if self._hedge_pool is not None:
+            # Slower hedge copies may still be running; their results are discarded anyway
+            self._hedge_pool.shutdown(wait=False, cancel_futures=True)
+            self._hedge_pool = None
+        self.session.close()
+    
+    def _send(self, url: str, timeout: float, **kwargs) -> requests.Response:
+        """
+        Send a GET through the host's circuit breaker, recording the outcome.
+        
+        A timeout cut short by the deadline is reported as DeadlineExceeded
+        and is not held against the host; a probe it cut short is released,
+        so the host is probed again.
+        """
+        host = urlsplit(url).netloc
+        if self.health:
+            self.health.check(host)
+        
+        started = time.monotonic()
+        try:
+            response = self.session.get(url, timeout=timeout, **kwargs)
+        except requests.Timeout as e:
+            if self.deadline is not None and self.deadline.expired:
+                if self.health:
+                    self.health.release_probe(host)
+                raise DeadlineExceeded(f"Source deadline reached during request to {url}") from e
+            if self.health:
+                self.health.record_failure(host)
+            raise
+        except requests.RequestException:
+            if self.health:
+                self.health.record_failure(host)
+            raise
+        
+        if self.health:
+            if response.status_code == 429 or response.status_code >= 500:
+                self.health.record_failure(host)
+            else:
+                self.health.record_success(host, time.monotonic() - started)
+        return response
+    
+    def _send_hedged(self, url: str, timeout: Optional[float], **kwargs) -> requests.Response:
+        """
+        Send a GET, and a second copy if the first is slower than the host's p95.
+        
+        Only used for idempotent, fully-read GETs. The slower copy is left to
+        finish in the background and its response discarded.
+        """
+        host = urlsplit(url).netloc
+        delay = self.health.latency_quantile(host, 0.95)
+        if delay is None:
+            return self._send(url, self.request_timeout(timeout), **kwargs)
+        
+        first = self._hedge_pool.submit(self._send, url, self.request_timeout(timeout), **kwargs)
+        done, _ = wait([first], timeout=max(delay, MIN_HEDGE_DELAY))
+        if done:
+            return first.result()
+        
+        logger.debug(f"Hedging request to {host} after {delay:.3f}s")
+        self.health.record_hedge(host)
+        second = self._hedge_pool.submit(self._send, url, self.request_timeout(timeout), **kwargs)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except requests.RequestException as e:
+                    error = e
+        raise error
+
+
+class _DeadlineReader(io.RawIOBase):
+    """Stream wrapper that stops a slow body at the deadline (read timeouts are per read)."""
+    
+    def __init__(self, raw: BinaryIO, deadline: Deadline):
+        self.raw = raw
+        self.deadline = deadline
+    
+    def readable(self) -> bool:
+        return True
+    
+    def read(self, size: int = -1) -> bytes:
+        if self.deadline.expired:
+            raise DeadlineExceeded("Source deadline reached while reading a response")
+        return self.raw.read(size if size >= 0 else None)
+    
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+    
+    def close(self) -> None:
+        self.raw.close()
+        super().close()
+
+
+_default_fetcher: Optional[HttpFetcher] = None
+
+
+def default_fetcher() -> HttpFetcher:
+    """Shared uncached fetcher used when a source is called without one."""
+    global _default_fetcher
+    if _default_fetcher is None:
+        _default_fetcher = HttpFetcher()
+    return _default_fetcher
@@ -1,13 +1,17 @@
 """RSS feed parser for Medium and generic RSS sources."""
 
 import logging
-from datetime import datetime, timezone, timedelta
-from typing import List
-from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional
 
 import feedparser
 
 from ..models import NewsItem
+from ..text import normalize_text, searchable_text
+from .dates import from_struct_time, parse_datetime
+from .feed_schedule import FeedScheduler, entries_fingerprint
+from .filters import ItemFilter
+from .http import DeadlineExceeded, HttpFetcher, default_fetcher
 
 logger = logging.getLogger(__name__)
 
@@ -24,50 +28,79 @@ def parse_rss_date(date_str: str) -> datetime:
     Returns:
         Parsed datetime with UTC timezone
     """
-    try:
-        # Try RFC 2822 format (most common in RSS)
-        dt = parsedate_to_datetime(date_str)
-        # Ensure UTC
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        else:
-            dt = dt.astimezone(timezone.utc)
-        return dt
-    except Exception:
-        pass
-    
-    # Try ISO 8601
-    for fmt in ['%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%d']:
-        try:
-            dt = datetime.strptime(date_str, fmt)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except Exception:
-            continue
+    parsed = parse_datetime(date_str)
+    if parsed is not None:
+        return parsed
     
     # Fallback to now
     logger.warning(f"Could not parse date: {date_str}, using current time")
     return datetime.now(timezone.utc)
 
 
-def fetch_rss_feed(url: str, lookback_hours: int = 24) -> List[NewsItem]:
+def _entry_date(entry, feed_url: str) -> Optional[datetime]:
     """
-    Fetch and parse a single RSS feed.
+    Get an entry's publication date.
+    
+    Uses the first of published/updated/created the entry has, taking
+    feedparser's already-parsed UTC struct_time when it managed to parse
+    the field and the feed's cached format otherwise.
+    
+    Args:
+        entry: feedparser entry
+        feed_url: Feed URL (key of the cached date format)
+        
+    Returns:
+        UTC datetime, or None if the entry has no usable date
+    """
+    for field in ('published', 'updated', 'created'):
+        value = entry.get(field)
+        if not value:
+            continue
+        parsed = entry.get(f'{field}_parsed')
+        if parsed:
+            return from_struct_time(parsed)
+        pub_date = parse_datetime(value, feed_url)
+        if pub_date is None:
+            logger.warning(f"Could not parse date: {value}, using current time")
+        return pub_date
+    return None
+
+
+def iter_rss_feed(
+    url: str,
+    lookback_hours: int = 24,
+    item_filter: Optional[ItemFilter] = None,
+    fetcher: Optional[HttpFetcher] = None,
+    scheduler: Optional[FeedScheduler] = None,
+    failed: Optional[List[str]] = None,
+) -> Iterator[NewsItem]:
+    """
+    Fetch a single RSS feed and yield its items as they are parsed.
     
     Args:
         url: RSS feed URL
         lookback_hours: Only include items from last N hours
+        item_filter: Push-down filter applied while parsing (its cutoff replaces lookback_hours)
+        fetcher: HTTP fetcher (default: shared uncached fetcher)
+        scheduler: Poll scheduler told about the feed once it is fully read (optional)
+        failed: Receives the URL if the feed could not be fetched
         
-    Returns:
-        List of NewsItems from this feed
+    Yields:
+        NewsItems from this feed
     """
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
+    if item_filter is None:
+        item_filter = ItemFilter.cutoff_only(lookback_hours)
+    fetcher = fetcher or default_fetcher()
     
     try:
         logger.info(f"Fetching RSS feed: {url}")
         
-        feed = feedparser.parse(url)
+        # Fetch the bytes ourselves (timeout, response cache) and let feedparser parse them
+        response = fetcher.get(url)
+        feed = feedparser.parse(response.content, response_headers={
+            'content-location': url,
+            'content-type': response.headers.get('content-type', response.headers.get('Content-Type', '')),
+        })
         
         if feed.bozo:
             # Feed has errors but may still be parseable
@@ -75,66 +108,150 @@ def fetch_rss_feed(url: str, lookback_hours: int = 24) -> List[NewsItem]:
         
         entries = feed.get('entries', [])
         logger.info(f"RSS feed returned {len(entries)} entries: {url}")
-        
-        items = []
-        for entry in entries:
-            try:
-                # Get publication date (try multiple fields)
-                date_str = entry.get('published') or entry.get('updated') or entry.get('created')
-                if date_str:
-                    pub_date = parse_rss_date(date_str)
-                else:
-                    # No date, use now
-                    pub_date = datetime.now(timezone.utc)
-                
-                # Filter by cutoff
-                if pub_date < cutoff:
-                    continue
-                
-                # Get URL
-                link = entry.get('link', '')
-                if not link:
-                    continue
-                
-                # Get title
-                title = entry.get('title', 'Untitled')
-                
-                # Get description (try multiple fields)
-                description = (
-                    entry.get('summary') or 
-                    entry.get('description') or 
-                    entry.get('content', [{}])[0].get('value', '') if entry.get('content') else ''
-                )
-                
-                item = NewsItem(
-                    url=link,
-                    title=title,
-                    description=description,
-                    source='rss',
-                    published_at=pub_date,
-                )
-                
-                items.append(item)
+    
+    except DeadlineExceeded:
+        raise
+    
+    except Exception as e:
+        logger.error(f"Error fetching RSS feed {url}: {e}")
+        if failed is not None:
+            failed.append(url)
+        return
+    
+    count = 0
+    entry_dates = []
+    for entry in entries:
+        try:
+            # Get publication date (try multiple fields)
+            pub_date = _entry_date(entry, url)
+            if pub_date is not None:
+                entry_dates.append(pub_date)
+            else:
+                # No date, use now
+                pub_date = datetime.now(timezone.utc)
+            
+            # Filter by cutoff
+            if item_filter.is_stale(pub_date):
+                continue
+            
+            # Get URL
+            link = entry.get('link', '')
+            if not link:
+                continue
+            
+            # Get title
+            title = normalize_text(entry.get('title')) or 'Untitled'
             
-            except Exception as e:
-                logger.warning(f"Error parsing RSS entry: {e}")
+            # Get description (try multiple fields)
+            description = (
+                entry.get('summary') or 
+                entry.get('description') or 
+                entry.get('content', [{}])[0].get('value', '') if entry.get('content') else ''
+            )
+            description = normalize_text(description, item_filter.max_description_length)
+            
+            text_lower = searchable_text(title, description)
+            if item_filter.rejects_text(title, description, text_lower):
                 continue
+            
+            item = NewsItem(
+                url=link,
+                title=title,
+                description=description,
+                source='rss',
+                published_at=pub_date,
+                text_lower=text_lower,
+            )
+        
+        except Exception as e:
+            logger.warning(f"Error parsing RSS entry: {e}")
+            continue
         
-        logger.info(f"RSS: {len(items)} items from {url} after date filtering")
-        return items
+        count += 1
+        yield item
     
-    except Exception as e:
-        logger.error(f"Error fetching RSS feed {url}: {e}")
-        return []
+    if scheduler:
+        scheduler.record(url, entry_dates, entries_fingerprint([entry.get('link', '') for entry in entries]))
+    logger.info(f"RSS: {count} items from {url} after date filtering")
+
+
+def fetch_rss_feed(
+    url: str,
+    lookback_hours: int = 24,
+    item_filter: Optional[ItemFilter] = None,
+    fetcher: Optional[HttpFetcher] = None,
+) -> List[NewsItem]:
+    """
+    Fetch and parse a single RSS feed.
+    
+    Args:
+        url: RSS feed URL
+        lookback_hours: Only include items from last N hours
+        item_filter: Push-down filter applied while parsing (its cutoff replaces lookback_hours)
+        fetcher: HTTP fetcher (default: shared uncached fetcher)
+        
+    Returns:
+        List of NewsItems from this feed
+    """
+    return list(iter_rss_feed(url, lookback_hours=lookback_hours, item_filter=item_filter, fetcher=fetcher))
 
 
-def fetch_rss_feeds(feed_urls: List[str], lookback_hours: int = 24) -> List[NewsItem]:
+def iter_rss_feeds(
+    feed_urls: List[str],
+    lookback_hours: int = 24,
+    item_filter: Optional[ItemFilter] = None,
+    fetcher: Optional[HttpFetcher] = None,
+    scheduler: Optional[FeedScheduler] = None,
+    failed: Optional[List[str]] = None,
+) -> Iterator[NewsItem]:
+    """
+    Yield items from multiple RSS feeds, one feed at a time.
+    
+    Args:
+        feed_urls: List of RSS feed URLs
+        lookback_hours: Only include items from last N hours
+        item_filter: Push-down filter applied while parsing (its cutoff replaces lookback_hours)
+        fetcher: HTTP fetcher (default: shared uncached fetcher)
+        scheduler: Poll only the feeds it considers due (None = poll every feed)
+        failed: Receives the URLs of feeds that could not be fetched
+        
+    Yields:
+        NewsItems from all feeds
+    """
+    if not feed_urls:
+        logger.info("No RSS feeds configured, skipping RSS fetch")
+        return
+    
+    if scheduler:
+        feed_urls = scheduler.due(feed_urls)
+    
+    for url in feed_urls:
+        yield from iter_rss_feed(
+            url,
+            lookback_hours=lookback_hours,
+            item_filter=item_filter,
+            fetcher=fetcher,
+            scheduler=scheduler,
+            failed=failed,
+        )
+
+
+def fetch_rss_feeds(
+    feed_urls: List[str],
+    lookback_hours: int = 24,
+    item_filter: Optional[ItemFilter] = None,
+    fetcher: Optional[HttpFetcher] = None,
+    scheduler: Optional[FeedScheduler] = None,
+) -> List[NewsItem]:
     """
     Fetch and parse multiple RSS feeds.
     
     Args:
         feed_urls: List of RSS feed URLs
         lookback_hours: Only include items from last N hours
+        item_filter: Push-down filter applied while parsing (its cutoff replaces lookback_hours)
+        fetcher: HTTP fetcher (default: shared uncached fetcher)
+        scheduler: Poll only the feeds it considers due (None = poll every feed)
         
     Returns:
         Combined list of NewsItems from all feeds
@@ -143,11 +260,13 @@ def fetch_rss_feeds(feed_urls: List[str], lookback_hours: int = 24) -> List[News
         logger.info("No RSS feeds configured, skipping RSS fetch")
         return []
     
-    all_items = []
-    
-    for url in feed_urls:
-        items = fetch_rss_feed(url, lookback_hours=lookback_hours)
-        all_items.extend(items)
+    all_items = list(iter_rss_feeds(
+        feed_urls,
+        lookback_hours=lookback_hours,
+        item_filter=item_filter,
+        fetcher=fetcher,
+        scheduler=scheduler,
+    ))
     
     logger.info(f"RSS: Total {len(all_items)} items from {len(feed_urls)} feeds")
     return all_items
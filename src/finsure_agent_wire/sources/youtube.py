@@ -1,123 +1,550 @@
 """YouTube Data API v3 integration for video content."""
 
+import json
 import logging
-from datetime import datetime, timezone, timedelta
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from googleapiclient.discovery import build
+import httplib2
+import requests
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
 
 from ..models import NewsItem
+from ..text import normalize_text, searchable_text
+from .dates import parse_datetime
+from .filters import ItemFilter
+from .http import DeadlineExceeded, HttpFetcher, default_fetcher
+
+if TYPE_CHECKING:
+    from ..db import Database
 
 logger = logging.getLogger(__name__)
 
+DISCOVERY_URL = 'https://www.googleapis.com/discovery/v1/apis/youtube/v3/rest'
 
-def fetch_youtube_videos(
+# search.list costs 100 units of the default 10,000 units/day quota,
+# which resets at midnight Pacific time
+SEARCH_COST = 100
+DEFAULT_DAILY_QUOTA = 10000
+
+# 403 reasons meaning the day's quota is spent (other 403s only stop the run)
+QUOTA_EXHAUSTED_REASONS = {'quotaExceeded', 'dailyLimitExceeded'}
+
+# Calls per batch HTTP request (Google allows up to 1000; batching saves
+# round-trips, not quota)
+BATCH_SIZE = 50
+
+
+def quota_day(now: Optional[datetime] = None) -> str:
+    """
+    Get the current YouTube quota day.
+    
+    Args:
+        now: Current time (default: now)
+        
+    Returns:
+        Date string (YYYY-MM-DD) in Pacific time, or UTC if tz data is missing
+    """
+    now = now or datetime.now(timezone.utc)
+    try:
+        return now.astimezone(ZoneInfo('America/Los_Angeles')).date().isoformat()
+    except ZoneInfoNotFoundError:
+        return now.astimezone(timezone.utc).date().isoformat()
+
+
+def load_discovery_document(cache_path: Optional[Path] = None) -> dict:
+    """
+    Load the YouTube v3 discovery document, from a local cache when possible.
+    
+    Args:
+        cache_path: JSON file to read the document from and store it to
+        
+    Returns:
+        Discovery document
+    """
+    if cache_path and cache_path.is_file():
+        return json.loads(cache_path.read_text(encoding='utf-8'))
+    
+    document = get_static_doc('youtube', 'v3')
+    if document is None:
+        logger.info("Downloading YouTube discovery document")
+        response = requests.get(DISCOVERY_URL, timeout=30)
+        response.raise_for_status()
+        document = response.text
+    
+    if cache_path:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(document, encoding='utf-8')
+    return json.loads(document)
+
+
+class _FetcherHttp:
+    """httplib2.Http stand-in that sends the client's GETs through an HttpFetcher."""
+    
+    def __init__(self, fetcher: HttpFetcher):
+        self.fetcher = fetcher
+        self.network_calls = 0
+    
+    def request(self, uri, method='GET', body=None, headers=None, redirections=5, connection_type=None):
+        if method != 'GET':
+            raise ValueError(f"Unsupported method through the response cache: {method}")
+        parts = urlsplit(uri)
+        url = urlunsplit((parts.scheme, parts.netloc, parts.path, '', ''))
+        params = dict(parse_qsl(parts.query))
+        # The client's own headers (user agent, x-goog-api-client) vary by version
+        try:
+            response = self.fetcher.get(url, params=params, volatile=('publishedAfter',))
+            status, content, response_headers = response.status, response.content, response.headers
+            if not response.from_cache:
+                self.network_calls += 1
+        except requests.HTTPError as e:
+            self.network_calls += 1
+            status, content = e.response.status_code, e.response.content
+            response_headers = dict(e.response.headers)
+        return httplib2.Response({**response_headers, 'status': status}), content
+
+
+def build_youtube_service(
+    api_key: str,
+    api_endpoint: Optional[str] = None,
+    discovery_cache: Optional[Path] = None,
+    http=None,
+):
+    """
+    Build the YouTube API client from a cached discovery document.
+    
+    Args:
+        api_key: YouTube Data API v3 key
+        api_endpoint: API root URL override (e.g. a local stand-in server)
+        discovery_cache: Path of the cached discovery document
+        http: httplib2.Http-compatible transport (default: the client's own)
+        
+    Returns:
+        googleapiclient Resource for YouTube v3
+    """
+    document = load_discovery_document(discovery_cache)
+    if api_endpoint:
+        # Batch requests go to rootUrl + batchPath, which client_options
+        # does not override, so point the document itself at the endpoint
+        document['rootUrl'] = api_endpoint if api_endpoint.endswith('/') else f"{api_endpoint}/"
+    if http is not None:
+        return build_from_document(document, developerKey=api_key, http=http)
+    return build_from_document(document, developerKey=api_key)
+
+
+def _is_forbidden(error: Exception) -> bool:
+    return isinstance(error, HttpError) and error.resp.status == 403
+
+
+def _error_reasons(error: HttpError) -> set:
+    """Reason codes of an API error (error.errors[].reason and error.details[].reason)."""
+    try:
+        body = json.loads(error.content.decode('utf-8'))['error']
+    except (ValueError, KeyError, TypeError):
+        return set()
+    entries = [*(body.get('errors') or []), *(body.get('details') or [])]
+    return {entry.get('reason') for entry in entries if isinstance(entry, dict)} - {None}
+
+
+def _is_quota_exhausted(error: Exception) -> bool:
+    """
+    Check for a 403 that means the day's quota is spent.
+    
+    Other 403s (rateLimitExceeded, userRateLimitExceeded, forbidden) are
+    transient or not about quota: they stop the run but are not charged.
+    """
+    return _is_forbidden(error) and not _error_reasons(error).isdisjoint(QUOTA_EXHAUSTED_REASONS)
+
+
+def _charge_rest_of_day(db: Optional["Database"], daily_quota: int) -> None:
+    """Mark today's quota as used up, so later runs today skip YouTube."""
+    if db:
+        day = quota_day()
+        db.add_quota_used('youtube', day, max(daily_quota - db.get_quota_used('youtube', day), 0))
+
+
+def _parse_video(video: dict, item_filter: ItemFilter) -> Optional[NewsItem]:
+    """
+    Build a NewsItem from one search result.
+    
+    Args:
+        video: searchResult resource
+        item_filter: Push-down filter
+        
+    Returns:
+        NewsItem, or None if the video is skipped
+    """
+    video_id = video['id']['videoId']
+    snippet = video['snippet']
+    title = snippet.get('title', 'Untitled').lower()
+    
+    # Skip YouTube Shorts (additional filter)
+    if 'shorts' in title or '#shorts' in snippet.get('description', '').lower():
+        logger.debug(f"Skipping YouTube Short: {title}")
+        return None
+    
+    # Parse publish date
+    # Format: 2024-01-15T12:30:00Z
+    pub_date = parse_datetime(snippet.get('publishedAt', ''), 'youtube') or datetime.now(timezone.utc)
+    
+    # Double-check cutoff (API should handle this, but be safe; cached responses rely on it)
+    if item_filter.is_stale(pub_date):
+        return None
+    
+    # Use original case title; the API returns it HTML-escaped
+    original_title = normalize_text(snippet.get('title')) or 'Untitled'
+    description = normalize_text(snippet.get('description'), item_filter.max_description_length)
+    text_lower = searchable_text(original_title, description)
+    if item_filter.rejects_text(original_title, description, text_lower):
+        return None
+    
+    return NewsItem(
+        url=f"https://www.youtube.com/watch?v={video_id}",
+        title=original_title,
+        description=description,
+        source='youtube',
+        published_at=pub_date,
+        text_lower=text_lower,
+    )
+
+
+def _plan_queries(
+    queries: List[str],
+    window: str,
+    db: "Database",
+    daily_quota: int,
+) -> List[str]:
+    """
+    Trim the queries to fetch to what today's remaining quota covers.
+    
+    When quota is short, the queries fetched longest ago go first, so a
+    tight quota rotates through all queries over successive runs.
+    
+    Args:
+        queries: Queries without a fresh cached response
+        window: Search window key
+        db: Database with the quota ledger and search cache
+        daily_quota: Daily quota units
+        
+    Returns:
+        Queries to fetch this run
+    """
+    remaining = daily_quota - db.get_quota_used('youtube', quota_day())
+    affordable = max(remaining // SEARCH_COST, 0)
+    if affordable >= len(queries):
+        return queries
+    
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    by_staleness = sorted(queries, key=lambda q: db.get_search_fetched_at('youtube', q, window) or oldest)
+    selected = by_staleness[:affordable]
+    logger.warning(
+        f"YouTube quota: {remaining} units left today, fetching {len(selected)} of {len(queries)} queries "
+        f"(skipped: {', '.join(by_staleness[affordable:])})"
+    )
+    return selected
+
+
+def _batch_search(
+    youtube,
+    queries: List[str],
+    params: dict,
+    db: Optional["Database"],
+    daily_quota: int = DEFAULT_DAILY_QUOTA,
+) -> Dict[str, dict]:
+    """
+    Run one search.list per query, BATCH_SIZE calls per batch HTTP request.
+    
+    Args:
+        youtube: YouTube API client
+        queries: Queries to search
+        params: search.list parameters shared by every query
+        db: Database for the quota ledger (optional)
+        daily_quota: Quota units available per day
+        
+    Returns:
+        Query -> search response, for the calls that succeeded
+    """
+    responses: Dict[str, dict] = {}
+    forbidden = False
+    quota_exhausted = False
+    
+    for start in range(0, len(queries), BATCH_SIZE):
+        chunk = queries[start:start + BATCH_SIZE]
+        errors: Dict[str, Exception] = {}
+        
+        def on_response(request_id: str, response: dict, exception: Optional[Exception]) -> None:
+            query = chunk[int(request_id)]
+            if exception is not None:
+                errors[query] = exception
+            else:
+                responses[query] = response
+        
+        batch = youtube.new_batch_http_request(callback=on_response)
+        for index, query in enumerate(chunk):
+            batch.add(youtube.search().list(q=query, **params), request_id=str(index))
+        
+        logger.info(f"YouTube: sending {len(chunk)} searches in one batch request")
+        batch.execute()
+        
+        if db:
+            db.add_quota_used('youtube', quota_day(), SEARCH_COST * len(chunk))
+        
+        for query, error in errors.items():
+            if _is_quota_exhausted(error):
+                forbidden = quota_exhausted = True
+                logger.error(f"YouTube API daily quota exceeded: {error}")
+            elif _is_forbidden(error):
+                forbidden = True
+                logger.error(f"YouTube API rate limited or permission denied: {error}")
+            else:
+                logger.error(f"YouTube API error for query '{query}': {error}")
+        
+        if forbidden:
+            # Stop trying other queries; only a spent quota is remembered for later runs today
+            if quota_exhausted:
+                _charge_rest_of_day(db, daily_quota)
+            break
+    
+    return responses
+
+
+def _search_each(
+    youtube,
+    http: _FetcherHttp,
+    queries: List[str],
+    params: dict,
+    db: Optional["Database"],
+    daily_quota: int = DEFAULT_DAILY_QUOTA,
+) -> Dict[str, dict]:
+    """
+    Run one search.list request per query through the response cache.
+    
+    Batch bodies carry random boundaries, so they can never be replayed;
+    with a response cache each search goes out on its own instead. Only
+    searches that reached the network count against the quota.
+    
+    Args:
+        youtube: YouTube API client built on http
+        http: Fetcher-backed transport
+        queries: Queries to search
+        params: search.list parameters shared by every query
+        db: Database for the quota ledger (optional)
+        daily_quota: Quota units available per day
+        
+    Returns:
+        Query -> search response, for the calls that succeeded
+    """
+    responses: Dict[str, dict] = {}
+    
+    for query in queries:
+        calls_before = http.network_calls
+        try:
+            responses[query] = youtube.search().list(q=query, **params).execute()
+        
+        except HttpError as e:
+            if _is_quota_exhausted(e):
+                logger.error(f"YouTube API daily quota exceeded: {e}")
+                _charge_rest_of_day(db, daily_quota)
+                break
+            if _is_forbidden(e):
+                logger.error(f"YouTube API rate limited or permission denied: {e}")
+                break
+            logger.error(f"YouTube API error for query '{query}': {e}")
+        
+        except DeadlineExceeded:
+            raise
+        
+        except requests.RequestException as e:
+            logger.error(f"YouTube request failed for query '{query}': {e}")
+        
+        finally:
+            if db and http.network_calls > calls_before:
+                db.add_quota_used('youtube', quota_day(), SEARCH_COST)
+    
+    return responses
+
+
+def iter_youtube_videos(
     api_key: str,
     queries: List[str],
     lookback_hours: int = 24,
     max_results_per_query: int = 10,
-) -> List[NewsItem]:
+    api_endpoint: Optional[str] = None,
+    item_filter: Optional[ItemFilter] = None,
+    db: Optional["Database"] = None,
+    cache_ttl_hours: float = 6.0,
+    daily_quota: int = DEFAULT_DAILY_QUOTA,
+    discovery_cache: Optional[Path] = None,
+    fetcher: Optional[HttpFetcher] = None,
+) -> Iterator[NewsItem]:
     """
-    Fetch recent videos from YouTube Data API v3.
+    Yield recent videos from YouTube Data API v3 as they are parsed.
+    
+    Searches are answered from the database cache while younger than
+    cache_ttl_hours; the rest are sent as batch HTTP requests, trimmed to
+    what the remaining daily quota covers.
     
     Args:
         api_key: YouTube Data API v3 key
         queries: List of search queries
         lookback_hours: Only fetch videos from last N hours
         max_results_per_query: Max results per search query
+        api_endpoint: API root URL override (e.g. a local stand-in server)
+        item_filter: Push-down filter applied while parsing (its cutoff replaces lookback_hours)
+        db: Database for the search cache and quota ledger (None = no caching or quota tracking)
+        cache_ttl_hours: How long a cached search response is reused
+        daily_quota: Quota units available per day
+        discovery_cache: Path of the cached discovery document (None = bundled copy only)
+        fetcher: HTTP fetcher; with a response cache, searches go through it unbatched
         
-    Returns:
-        List of NewsItems from YouTube
+    Yields:
+        NewsItems from YouTube, unique by video
     """
     if not api_key:
         logger.warning("YouTube API key not provided, skipping YouTube search")
-        return []
+        return
     
     if not queries:
         logger.info("No YouTube queries configured, skipping YouTube search")
-        return []
+        return
     
-    # Calculate cutoff time
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
-    published_after = cutoff.isoformat().replace('+00:00', 'Z')
+    if item_filter is None:
+        item_filter = ItemFilter.cutoff_only(lookback_hours)
+    published_after = item_filter.cutoff.isoformat().replace('+00:00', 'Z')
     
-    items = []
+    # Cached responses are keyed by the window shape, not its exact start;
+    # the cutoff check in _parse_video drops what has aged out since
+    window = f"{lookback_hours}h/{max_results_per_query}"
     
-    try:
-        youtube = build('youtube', 'v3', developerKey=api_key)
+    responses: Dict[str, dict] = {}
+    to_fetch = []
+    for query in queries:
+        cached = db.get_cached_search('youtube', query, window, timedelta(hours=cache_ttl_hours)) if db else None
+        if cached is not None:
+            responses[query] = cached
+        else:
+            to_fetch.append(query)
+    if responses:
+        logger.info(f"YouTube: {len(responses)} of {len(queries)} searches served from cache")
+    
+    fetcher = fetcher or default_fetcher()
+    replay = fetcher.cache is not None and fetcher.cache.replay
+    
+    # Replays spend no quota, so they never need trimming
+    if db and to_fetch and not replay:
+        to_fetch = _plan_queries(to_fetch, window, db, daily_quota)
+    
+    if to_fetch:
+        params = {
+            'type': 'video',
+            'part': 'id,snippet',
+            'publishedAfter': published_after,
+            'order': 'date',  # Most recent first
+            'maxResults': max_results_per_query,
+            'videoDuration': 'medium',  # Excludes videos under 4 minutes (filters out Shorts)
+        }
+        try:
+            if fetcher.cache is not None:
+                http = _FetcherHttp(fetcher)
+                youtube = build_youtube_service(api_key, api_endpoint, discovery_cache, http=http)
+                fetched = _search_each(youtube, http, to_fetch, params, db, daily_quota)
+            else:
+                # The client's default transport has no timeout at all
+                http = httplib2.Http(timeout=fetcher.request_timeout())
+                youtube = build_youtube_service(api_key, api_endpoint, discovery_cache, http=http)
+                fetched = _batch_search(youtube, to_fetch, params, db, daily_quota)
+        
+        except DeadlineExceeded:
+            raise
+        
+        except Exception as e:
+            if fetcher.deadline is not None and fetcher.deadline.expired:
+                # httplib2 reports the clamped timeout as a plain socket timeout
+                raise DeadlineExceeded("Source deadline reached during YouTube search") from e
+            logger.error(f"YouTube API request failed: {e}")
+            fetched = {}
         
-        for query in queries:
+        for query, response in fetched.items():
+            if db:
+                db.cache_search('youtube', query, window, response)
+            responses[query] = response
+    
+    count = 0
+    seen_ids = set()
+    for query in queries:
+        if query not in responses:
+            continue
+        videos = responses[query].get('items', [])
+        logger.info(f"YouTube returned {len(videos)} videos for query: {query}")
+        
+        for video in videos:
             try:
-                logger.info(f"Searching YouTube for: {query}")
-                
-                # Search for videos (exclude Shorts by requiring medium+ length)
-                search_response = youtube.search().list(
-                    q=query,
-                    type='video',
-                    part='id,snippet',
-                    publishedAfter=published_after,
-                    order='date',  # Most recent first
-                    maxResults=max_results_per_query,
-                    videoDuration='medium',  # Excludes videos under 4 minutes (filters out Shorts)
-                ).execute()
-                
-                videos = search_response.get('items', [])
-                logger.info(f"YouTube returned {len(videos)} videos for query: {query}")
-                
-                for video in videos:
-                    try:
-                        video_id = video['id']['videoId']
-                        snippet = video['snippet']
-                        title = snippet.get('title', 'Untitled').lower()
-                        
-                        # Skip YouTube Shorts (additional filter)
-                        if 'shorts' in title or '#shorts' in snippet.get('description', '').lower():
-                            logger.debug(f"Skipping YouTube Short: {title}")
-                            continue
-                        
-                        # Parse publish date
-                        published_str = snippet.get('publishedAt', '')
-                        if published_str:
-                            # Format: 2024-01-15T12:30:00Z
-                            pub_date = datetime.strptime(published_str, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
-                        else:
-                            pub_date = datetime.now(timezone.utc)
-                        
-                        # Double-check cutoff (API should handle this, but be safe)
-                        if pub_date < cutoff:
-                            continue
-                        
-                        item = NewsItem(
-                            url=f"https://www.youtube.com/watch?v={video_id}",
-                            title=snippet.get('title', 'Untitled'),  # Use original case title
-                            description=snippet.get('description', ''),
-                            source='youtube',
-                            published_at=pub_date,
-                        )
-                        
-                        items.append(item)
-                    
-                    except Exception as e:
-                        logger.warning(f"Error parsing YouTube video: {e}")
-                        continue
-            
-            except HttpError as e:
-                # Handle quota exceeded or other API errors gracefully
-                if e.resp.status == 403:
-                    logger.error(f"YouTube API quota exceeded or permission denied: {e}")
-                    break  # Stop trying other queries if quota exceeded
-                else:
-                    logger.error(f"YouTube API error for query '{query}': {e}")
+                video_id = video['id']['videoId']
+                if video_id in seen_ids:
                     continue
+                seen_ids.add(video_id)
+                item = _parse_video(video, item_filter)
             
             except Exception as e:
-                logger.error(f"Unexpected error searching YouTube for '{query}': {e}")
+                logger.warning(f"Error parsing YouTube video: {e}")
                 continue
-        
-        logger.info(f"YouTube: {len(items)} videos fetched")
-        return items
+            
+            if item is None:
+                continue
+            
+            count += 1
+            yield item
+    
+    logger.info(f"YouTube: {count} videos fetched")
+
+
+def fetch_youtube_videos(
+    api_key: str,
+    queries: List[str],
+    lookback_hours: int = 24,
+    max_results_per_query: int = 10,
+    api_endpoint: Optional[str] = None,
+    item_filter: Optional[ItemFilter] = None,
+    db: Optional["Database"] = None,
+    cache_ttl_hours: float = 6.0,
+    daily_quota: int = DEFAULT_DAILY_QUOTA,
+    discovery_cache: Optional[Path] = None,
+    fetcher: Optional[HttpFetcher] = None,
+) -> List[NewsItem]:
+    """
+    Fetch recent videos from YouTube Data API v3.
     
-    except Exception as e:
-        logger.error(f"YouTube API initialization failed: {e}")
-        return []
+    Args:
+        api_key: YouTube Data API v3 key
+        queries: List of search queries
+        lookback_hours: Only fetch videos from last N hours
+        max_results_per_query: Max results per search query
+        api_endpoint: API root URL override (e.g. a local stand-in server)
+        item_filter: Push-down filter applied while parsing (its cutoff replaces lookback_hours)
+        db: Database for the search cache and quota ledger (None = no caching or quota tracking)
+        cache_ttl_hours: How long a cached search response is reused
+        daily_quota: Quota units available per day
+        discovery_cache: Path of the cached discovery document (None = bundled copy only)
+        fetcher: HTTP fetcher; with a response cache, searches go through it unbatched
+        
+    Returns:
+        List of NewsItems from YouTube
+    """
+    return list(iter_youtube_videos(
+        api_key,
+        queries,
+        lookback_hours=lookback_hours,
+        max_results_per_query=max_results_per_query,
+        api_endpoint=api_endpoint,
+        item_filter=item_filter,
+        db=db,
+        cache_ttl_hours=cache_ttl_hours,
+        daily_quota=daily_quota,
+        discovery_cache=discovery_cache,
+        fetcher=fetcher,
+    ))
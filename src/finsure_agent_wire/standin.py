@@ -0,0 +1,539 @@
+"""
+Local stand-in server for the external APIs used by the pipeline.
+
+Serves recorded or synthetic responses for GDELT, arXiv, RSS, YouTube and
+the X v2 API on a single local port, mirroring each API's real URL layout so
+that pointing the base URLs in Config at it is all that is needed. Latency,
+error rate and 429 behavior are configurable for load testing.
+
+Usage:
+    python -m finsure_agent_wire.standin --port 8765 --latency-ms 50
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.parser import BytesParser
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+# arXiv date-range clause: submittedDate:[YYYYMMDDHHMM TO YYYYMMDDHHMM]
+_ARXIV_DATE_RANGE = re.compile(r"submittedDate:\[(\d{12}) TO (\d{12})\]")
+
+# Title fragments used to build synthetic items. Roughly a third of the
+# generated items are relevant (AI + finance), the rest are noise the
+# scorer should reject, which mirrors what the live sources return.
+_AI_PHRASES = [
+    "Autonomous AI agents", "Multi-agent LLM system", "Agentic AI workflow",
+    "Machine learning model", "Generative AI chatbot", "LangGraph orchestration",
+]
+_FINANCE_PHRASES = [
+    "fraud detection at a regional bank", "insurance claims processing",
+    "algorithmic trading desk", "KYC and AML compliance", "mortgage underwriting",
+    "wealth management portfolio",
+]
+_NOISE_PHRASES = [
+    "Local football club wins derby", "Celebrity gossip roundup",
+    "Best travel agent deals this summer", "New movie tops the box office",
+    "Weekend recipe ideas", "City council approves budget",
+]
+_DOMAINS = [
+    "reuters.com", "ft.com", "techcrunch.com", "americanbanker.com",
+    "example-news.com", "insurancejournal.com", "coindesk.com", "blog.example.org",
+]
+
+
+@dataclass
+class StandinSettings:
+    """Behavior knobs for the stand-in server."""
+    
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: int = 1
+    rss_items_per_feed: int = 50
+    gdelt_articles_per_hour: float = 0.0  # 0 = every GDELT window returns maxrecords articles
+    relevant_ratio: float = 0.35
+    fixtures_dir: Optional[Path] = None
+    seed: int = 0
+
+
+def _synthetic_entries(
+    rng: random.Random,
+    count: int,
+    newest: datetime,
+    oldest: datetime,
+    relevant_ratio: float,
+) -> List[Tuple[str, str, str, datetime]]:
+    """
+    Generate (title, description, domain, published_at) tuples, newest first.
+    """
+    span = max((newest - oldest).total_seconds(), 1.0)
+    step = span / max(count, 1)
+    entries = []
+    for i in range(count):
+        published = newest - timedelta(seconds=step * i + rng.uniform(0, step))
+        entries.append(_synthetic_entry(rng, published, relevant_ratio))
+    return entries
+
+
+def _synthetic_entry(
+    rng: random.Random,
+    published: datetime,
+    relevant_ratio: float,
+) -> Tuple[str, str, str, datetime]:
+    """
+    Generate one (title, description, domain, published_at) tuple.
+    """
+    if rng.random() < relevant_ratio:
+        title = f"{rng.choice(_AI_PHRASES)} for {rng.choice(_FINANCE_PHRASES)}"
+        description = (
+            f"{title}. The financial institution reports the autonomous agents "
+            f"reduced manual review in risk management."
+        )
+    else:
+        title = rng.choice(_NOISE_PHRASES)
+        description = f"{title}. More coverage inside."
+    return (f"{title} #{rng.randrange(10**6)}", description, rng.choice(_DOMAINS), published)
+
+
+def _timeline_entries(
+    seed: int,
+    per_hour: float,
+    count: int,
+    newest: datetime,
+    oldest: datetime,
+    relevant_ratio: float,
+) -> List[Tuple[str, str, str, datetime]]:
+    """
+    Return up to count entries of a fixed global timeline, newest first.
+    
+    Entries sit on a grid of per_hour slots since the epoch and each slot's
+    content is seeded by its index, so any two windows agree on the entries
+    they share (what time-sliced and incremental fetches rely on).
+    """
+    step = 3600.0 / per_hour
+    first = math.ceil(oldest.timestamp() / step)
+    slot = math.floor(newest.timestamp() / step)
+    entries = []
+    while slot >= first and len(entries) < count:
+        published = datetime.fromtimestamp(slot * step, tz=timezone.utc)
+        entries.append(_synthetic_entry(random.Random(f"{seed}:{slot}"), published, relevant_ratio))
+        slot -= 1
+    return entries
+
+
+def _stable_id(text: str) -> int:
+    """Process-independent numeric id for synthetic URLs."""
+    return zlib.crc32(text.encode("utf-8"))
+
+
+class _StandinHandler(BaseHTTPRequestHandler):
+    """Request handler; routes on the real APIs' URL paths."""
+    
+    server_version = "FinsureStandin/1.0"
+    
+    def log_message(self, format, *args):  # noqa: A002 - signature from base class
+        logger.debug("standin: " + format, *args)
+    
+    # ---------------------------
+    # Plumbing
+    # ---------------------------
+    
+    @property
+    def settings(self) -> StandinSettings:
+        return self.server.settings
+    
+    def _rng(self, path: Optional[str] = None) -> random.Random:
+        # Seed per request so responses are reproducible for a given URL
+        return random.Random(f"{self.settings.seed}:{path or self.path}")
+    
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[dict] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _send_json(self, status: int, payload: dict) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json")
+    
+    def _fixture(self, name: str) -> Optional[bytes]:
+        """Return a recorded response body if one exists in the fixtures directory."""
+        if not self.settings.fixtures_dir:
+            return None
+        path = self.settings.fixtures_dir / name
+        return path.read_bytes() if path.is_file() else None
+    
+    def _simulate_conditions(self) -> bool:
+        """
+        Apply latency and injected failures.
+        
+        Returns:
+            True if a failure response was already sent
+        """
+        settings = self.settings
+        chaos = random.random
+        delay = settings.latency_ms + chaos() * settings.latency_jitter_ms
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        
+        self.server.record_request(self.path)
+        
+        if settings.rate_limit_rate and chaos() < settings.rate_limit_rate:
+            reset = int(time.time()) + settings.retry_after_seconds
+            self._send(429, b'{"title": "Too Many Requests"}', "application/json", {
+                "Retry-After": str(settings.retry_after_seconds),
+                "x-rate-limit-reset": str(reset),
+            })
+            return True
+        if settings.error_rate and chaos() < settings.error_rate:
+            self._send(503, b'{"title": "Service Unavailable"}', "application/json")
+            return True
+        return False
+    
+    def _query(self) -> dict:
+        return {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+    
+    # ---------------------------
+    # Routing
+    # ---------------------------
+    
+    def do_GET(self):
+        if self._simulate_conditions():
+            return
+        path = urlparse(self.path).path
+        if path == "/api/v2/doc/doc":
+            self._gdelt()
+        elif path == "/api/query":
+            self._arxiv()
+        elif path.startswith("/rss/"):
+            self._rss(path[len("/rss/"):])
+        elif path == "/youtube/v3/search":
+            self._youtube_search()
+        elif path == "/2/users/me":
+            self._send_json(200, {"data": {"id": "1", "username": "standin"}})
+        else:
+            self._send_json(404, {"title": "Not Found", "detail": path})
+    
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        if self._simulate_conditions():
+            return
+        path = urlparse(self.path).path
+        if path == "/2/tweets":
+            text = json.loads(body or b"{}").get("text", "")
+            tweet_id = str(self.server.next_tweet_id())
+            self._send_json(201, {"data": {"id": tweet_id, "text": text}})
+        elif path == "/batch":
+            self._google_batch(body)
+        else:
+            self._send_json(404, {"title": "Not Found", "detail": path})
+    
+    # ---------------------------
+    # Source emulation
+    # ---------------------------
+    
+    def _window(self, params: dict) -> Tuple[datetime, datetime]:
+        """Resolve the GDELT time window from timespan or start/end datetimes."""
+        now = datetime.now(timezone.utc)
+        if params.get("startdatetime"):
+            start = datetime.strptime(params["startdatetime"], "%Y%m%d%H%M%S").replace(tzinfo=timezone.utc)
+            end = now
+            if params.get("enddatetime"):
+                end = datetime.strptime(params["enddatetime"], "%Y%m%d%H%M%S").replace(tzinfo=timezone.utc)
+            return start, end
+        timespan = params.get("timespan", "24h")
+        unit, value = timespan[-1], int(timespan[:-1] or 24)
+        hours = value * 24 if unit == "d" else value
+        return now - timedelta(hours=hours), now
+    
+    def _gdelt(self):
+        recorded = self._fixture("gdelt.json")
+        if recorded is not None:
+            self._send(200, recorded, "application/json")
+            return
+        params = self._query()
+        start, end = self._window(params)
+        count = int(params.get("maxrecords", 250))
+        if self.settings.gdelt_articles_per_hour > 0:
+            entries = _timeline_entries(
+                self.settings.seed,
+                self.settings.gdelt_articles_per_hour,
+                count,
+                end,
+                start,
+                self.settings.relevant_ratio,
+            )
+        else:
+            entries = _synthetic_entries(self._rng(), count, end, start, self.settings.relevant_ratio)
+        articles = [
+            {
+                "url": f"https://{domain}/articles/{_stable_id(title)}",
+                "title": title,
+                "seendescription": description,
+                "seendate": published.strftime("%Y%m%dT%H%M%SZ"),
+                "domain": domain,
+                "language": "English",
+            }
+            for title, description, domain, published in entries
+        ]
+        self._send_json(200, {"articles": articles})
+    
+    def _arxiv(self):
+        recorded = self._fixture("arxiv.xml")
+        if recorded is not None:
+            self._send(200, recorded, "application/atom+xml")
+            return
+        params = self._query()
+        start = int(params.get("start", 0))
+        max_results = int(params.get("max_results", 10))
+        now = datetime.now(timezone.utc)
+        oldest = None
+        date_range = _ARXIV_DATE_RANGE.search(params.get("search_query", ""))
+        if date_range:
+            oldest, newest = (
+                datetime.strptime(bound, "%Y%m%d%H%M").replace(tzinfo=timezone.utc) for bound in date_range.groups()
+            )
+            now = min(now, newest)
+        # One synthetic paper every 30 minutes, paged like the real API
+        rng = self._rng()
+        parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">']
+        for offset in range(start, start + max_results):
+            published = now - timedelta(minutes=30 * offset + 1)
+            if oldest and published < oldest:
+                break
+            title, summary, _, _ = _synthetic_entries(rng, 1, published, published, self.settings.relevant_ratio)[0]
+            paper_id = f"{published:%y%m}.{offset:05d}"
+            parts.append(
+                "<entry>"
+                f"<id>http://arxiv.org/abs/{paper_id}v1</id>"
+                f"<published>{published:%Y-%m-%dT%H:%M:%SZ}</published>"
+                f"<title>{escape(title)}</title>"
+                f"<summary>{escape(summary)}</summary>"
+                "<author><name>A. Researcher</name></author>"
+                "<author><name>B. Analyst</name></author>"
+                "</entry>"
+            )
+        parts.append("</feed>")
+        self._send(200, "".join(parts).encode("utf-8"), "application/atom+xml")
+    
+    def _rss(self, name: str):
+        recorded = self._fixture(f"rss/{name}")
+        if recorded is not None:
+            self._send(200, recorded, "application/rss+xml")
+            return
+        now = datetime.now(timezone.utc)
+        count = self.settings.rss_items_per_feed
+        entries = _synthetic_entries(self._rng(), count, now, now - timedelta(hours=48), self.settings.relevant_ratio)
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>',
+            f"<title>Stand-in feed {escape(name)}</title><link>http://localhost/</link>",
+        ]
+        for title, description, domain, published in entries:
+            link = f"https://{domain}/{name}/{_stable_id(title)}"
+            parts.append(
+                "<item>"
+                f"<title>{escape(title)}</title><link>{link}</link><guid>{link}</guid>"
+                f"<description>{escape('<p>' + description + '</p>')}</description>"
+                f"<pubDate>{format_datetime(published)}</pubDate>"
+                "</item>"
+            )
+        parts.append("</channel></rss>")
+        self._send(200, "".join(parts).encode("utf-8"), "application/rss+xml")
+    
+    def _youtube_search(self):
+        self._send(200, self._youtube_search_body(self.path), "application/json")
+    
+    def _youtube_search_body(self, target: str) -> bytes:
+        recorded = self._fixture("youtube.json")
+        if recorded is not None:
+            return recorded
+        params = {k: v[0] for k, v in parse_qs(urlparse(target).query).items()}
+        now = datetime.now(timezone.utc)
+        count = int(params.get("maxResults", 5))
+        entries = _synthetic_entries(self._rng(target), count, now, now - timedelta(hours=24), self.settings.relevant_ratio)
+        items = [
+            {
+                "kind": "youtube#searchResult",
+                "id": {"kind": "youtube#video", "videoId": f"vid{_stable_id(title)}"},
+                "snippet": {
+                    "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "title": title,
+                    "description": description,
+                },
+            }
+            for title, description, _, published in entries
+        ]
+        return json.dumps({"kind": "youtube#searchListResponse", "items": items}).encode("utf-8")
+    
+    def _google_batch(self, body: bytes):
+        """Answer a Google API batch request (multipart/mixed of application/http parts)."""
+        header = f"Content-Type: {self.headers.get('Content-Type', '')}\r\n\r\n".encode("utf-8")
+        message = BytesParser().parsebytes(header + body)
+        if not message.is_multipart():
+            self._send_json(400, {"error": {"code": 400, "message": "Expected multipart/mixed"}})
+            return
+        
+        boundary = "standin_batch_boundary"
+        parts = []
+        for part in message.get_payload():
+            request_line = part.get_payload().split("\n", 1)[0].strip()
+            _, target, _ = request_line.split(" ", 2)
+            self.server.record_request(target)
+            if urlparse(target).path == "/youtube/v3/search":
+                status, payload = "200 OK", self._youtube_search_body(target).decode("utf-8")
+            else:
+                status, payload = "404 Not Found", json.dumps({"error": {"code": 404, "message": target}})
+            # Content-ID "<base + id>" is answered as "<response-base + id>"
+            content_id = f"<response-{part['Content-ID'][1:]}"
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: {content_id}\r\n\r\n"
+                f"HTTP/1.1 {status}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n{payload}\r\n"
+            )
+        parts.append(f"--{boundary}--\r\n")
+        self._send(200, "".join(parts).encode("utf-8"), f"multipart/mixed; boundary={boundary}")
+
+
+class StandinServer:
+    """Threaded stand-in server that can run in the background of a benchmark."""
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, settings: Optional[StandinSettings] = None):
+        """
+        Initialize the server (port 0 picks a free port).
+        
+        Args:
+            host: Interface to bind
+            port: Port to bind
+            settings: Behavior knobs (latency, errors, volume)
+        """
+        self.httpd = ThreadingHTTPServer((host, port), _StandinHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.settings = settings or StandinSettings()
+        self.httpd.request_counts = {}
+        self._lock = threading.Lock()
+        self._tweet_id = 0
+        self.httpd.record_request = self._record_request
+        self.httpd.next_tweet_id = self._next_tweet_id
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    @property
+    def request_counts(self) -> dict:
+        """Requests served per URL path."""
+        with self._lock:
+            return dict(self.httpd.request_counts)
+    
+    def _record_request(self, path: str) -> None:
+        key = urlparse(path).path
+        with self._lock:
+            self.httpd.request_counts[key] = self.httpd.request_counts.get(key, 0) + 1
+    
+    def _next_tweet_id(self) -> int:
+        with self._lock:
+            self._tweet_id += 1
+            return self._tweet_id
+    
+    def config_overrides(self, feed_count: int = 10) -> dict:
+        """
+        Config field values that point every source at this server.
+        
+        Args:
+            feed_count: Number of synthetic RSS feeds to configure
+            
+        Returns:
+            Dictionary of Config keyword arguments
+        """
+        base = self.base_url
+        return {
+            "gdelt_base_url": f"{base}/api/v2/doc/doc",
+            "arxiv_base_url": f"{base}/api/query",
+            "youtube_base_url": f"{base}/",
+            "x_api_base_url": f"{base}/2",
+            "rss_feeds": ",".join(f"{base}/rss/feed{i}.xml" for i in range(feed_count)),
+        }
+    
+    def start(self) -> "StandinServer":
+        """Serve in a background daemon thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Stand-in server listening on {self.base_url}")
+        return self
+    
+    def stop(self) -> None:
+        """Shut the server down."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+    
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+    
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    """Run the stand-in server in the foreground."""
+    parser = argparse.ArgumentParser(description="Local stand-in for GDELT, arXiv, RSS, YouTube and X")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--rss-items", type=int, default=50)
+    parser.add_argument("--gdelt-per-hour", type=float, default=0.0,
+                        help="GDELT timeline density (0 = fill maxrecords for any window)")
+    parser.add_argument("--fixtures", type=Path, default=None, help="Directory of recorded responses")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] [%(levelname)s] %(message)s')
+    settings = StandinSettings(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=args.retry_after,
+        rss_items_per_feed=args.rss_items,
+        gdelt_articles_per_hour=args.gdelt_per_hour,
+        fixtures_dir=args.fixtures,
+        seed=args.seed,
+    )
+    server = StandinServer(args.host, args.port, settings)
+    logger.info(f"Config overrides: {json.dumps(server.config_overrides(), indent=2)}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
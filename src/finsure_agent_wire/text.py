@@ -0,0 +1,88 @@
+"""Text normalization applied to titles and descriptions at ingestion."""
+
+import html
+import re
+from typing import Optional
+
+# Descriptions longer than this are cut at a word boundary
+DEFAULT_MAX_DESCRIPTION_LENGTH = 1000
+
+# Raw markup scanned per character kept; the rest of a huge body is never parsed
+RAW_SCAN_FACTOR = 8
+
+# One alternation for everything that is not text: script/style blocks,
+# comments, CDATA markers and tags. Only '<' followed by a letter, '/' or
+# '!' starts a tag, so comparisons like "a < b" survive.
+_MARKUP = re.compile(
+    r'<(script|style)\b.*?</\1\s*>|<!--.*?-->|<!\[CDATA\[|\]\]>|</?[A-Za-z][^<>]*>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+# A tag cut off by the raw scan limit
+_PARTIAL_TAG = re.compile(r'<[A-Za-z/!][^>]*$')
+
+
+def truncate_words(text: str, max_length: int) -> str:
+    """
+    Cut text to a maximum length, preferring a word boundary.
+    
+    Args:
+        text: Text to cut
+        max_length: Maximum length including the ellipsis
+        
+    Returns:
+        Text unchanged if short enough, else cut with '...' appended
+    """
+    if len(text) <= max_length:
+        return text
+    cut = text[:max_length - 3]
+    space = cut.rfind(' ')
+    if space > max_length * 0.8:
+        cut = cut[:space]
+    return cut.rstrip(' ,;:.') + '...'
+
+
+def normalize_text(value: Optional[str], max_length: Optional[int] = None, markup: bool = True) -> str:
+    """
+    Turn a raw title or description into plain, single-spaced text.
+    
+    Markup is removed in one regex pass, entities are unescaped afterwards
+    (so escaped markup stays visible as text), and all whitespace runs
+    collapse to one space.
+    
+    Args:
+        value: Raw text, possibly HTML
+        max_length: Cap on the result length (None = no cap)
+        markup: Strip tags and unescape entities (False for plain-text sources
+            whose text may contain a literal '<', such as arXiv abstracts)
+            
+    Returns:
+        Normalized text
+    """
+    if not value:
+        return ''
+    if max_length:
+        raw_limit = max_length * RAW_SCAN_FACTOR
+        if len(value) > raw_limit:
+            value = _PARTIAL_TAG.sub('', value[:raw_limit])
+    if markup:
+        if '<' in value:
+            value = _MARKUP.sub(' ', value)
+        if '&' in value:
+            value = html.unescape(value)
+    text = ' '.join(value.split())
+    return truncate_words(text, max_length) if max_length else text
+
+
+def searchable_text(title: str, description: Optional[str] = None) -> str:
+    """
+    Build the lowercased text keyword matching runs on.
+    
+    Args:
+        title: Normalized title
+        description: Normalized description
+        
+    Returns:
+        "title description", lowercased
+    """
+    return f"{title} {description}".lower() if description else title.lower()
@@ -0,0 +1,97 @@
+"""URL canonicalization, hashing and host extraction for news items."""
+
+import hashlib
+import logging
+from urllib.parse import parse_qs, urlencode, urlparse, urlsplit, urlunparse
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track the click and never change the page
+TRACKING_PARAMS = frozenset({
+    'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content',
+    'fbclid', 'gclid', 'msclkid',
+    'mc_cid', 'mc_eid',  # Mailchimp
+    '_ga', '_gl',  # Google Analytics
+    'ref', 'referer', 'referrer',
+})
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonicalize URL by:
+    1. Normalizing scheme (http -> https where appropriate)
+    2. Removing tracking parameters (utm_*, fbclid, etc.)
+    3. Removing trailing slashes
+    4. Lowercasing domain
+    
+    Args:
+        url: Original URL
+        
+    Returns:
+        Canonicalized URL
+    """
+    try:
+        parsed = urlparse(url)
+        
+        # Lowercase domain
+        netloc = parsed.netloc.lower()
+        
+        # Parse and filter query params
+        query_params = parse_qs(parsed.query)
+        clean_params = {
+            k: v for k, v in query_params.items()
+            if k.lower() not in TRACKING_PARAMS
+        }
+        
+        # Rebuild query string
+        clean_query = urlencode(clean_params, doseq=True) if clean_params else ''
+        
+        # Remove trailing slash from path
+        path = parsed.path.rstrip('/') if parsed.path != '/' else parsed.path
+        
+        # Prefer https over http for common domains
+        scheme = parsed.scheme
+        if scheme == 'http' and netloc in {'www.youtube.com', 'medium.com', 'techcrunch.com'}:
+            scheme = 'https'
+        
+        # Rebuild URL
+        canonical = urlunparse((
+            scheme,
+            netloc,
+            path,
+            parsed.params,
+            clean_query,
+            ''  # Remove fragment
+        ))
+        
+        return canonical
+    
+    except Exception as e:
+        logger.warning(f"Error canonicalizing URL {url}: {e}")
+        return url
+
+
+def hash_url(url: str) -> str:
+    """
+    Generate SHA-256 hash of URL for deduplication.
+    
+    Args:
+        url: URL to hash (should be canonicalized first)
+        
+    Returns:
+        Hex digest of hash
+    """
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+def url_domain(url: str) -> str:
+    """
+    Get the lowercased host of a URL.
+    
+    Args:
+        url: Any URL
+        
+    Returns:
+        Host with port, lowercased ('' if the URL has none)
+    """
+    return urlsplit(url).netloc.lower()
@@ -26,6 +26,7 @@ class XClient:
         api_secret: str,
         access_token: str,
         access_secret: str,
+        base_url: Optional[str] = None,
     ):
         """
         Initialize X API client.
@@ -35,7 +36,9 @@ class XClient:
             api_secret: X API Secret (Consumer Secret)
             access_token: X Access Token
             access_secret: X Access Token Secret
+            base_url: API base URL override (defaults to BASE_URL)
         """
+        self.base_url = (base_url or self.BASE_URL).rstrip('/')
         self.auth = OAuth1(
             api_key,
             api_secret,
@@ -68,7 +71,7 @@ class XClient:
         if len(text) > 280:
             raise ValueError(f"Tweet text exceeds 280 characters: {len(text)}")
         
-        url = f"{self.BASE_URL}/tweets"
+        url = f"{self.base_url}/tweets"
         payload = {"text": text}
         
         for attempt in range(max_retries):
@@ -142,7 +145,7 @@ class XClient:
         Raises:
             XAPIError: If credentials are invalid
         """
-        url = f"{self.BASE_URL}/users/me"
+        url = f"{self.base_url}/users/me"
         
         try:
             response = self.session.get(url)
@@ -0,0 +1,6 @@
+"""Shared test setup: import the package from src without installing it."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
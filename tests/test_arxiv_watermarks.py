@@ -0,0 +1,52 @@
+"""arXiv watermarks must not skip papers a capped scan never read."""
+
+from finsure_agent_wire.db import Database
+from finsure_agent_wire.sources.arxiv import fetch_arxiv_papers
+from finsure_agent_wire.sources.filters import ItemFilter
+from finsure_agent_wire.standin import StandinServer
+
+# The stand-in publishes one paper every 30 minutes: 48 in a 24-hour window
+LOOKBACK_HOURS = 24
+PAPERS_IN_WINDOW = 48
+QUERY = "agents"
+
+
+def _fetch(server: StandinServer, db: Database, max_pages: int):
+    item_filter = ItemFilter.for_lookback(LOOKBACK_HOURS, exclude=False, require_categories=False)
+    return fetch_arxiv_papers(
+        [QUERY],
+        LOOKBACK_HOURS,
+        5,
+        f"{server.base_url}/api/query",
+        item_filter,
+        db=db,
+        max_pages=max_pages,
+        page_delay=0,
+    )
+
+
+def test_capped_scan_leaves_watermark(tmp_path):
+    with StandinServer() as server:
+        db = Database(tmp_path / "arxiv.db")
+        try:
+            first = _fetch(server, db, max_pages=2)
+            assert len(first) == 10
+            assert db.get_watermark("arxiv", f"all:{QUERY}") is None
+            
+            # The papers past the cap are still reachable once the cap allows it
+            full = _fetch(server, db, max_pages=20)
+            assert len(full) == PAPERS_IN_WINDOW
+            assert db.get_watermark("arxiv", f"all:{QUERY}") is not None
+        finally:
+            db.close()
+
+
+def test_complete_scan_moves_watermark(tmp_path):
+    with StandinServer() as server:
+        db = Database(tmp_path / "arxiv.db")
+        try:
+            assert len(_fetch(server, db, max_pages=20)) == PAPERS_IN_WINDOW
+            # Only papers published since the first scan are new
+            assert len(_fetch(server, db, max_pages=20)) <= 1
+        finally:
+            db.close()
@@ -0,0 +1,29 @@
+"""Multi-channel runs must not pre-filter away items a channel would post."""
+
+from pathlib import Path
+
+from finsure_agent_wire.channels import ChannelProfile, ChannelScorer
+from finsure_agent_wire.config import Config
+from finsure_agent_wire.pipeline import _build_item_filter, _channel_keywords, source_queries
+
+EXAMPLE_CHANNELS = Path(__file__).parent.parent / "channels.example.json"
+TITLE = "AI agents are reshaping stock markets"
+
+
+def _config(**overrides) -> Config:
+    credentials = {name: "x" for name in ("x_api_key", "x_api_secret", "x_access_token", "x_access_secret")}
+    return Config(channels_file=str(EXAMPLE_CHANNELS), **credentials, **overrides)
+
+
+def test_prefilter_keeps_channel_keywords():
+    config = _config()
+    scorer = ChannelScorer([ChannelProfile.from_config(channel, config) for channel in config.get_channels()])
+    assert any(score is not None for score in scorer.keyword_scores(TITLE.lower()))
+    assert not _build_item_filter(config, _channel_keywords(config)).rejects_text(TITLE)
+
+
+def test_compiled_queries_cover_channel_keywords():
+    config = _config(query_mode="compiled")
+    gdelt_queries, _, arxiv_queries = source_queries(config, _channel_keywords(config))
+    assert any("sanctions" in query for query in gdelt_queries)
+    assert any("sanctions" in query for query in arxiv_queries)
@@ -0,0 +1,36 @@
+"""RSS feed polls advance only on live runs, like source watermarks."""
+
+from finsure_agent_wire.config import Config
+from finsure_agent_wire.db import Database
+from finsure_agent_wire.pipeline import run_pipeline
+from finsure_agent_wire.standin import StandinServer
+
+FEEDS = 3
+
+
+def _feed_history(db_path):
+    db = Database(db_path)
+    try:
+        return db.get_feed_history()
+    finally:
+        db.close()
+
+
+def test_dry_run_does_not_record_feed_polls(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db_path = tmp_path / "polls.db"
+    with StandinServer() as server:
+        base = dict(
+            x_api_key="x",
+            x_api_secret="x",
+            x_access_token="x",
+            x_access_secret="x",
+            db_path=db_path,
+            rss_adaptive_polling=True,
+            **server.config_overrides(feed_count=FEEDS),
+        )
+        run_pipeline(Config(**base, dry_run=True))
+        assert _feed_history(db_path) == {}
+        
+        run_pipeline(Config(**base, dry_run=False))
+        assert len(_feed_history(db_path)) == FEEDS
@@ -0,0 +1,33 @@
+"""Items posted by a channel are positives for the learned model."""
+
+from datetime import datetime, timezone
+
+from finsure_agent_wire.db import Database
+from finsure_agent_wire.models import NewsItem
+
+
+def _item(n: int) -> NewsItem:
+    item = NewsItem(
+        url=f"https://example.com/story-{n}",
+        title=f"Story {n}",
+        description="AI agents in banking",
+        source="rss",
+        published_at=datetime.now(timezone.utc),
+    )
+    item.relevance_score = float(n)
+    return item
+
+
+def test_channel_posts_are_positives(tmp_path):
+    db = Database(tmp_path / "labels.db")
+    try:
+        items = [_item(n) for n in range(3)]
+        db.store_candidates(items)
+        db.mark_as_posted(items[0], channel="trading")
+        db.mark_as_posted(items[0], channel="fraud-aml")
+        db.mark_as_posted(items[1])
+        
+        labels = {title: label for title, _, _, label in db.get_training_examples()}
+        assert labels == {"Story 0": 1, "Story 1": 1, "Story 2": 0}
+    finally:
+        db.close()
@@ -0,0 +1,61 @@
+"""Only a spent daily quota may be charged to the YouTube quota ledger."""
+
+import json
+from types import SimpleNamespace
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from finsure_agent_wire.db import Database
+from finsure_agent_wire.sources.youtube import SEARCH_COST, _search_each, quota_day
+
+DAILY_QUOTA = 10000
+
+
+def _forbidden(reason: str) -> HttpError:
+    body = {"error": {"code": 403, "message": reason, "errors": [{"reason": reason, "domain": "youtube.quota"}]}}
+    return HttpError(httplib2.Response({"status": 403}), json.dumps(body).encode())
+
+
+class _FailingYouTube:
+    """YouTube client whose every search reaches the network and fails with one error."""
+    
+    def __init__(self, error: HttpError):
+        self.error = error
+        self.http = SimpleNamespace(network_calls=0)
+        self.calls = 0
+    
+    def search(self):
+        return self
+    
+    def list(self, **params):
+        return self
+    
+    def execute(self):
+        self.calls += 1
+        self.http.network_calls += 1
+        raise self.error
+
+
+def _run(tmp_path, reason: str):
+    db = Database(tmp_path / "quota.db")
+    youtube = _FailingYouTube(_forbidden(reason))
+    try:
+        _search_each(youtube, youtube.http, ["a", "b", "c"], {}, db, DAILY_QUOTA)
+        return youtube.calls, db.get_quota_used("youtube", quota_day())
+    finally:
+        db.close()
+
+
+def test_rate_limit_stops_run_without_charging_the_day(tmp_path):
+    for reason in ("rateLimitExceeded", "userRateLimitExceeded", "forbidden"):
+        (tmp_path / reason).mkdir()
+        calls, used = _run(tmp_path / reason, reason)
+        assert calls == 1
+        assert used == SEARCH_COST
+
+
+def test_quota_exceeded_charges_the_rest_of_the_day(tmp_path):
+    calls, used = _run(tmp_path, "quotaExceeded")
+    assert calls == 1
+    assert used >= DAILY_QUOTA